@@ -0,0 +1,27 @@
+# backend/benchmarks/_env.py
+"""Placeholder settings so benchmarks can import backend modules without a .env"""
+import os
+
+DUMMY_SETTINGS = {
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "MONGO_USER": "bench",
+    "MONGO_PASSWORD": "bench",
+    "FINNHUB_API_KEY": "bench",
+    "MAILJET_API_KEY": "bench",
+    "MAILJET_SECRET_KEY": "bench",
+    "MAILJET_SENDER_EMAIL": "bench@example.com",
+    "JWT_SECRET": "bench",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "TS_HOST": "localhost",
+    "TS_PORT": "5432",
+}
+
+
+def use_dummy_settings(**overrides):
+    """Fill in any required setting that is not already in the environment"""
+    for key, value in DUMMY_SETTINGS.items():
+        os.environ.setdefault(key, value)
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
@@ -0,0 +1,102 @@
+# backend/benchmarks/alert_cycle_bench.py
+"""
+Benchmark one alert-evaluation cycle as the number of active alerts grows.
+
+Compares fetching a quote per alert document (old behaviour), per distinct
+symbol, and one multi-ticker batch per cycle. The per-symbol and batched
+cycles match prices through the AlertIndex, as the alert engine does.
+Upstream latency is simulated with a fixed sleep per call so the numbers do
+not depend on the network.
+
+    python -m backend.benchmarks.alert_cycle_bench --symbols 800 --latency-ms 2
+"""
+import argparse
+import random
+import time
+
+from backend.services.alert_index import AlertIndex
+
+
+def is_triggered(alert_type, current_price, threshold):
+    if alert_type == "buy":
+        return current_price >= threshold
+    return current_price <= threshold
+
+
+def make_alerts(n_alerts, n_symbols, seed=42):
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    return [
+        {
+            "_id": i,
+            "symbol": rng.choice(symbols),
+            "threshold": rng.uniform(50, 150),
+            "type": rng.choice(["buy", "sell"]),
+            "email": f"user{i}@example.com",
+        }
+        for i in range(n_alerts)
+    ]
+
+
+class FakeUpstream:
+    """Counts upstream calls and sleeps `latency` seconds per call"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def quote(self, symbol):
+        self.calls += 1
+        time.sleep(self.latency)
+        return 100.0
+
+    def batch(self, symbols):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {symbol: 100.0 for symbol in symbols}
+
+
+def cycle_per_alert(alerts, index, upstream):
+    fired = 0
+    for alert in alerts:
+        price = upstream.quote(alert["symbol"])
+        fired += is_triggered(alert["type"], price, alert["threshold"])
+    return fired
+
+
+def cycle_per_symbol(alerts, index, upstream):
+    fired = 0
+    for symbol in index.symbols():
+        price = upstream.quote(symbol)
+        fired += len(index.triggered(symbol, price))
+    return fired
+
+
+def cycle_batched(alerts, index, upstream):
+    prices = upstream.batch(sorted(index.symbols()))
+    return sum(len(index.triggered(symbol, price)) for symbol, price in prices.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--symbols", type=int, default=800)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    modes = [("per-alert", cycle_per_alert), ("per-symbol", cycle_per_symbol), ("batched", cycle_batched)]
+    print(f"{'alerts':>8} {'mode':>11} {'calls':>8} {'cycle_s':>9} {'fired':>7}")
+    for n_alerts in args.alerts:
+        alerts = make_alerts(n_alerts, args.symbols)
+        index = AlertIndex()
+        index.load(alerts)
+        for name, cycle in modes:
+            upstream = FakeUpstream(args.latency_ms / 1000)
+            start = time.perf_counter()
+            fired = cycle(alerts, index, upstream)
+            elapsed = time.perf_counter() - start
+            print(f"{n_alerts:>8} {name:>11} {upstream.calls:>8} {elapsed:>9.3f} {fired:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# backend/benchmarks/alert_engine_bench.py
+"""
+Simulated run: two alert monitors vs the single AlertEngine.
+
+Prices follow a random walk on a simulated clock (one step per second).
+Both setups see the same alerts and the same price path:
+
+  * two monitors: the REST monitor every 15 s (buy fires at/above the
+    threshold) and the alert checker every `--checker-interval` s (60 in
+    production; buy fires at/below it). Each fetches every symbol itself and
+    deactivates alerts without checking whether the other already did; the
+    checker works from a snapshot taken `--checker-lag` seconds earlier.
+  * engine: one AlertEngine polling every 15 s with a single semantics and
+    conditional claims.
+
+Alerts are targets (buy below the price, sell above it); each one that is
+deactivated is replaced by a fresh target so the load stays constant.
+Reports upstream quote calls per symbol-minute with active alerts,
+notifications, spurious ones (sent although the target was not reached),
+and alerts notified more than once. Finally it stops the engine in the middle of a trigger burst to show
+that triggers already popped are drained, not dropped.
+
+    python -m backend.benchmarks.alert_engine_bench --alerts 5000 --symbols 200 --minutes 30
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.alert_engine import AlertEngine, PollingPriceSource  # noqa: E402
+from backend.services.alert_evaluation import group_alerts_by_symbol  # noqa: E402
+from backend.services.alert_index import AlertIndex  # noqa: E402
+from backend.services.alert_registry import AlertRegistry  # noqa: E402
+
+
+class Market:
+    """Random-walk prices, one step per simulated second; counts upstream quote calls"""
+
+    def __init__(self, symbols, seed=0):
+        self.rng = random.Random(seed)
+        self.prices = {s: 100.0 for s in symbols}
+        self.calls = 0
+
+    def step(self):
+        for symbol in self.prices:
+            self.prices[symbol] *= 1 + self.rng.gauss(0, 0.002)
+
+    def quotes(self, symbols):
+        self.calls += len(symbols)
+        return {symbol: self.prices[symbol] for symbol in symbols}
+
+    async def get_prices(self, symbols):
+        return self.quotes(symbols)
+
+
+class MemoryAlerts:
+    """The parts of the alerts collection the monitors touch"""
+
+    def __init__(self, alerts):
+        self.docs = {}
+        self.live = {}                # active alert documents by id
+        self.active_symbols = Counter()
+        for alert in alerts:
+            self.insert(alert)
+
+    def insert(self, alert):
+        self.docs[alert["_id"]] = self.live[alert["_id"]] = dict(alert)
+        self.active_symbols[alert["symbol"]] += 1
+
+    def active(self):
+        return [dict(doc) for doc in self.live.values()]
+
+    async def update_one(self, query, update):
+        await asyncio.sleep(0)
+        doc = self.docs.get(query["_id"])
+        matched = doc is not None and all(doc.get(k) == v for k, v in query.items() if k != "_id")
+        if matched:
+            doc.update(update["$set"])
+            if not doc["active"] and self.live.pop(doc["_id"], None) is not None:
+                self.active_symbols[doc["symbol"]] -= 1
+                if not self.active_symbols[doc["symbol"]]:
+                    del self.active_symbols[doc["symbol"]]
+        return SimpleNamespace(modified_count=int(matched))
+
+    async def find_one_and_update(self, query, update):
+        """Returns the document as it was before the update, or None when nothing matched"""
+        before = dict(self.docs.get(query["_id"], {}))
+        result = await self.update_one(query, update)
+        return before if result.modified_count else None
+
+
+def make_alert(alert_id, symbol, price, rng):
+    """A target: buy 0.5-5% below `price`, sell 0.5-5% above it"""
+    alert_type = rng.choice(["buy", "sell"])
+    distance = rng.uniform(0.005, 0.05)
+    threshold = price * (1 - distance if alert_type == "buy" else 1 + distance)
+    return {"_id": alert_id, "symbol": symbol, "type": alert_type, "threshold": round(threshold, 2),
+            "email": f"user{alert_id}@example.com", "active": True}
+
+
+def make_alerts(n_alerts, symbols, seed=1):
+    rng = random.Random(seed)
+    return [make_alert(i, rng.choice(symbols), 100.0, rng) for i in range(n_alerts)]
+
+
+def reached(alert, price):
+    """The engine's semantics; a notification at any other price is spurious"""
+    return price <= alert["threshold"] if alert["type"] == "buy" else price >= alert["threshold"]
+
+
+class Run:
+    """
+    Shared bookkeeping. Every deactivated alert is replaced by a new target on
+    the same symbol at the current price, so the number of active alerts stays
+    constant and both setups are compared in the same steady state.
+    """
+
+    def __init__(self, symbols, alerts, on_new_alert=None):
+        self.market = Market(symbols)
+        self.collection = MemoryAlerts(alerts)
+        self.on_new_alert = on_new_alert
+        self.rng = random.Random(2)
+        self.next_id = len(alerts)
+        self.sent = Counter()
+        self.spurious = 0
+        self.watched_seconds = 0  # symbol-seconds with at least one active alert
+
+    def notify(self, alert, price):
+        self.sent[alert["_id"]] += 1
+        self.spurious += not reached(alert, price)
+        if self.sent[alert["_id"]] == 1:
+            symbol = alert["symbol"]
+            replacement = make_alert(self.next_id, symbol, self.market.prices[symbol], self.rng)
+            self.next_id += 1
+            self.collection.insert(replacement)
+            if self.on_new_alert is not None:
+                self.on_new_alert(dict(replacement))
+
+    def watch(self):
+        self.watched_seconds += len(self.collection.active_symbols)
+
+
+async def two_monitors(args, symbols, alerts):
+    run = Run(symbols, alerts)
+    rest = lambda t, p, th: p >= th if t == "buy" else p <= th      # noqa: E731
+    checker = lambda t, p, th: p <= th if t == "buy" else p >= th   # noqa: E731
+
+    async def cycle(snapshot, prices, fires):
+        for symbol, price in prices.items():
+            for alert in snapshot.get(symbol, []):
+                if fires(alert["type"], price, alert["threshold"]):
+                    await run.collection.update_one({"_id": alert["_id"]}, {"$set": {"active": False}})
+                    run.notify(alert, price)
+
+    checker_snapshot = None
+    for second in range(int(args.minutes * 60)):
+        run.market.step()
+        run.watch()
+        # The checker takes its snapshot, then needs `--checker-lag` seconds to fetch prices
+        if second % args.checker_interval == 10:
+            checker_snapshot = group_alerts_by_symbol(run.collection.active())
+        if second % 15 == 0:
+            snapshot = group_alerts_by_symbol(run.collection.active())
+            await cycle(snapshot, run.market.quotes(sorted(snapshot)), rest)
+        if checker_snapshot is not None and second % args.checker_interval == 10 + args.checker_lag:
+            await cycle(checker_snapshot, run.market.quotes(sorted(checker_snapshot)), checker)
+            checker_snapshot = None
+    return run
+
+
+async def engine_run(args, symbols, alerts):
+    registry = AlertRegistry(None, AlertIndex(rising=("sell",), falling=("buy",)))
+    run = Run(symbols, alerts, on_new_alert=registry.upsert)
+    registry.collection = run.collection
+    for alert in alerts:
+        registry.upsert(dict(alert))
+    engine = AlertEngine(registry, run.collection, PollingPriceSource(run.market, 15), notify=run.notify)
+    for second in range(int(args.minutes * 60)):
+        run.market.step()
+        run.watch()
+        if second % 15 == 0:
+            # one PollingPriceSource cycle
+            for symbol, price in (await run.market.get_prices(sorted(engine.index.symbols()))).items():
+                await engine.on_tick(symbol, price, None)
+            await asyncio.gather(*engine._pending)
+    return run
+
+
+async def drain_check(symbols):
+    """Pop a burst of triggers and stop the engine before their claims complete"""
+    alerts = [{"_id": i, "symbol": symbols[0], "type": "sell", "threshold": 50.0, "email": "x@example.com",
+               "active": True} for i in range(500)]
+    collection, sent = MemoryAlerts(alerts), Counter()
+    registry = AlertRegistry(collection, AlertIndex(rising=("sell",), falling=("buy",)))
+    for alert in alerts:
+        registry.upsert(dict(alert))
+
+    class OneTick:
+        async def run(self, symbols_provider, on_tick):
+            await on_tick(symbols[0], 100.0, None)
+            await asyncio.Event().wait()
+
+    engine = AlertEngine(registry, collection, OneTick(), notify=lambda alert, price: sent.update([alert["_id"]]))
+    engine.start()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await engine.stop()
+    return len(alerts), len(sent), len(collection.active())
+
+
+def report(label, run):
+    duplicates = sum(1 for count in run.sent.values() if count > 1)
+    per_symbol_minute = run.market.calls / (run.watched_seconds / 60)
+    print(f"{label:<13} upstream {run.market.calls:>7,} ({per_symbol_minute:4.2f} per watched symbol-minute)  "
+          f"notifications {sum(run.sent.values()):>5,}  spurious {run.spurious:>5,}  "
+          f"alerts notified twice+ {duplicates:>3,}")
+    return per_symbol_minute
+
+
+async def run(args):
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    alerts = make_alerts(args.alerts, symbols)
+
+    start = time.perf_counter()
+    before = report("two monitors", await two_monitors(args, symbols, alerts))
+    after = report("engine", await engine_run(args, symbols, alerts))
+    print(f"  upstream calls per watched symbol: {after / before:.0%} of before  "
+          f"({time.perf_counter() - start:.1f} s wall)")
+
+    popped, notified, still_active = await drain_check(symbols)
+    print(f"drain on stop: {popped} triggers popped, {notified} notified, {still_active} left active")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=5000)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--minutes", type=float, default=30.0, help="simulated minutes")
+    parser.add_argument("--checker-interval", type=int, default=60, help="old alert checker period (s)")
+    parser.add_argument("--checker-lag", type=int, default=5, help="seconds between checker snapshot and prices")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
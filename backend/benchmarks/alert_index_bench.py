@@ -0,0 +1,95 @@
+# backend/benchmarks/alert_index_bench.py
+"""
+Micro-benchmark for AlertIndex at 1M alerts.
+
+Measures the bulk build, single insert/remove, and per-tick evaluation
+latency against the linear scan the monitor used to do.
+
+    python -m backend.benchmarks.alert_index_bench --alerts 1000000 --symbols 800
+"""
+import argparse
+import random
+import statistics
+import time
+
+from backend.services.alert_index import AlertIndex
+
+
+def make_alerts(n_alerts, n_symbols, seed=7):
+    """Alerts waiting around a last price of 100: BUY above it, SELL below it"""
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    alerts = []
+    for i in range(n_alerts):
+        buy = rng.random() < 0.5
+        alerts.append({
+            "_id": i,
+            "symbol": symbols[i % n_symbols],
+            "threshold": round(rng.uniform(100, 150) if buy else rng.uniform(50, 100), 2),
+            "type": "buy" if buy else "sell",
+        })
+    return alerts
+
+
+def linear_scan(alerts, price):
+    return [
+        a for a in alerts
+        if (a["type"] == "buy" and price >= a["threshold"]) or (a["type"] == "sell" and price <= a["threshold"])
+    ]
+
+
+def timed_us(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    alerts = make_alerts(args.alerts, args.symbols)
+    index = AlertIndex()
+
+    start = time.perf_counter()
+    index.load(alerts)
+    print(f"build       {args.alerts:>9} alerts  {time.perf_counter() - start:8.2f} s")
+
+    rng = random.Random(1)
+    symbol = "SYM0000"
+    per_symbol = [a for a in alerts if a["symbol"] == symbol]
+
+    # A typical tick moves the price a little and fires only a handful of alerts
+    for price in (100.0, 100.5, 103.0):
+        fired = len(index.triggered(symbol, price))
+        med, worst = timed_us(lambda: index.triggered(symbol, price), args.repeat)
+        print(f"tick index  {len(per_symbol):>9} on sym  {med:8.1f} us median  {worst:8.1f} us max  ({fired} fired @ {price})")
+
+        med, worst = timed_us(lambda: linear_scan(per_symbol, price), max(1, args.repeat // 10))
+        print(f"tick scan   {len(per_symbol):>9} on sym  {med:8.1f} us median  {worst:8.1f} us max")
+
+    next_id = args.alerts
+    inserted = []
+
+    def insert():
+        nonlocal next_id
+        alert = {"_id": next_id, "symbol": symbol, "threshold": rng.uniform(50, 150), "type": "buy"}
+        index.add(alert)
+        inserted.append(next_id)
+        next_id += 1
+
+    med, worst = timed_us(insert, args.repeat)
+    print(f"insert      {len(index):>9} total   {med:8.1f} us median  {worst:8.1f} us max")
+
+    med, worst = timed_us(lambda: index.remove(inserted.pop()), args.repeat)
+    print(f"remove      {len(index):>9} total   {med:8.1f} us median  {worst:8.1f} us max")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# backend/benchmarks/alert_shard_bench.py
+"""
+Sharded alert evaluation: throughput from 1 to 8 worker processes.
+
+Each worker is a separate process running the real AlertRegistry (with
+its shard's symbol filter), AlertIndex and AlertEngine. Alerts have the
+/add-alert/ schema (symbol, threshold, type, email, active) and live in a
+stand-in for the alerts collection. The `active` flags sit in shared memory,
+so `find_one_and_update` claims are atomic across processes. Every worker
+builds the same random-walk price paths and feeds `on_tick` the ticks for
+the symbols in its own index.
+
+For each worker count it reports:
+  * registry load time
+  * ticks evaluated per second of wall time
+  * the projected rate with one core per worker: total ticks divided by the
+    busiest shard's CPU time
+  * shard imbalance
+  * alerts notified more than once
+
+The rebalance run starts with 4 workers and adds a 5th halfway through. The
+old owners notice late, after `--lag` of the remaining ticks, so the symbols
+that moved are evaluated by two workers for a while. Lost claims show that
+overlap; no alert may be notified twice.
+
+    python -m backend.benchmarks.alert_shard_bench --alerts 500000 --symbols 2000 --ticks 200
+"""
+import argparse
+import asyncio
+import contextlib
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.alert_engine import AlertEngine  # noqa: E402
+from backend.services.alert_index import AlertIndex  # noqa: E402
+from backend.services.alert_registry import AlertRegistry  # noqa: E402
+from backend.services.alert_shards import HashRing  # noqa: E402
+
+
+def make_world(args):
+    rng = np.random.default_rng(0)
+    symbols = np.array([f"SYM{i:05d}" for i in range(args.symbols)])
+    alert_symbol = rng.integers(0, args.symbols, args.alerts)
+    is_sell = rng.random(args.alerts) < 0.5
+    distance = rng.uniform(0.005, 0.2, args.alerts)
+    threshold = np.round(100.0 * np.where(is_sell, 1 + distance, 1 - distance), 2)
+    steps = rng.standard_normal((args.ticks, args.symbols)) * 0.005
+    prices = 100.0 * np.exp(np.cumsum(steps, axis=0))
+    return symbols, alert_symbol, is_sell, threshold, prices
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class SharedAlerts:
+    """The alerts collection calls the registry and engine make, over shared `active` flags"""
+
+    def __init__(self, world, active, sent):
+        self.symbols, self.alert_symbol, self.is_sell, self.threshold, _ = world
+        self.active = active
+        self.sent = sent
+        self._by_symbol = None
+
+    def _ids_by_symbol(self):
+        if self._by_symbol is None:
+            order = np.argsort(self.alert_symbol, kind="stable")
+            bounds = np.searchsorted(self.alert_symbol[order], np.arange(len(self.symbols) + 1))
+            self._by_symbol = {self.symbols[i]: order[bounds[i]:bounds[i + 1]] for i in range(len(self.symbols))}
+        return self._by_symbol
+
+    def _doc(self, i):
+        return {"_id": int(i), "symbol": str(self.symbols[self.alert_symbol[i]]),
+                "threshold": float(self.threshold[i]), "type": "sell" if self.is_sell[i] else "buy",
+                "email": f"user{i}@example.com", "active": True}
+
+    async def distinct(self, field, query):
+        return [str(s) for s in self.symbols[np.unique(self.alert_symbol)]]
+
+    def find(self, query):
+        ids_by_symbol = self._ids_by_symbol()
+        docs = (self._doc(i) for symbol in query["symbol"]["$in"] for i in ids_by_symbol.get(symbol, ())
+                if self.active[i])
+        return Cursor(docs)
+
+    async def find_one_and_update(self, query, update):
+        i = query["_id"]
+        with self.active.get_lock():
+            if not self.active[i]:
+                return None
+            self.active[i] = 0
+        return self._doc(i)
+
+    def notify(self, alert, price):
+        with self.sent.get_lock():
+            self.sent[alert["_id"]] += 1
+
+
+def owned_by(members, me):
+    ring = HashRing(members)
+    return lambda symbol: ring.owner(symbol) == me
+
+
+def worker(me, members, later_members, join_at, reshard_at, args, active, sent, barrier, results):
+    world = make_world(args)
+    prices = world[4]
+    column = {str(s): i for i, s in enumerate(world[0])}
+    collection = SharedAlerts(world, active, sent)
+
+    async def run():
+        registry = AlertRegistry(collection, AlertIndex(rising=("sell",), falling=("buy",)),
+                                 symbol_filter=owned_by(members, me) if me in members else lambda s: False)
+        engine = AlertEngine(registry, collection, source=None, notify=collection.notify)
+        barrier.wait()
+
+        cpu0 = time.process_time()
+        start = time.perf_counter()
+        if me in members:
+            await registry.load()
+        load_seconds = time.perf_counter() - start
+        ticks, first_tick = 0, 0
+        if me not in members:
+            first_tick = join_at
+            await registry.reshard(owned_by(later_members, me))
+
+        watched = sorted(engine.index.symbols())
+        for t in range(first_tick, args.ticks):
+            if t == reshard_at and me in members:
+                await registry.reshard(owned_by(later_members, me))
+                watched = sorted(engine.index.symbols())
+            row = prices[t]
+            for symbol in watched:
+                await engine.on_tick(symbol, row[column[symbol]], None)
+            ticks += len(watched)
+            if engine._pending:
+                await asyncio.gather(*engine._pending)
+        results.put({"member": me, "ticks": ticks, "alerts": len(registry) + engine.fired + engine.lost_claims,
+                     "load_seconds": load_seconds, "cpu_seconds": time.process_time() - cpu0,
+                     "fired": engine.fired, "lost_claims": engine.lost_claims})
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # one line per trigger
+        asyncio.run(run())
+
+
+def run_workers(args, members, later_members=None, join_at=None, reshard_at=None):
+    later_members = later_members or members
+    everyone = sorted(set(members) | set(later_members))
+    active = mp.Array("b", [1] * args.alerts)
+    sent = mp.Array("i", args.alerts)
+    barrier, results = mp.Barrier(len(everyone) + 1), mp.Queue()
+    processes = [mp.Process(target=worker, args=(me, members, later_members, join_at, reshard_at, args,
+                                                 active, sent, barrier, results))
+                 for me in everyone]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    stats = [results.get() for _ in processes]
+    wall = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    counts = np.frombuffer(sent.get_obj(), dtype=np.int32)
+    return stats, wall, int((counts > 1).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=500_000)
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--ticks", type=int, default=200, help="price updates per symbol")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--lag", type=float, default=0.2, help="share of the ticks old owners reshard late by")
+    args = parser.parse_args()
+
+    print(f"{args.alerts:,} alerts on {args.symbols:,} symbols, {args.ticks} ticks each; "
+          f"{os.cpu_count()} CPU core(s) here")
+    base = None
+    for n in (int(w) for w in args.workers.split(",")):
+        stats, wall, duplicates = run_workers(args, [f"worker-{i}" for i in range(n)])
+        ticks = sum(s["ticks"] for s in stats)
+        busiest = max(s["cpu_seconds"] for s in stats)
+        projected = ticks / busiest
+        base = base or projected
+        alerts = [s["alerts"] for s in stats]
+        print(f"{n} worker(s)  load {max(s['load_seconds'] for s in stats):5.2f} s  "
+              f"wall {ticks / wall:>9,.0f} ticks/s  one core each {projected:>10,.0f} ticks/s "
+              f"({projected / base:4.1f}x)  imbalance {max(alerts) / (sum(alerts) / n):.2f}  "
+              f"fired {sum(s['fired'] for s in stats):,}  duplicates {duplicates}")
+
+    members = [f"worker-{i}" for i in range(4)]
+    join_at = args.ticks // 2
+    stats, wall, duplicates = run_workers(args, members, members + ["worker-4"], join_at=join_at,
+                                          reshard_at=join_at + int(args.ticks * args.lag))
+    print(f"rebalance 4 -> 5 workers at tick {join_at}: fired {sum(s['fired'] for s in stats):,}  "
+          f"lost claims {sum(s['lost_claims'] for s in stats):,}  duplicates {duplicates}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# backend/benchmarks/auth_load_bench.py
+"""
+p99 of authenticated reads while logins are running.
+
+Serves a small FastAPI app with `/login` (bcrypt check of a stored hash)
+and `/me` (bearer token dependency), then fires concurrent logins while
+an open-loop client hammers `/me`:
+
+  * before: bcrypt on the event loop, every token decoded and verified
+  * after:  bcrypt in the auth thread pool, verified claims served from
+            the claims cache until the token expires
+
+    python -m backend.benchmarks.auth_load_bench --duration 10 --login-concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+import uvicorn
+from fastapi import Depends, FastAPI, HTTPException
+from jose import JWTError, jwt
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.auth_service import (  # noqa: E402
+    create_access_token, hash_password, verify_password, verify_password_async,
+)
+from backend.utils.token import ALGORITHM, SECRET_KEY, claims_cache, oauth2_scheme, verify_access_token  # noqa: E402
+
+PORT = 8768
+PASSWORD = "correct horse battery staple"
+
+
+def verify_access_token_uncached(token: str = Depends(oauth2_scheme)):
+    """The dependency as it was: a full decode per request"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def make_app(mode: str, hashed: str):
+    app = FastAPI()
+    dependency = verify_access_token if mode == "after" else verify_access_token_uncached
+
+    @app.post("/login")
+    async def login():
+        if mode == "after":
+            ok = await verify_password_async(PASSWORD, hashed)
+        else:
+            ok = verify_password(PASSWORD, hashed)
+        if not ok:
+            raise HTTPException(status_code=400, detail="Invalid credentials")
+        return {"ok": True}
+
+    @app.get("/me")
+    async def me(current_user=Depends(dependency)):
+        return {"user": current_user["sub"]}
+
+    return app
+
+
+async def load(args, mode, hashed, tokens):
+    claims_cache.clear()
+    server = uvicorn.Server(uvicorn.Config(make_app(mode, hashed), port=PORT, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    latencies, logins = [], 0
+    stop = time.monotonic() + args.duration
+    async with aiohttp.ClientSession() as session:
+        async def read(scheduled, token):
+            async with session.get(f"http://127.0.0.1:{PORT}/me",
+                                   headers={"Authorization": f"Bearer {token}"}) as r:
+                await r.read()
+                assert r.status == 200, r.status
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        async def reader(offset):
+            # Open loop: latency counts from the scheduled send time
+            pending, i = [], offset
+            scheduled = time.perf_counter()
+            while time.monotonic() < stop:
+                pending.append(asyncio.create_task(read(scheduled, tokens[i % len(tokens)])))
+                i += 1
+                scheduled += args.read_interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await asyncio.gather(*pending)
+
+        async def login_client():
+            nonlocal logins
+            while time.monotonic() < stop:
+                async with session.post(f"http://127.0.0.1:{PORT}/login") as r:
+                    await r.read()
+                logins += 1
+
+        await asyncio.gather(*(reader(n) for n in range(args.readers)),
+                             *(login_client() for _ in range(args.login_concurrency)))
+
+    server.should_exit = True
+    await serve_task
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{mode:>6}  /me n={len(latencies):>5}  p50={statistics.median(latencies):8.1f} ms  "
+          f"p99={p99:8.1f} ms  max={latencies[-1]:8.1f} ms  logins={logins / args.duration:6.1f}/s  "
+          f"cache hits={claims_cache.hits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--read-interval", type=float, default=0.01)
+    parser.add_argument("--users", type=int, default=200, help="distinct tokens used by the readers")
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    tokens = [create_access_token({"sub": f"user-{i}", "email": f"user{i}@example.com"}) for i in range(args.users)]
+    for mode in ("before", "after"):
+        asyncio.run(load(args, mode, hashed, tokens))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# backend/benchmarks/email_outbox_bench.py
+"""
+Emails per second against a local SMTP sink (requires `aiosmtpd`).
+
+Compares the old path (connect, send one message, quit) with EmailOutbox
+(persistent sessions shared by a worker pool). The sink can add a delay
+per message to mimic a remote relay.
+
+    python -m backend.benchmarks.email_outbox_bench --messages 500 --workers 8
+"""
+import argparse
+import asyncio
+import smtplib
+import time
+
+from aiosmtpd.controller import Controller
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.email_services import EmailOutbox, build_message  # noqa: E402
+
+PORT = 8025
+
+
+class SinkHandler:
+    def __init__(self, delay):
+        self.delay = delay
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        return "250 OK"
+
+
+def old_send(n):
+    for i in range(n):
+        server = smtplib.SMTP("127.0.0.1", PORT)
+        server.sendmail("bench@example.com", f"user{i}@example.com",
+                        build_message("bench@example.com", f"user{i}@example.com", "Alert", "body"))
+        server.quit()
+
+
+async def outbox_send(n, workers):
+    outbox = EmailOutbox("127.0.0.1", PORT, None, None, "bench@example.com", workers=workers, use_tls=False)
+    await outbox.start()
+    for i in range(n):
+        outbox.enqueue(f"user{i}@example.com", "Alert", "body")
+    await outbox.stop(timeout=600)
+    return outbox
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--sink-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    handler = SinkHandler(args.sink_delay_ms / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=PORT)
+    controller.start()
+    try:
+        start = time.perf_counter()
+        old_send(args.messages)
+        elapsed = time.perf_counter() - start
+        print(f"connect-per-message  {args.messages / elapsed:8.1f} emails/s  ({args.messages} sent, {args.messages} connections)")
+
+        start = time.perf_counter()
+        outbox = asyncio.run(outbox_send(args.messages, args.workers))
+        elapsed = time.perf_counter() - start
+        print(f"outbox x{args.workers:<3}          {outbox.sent / elapsed:8.1f} emails/s  "
+              f"({outbox.sent} sent, {outbox.failed} failed, {outbox.connections} connections)")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# backend/benchmarks/ingest_bench.py
+"""
+Benchmark live ingestion against a local stub of Finnhub's /quote endpoint.
+
+Compares the old loop (one symbol at a time, a new ClientSession per symbol)
+with ingest_all() (market data client: shared session, bounded lookups,
+rate budget). Only the Finnhub provider is enabled so failures stay failures.
+Rows are discarded so only the fetch path is measured.
+
+    python -m backend.benchmarks.ingest_bench --symbols 500 --latency-ms 100
+"""
+import argparse
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+from aiohttp import web
+
+from backend.benchmarks._env import use_dummy_settings
+
+PORT = 8766
+
+
+def make_stub(latency, fail_rate):
+    stats = {"requests": 0}
+
+    async def quote(request):
+        stats["requests"] += 1
+        await asyncio.sleep(latency)
+        if random.random() < fail_rate:
+            return web.json_response({"error": "boom"}, status=500)
+        return web.json_response({"c": 100.0, "h": 101.0, "l": 99.0, "o": 100.0, "pc": 99.5, "t": int(time.time())})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/quote", quote)
+    return app, stats
+
+
+class NullPool:
+    """Stands in for the asyncpg pool; rows are counted and dropped"""
+
+    rows = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self
+
+    async def execute(self, *args):
+        return None
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.rows += len(records)
+
+
+async def old_ingest(symbols, url, token):
+    for symbol in symbols:
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, params={"symbol": symbol, "token": token}) as response:
+                    await response.json()
+        except Exception:
+            pass
+
+
+async def run(args):
+    use_dummy_settings(FINNHUB_API_URL=f"http://127.0.0.1:{PORT}/api/v1", MARKET_DATA_PROVIDERS="finnhub",
+                       FINNHUB_CALLS_PER_MINUTE=args.calls_per_minute)
+    from backend.services.data_ingestion import ingest_all
+    from backend.utils.http import close_http_session
+
+    app, stats = make_stub(args.latency_ms / 1000, args.fail_rate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    try:
+        if not args.skip_old:
+            start = time.perf_counter()
+            await old_ingest(symbols, f"http://127.0.0.1:{PORT}/api/v1/quote", "bench")
+            print(f"sequential   {args.symbols} symbols  {time.perf_counter() - start:7.2f} s  ({stats['requests']} requests)")
+
+        stats["requests"] = 0
+        start = time.perf_counter()
+        summary = await ingest_all(symbols, concurrency=args.concurrency, pool=NullPool())
+        elapsed = time.perf_counter() - start
+        print(f"concurrent   {args.symbols} symbols  {elapsed:7.2f} s  ({stats['requests']} requests, "
+              f"{len(summary['failed'])} failed, concurrency={args.concurrency})")
+        print(f"buffer       {summary['buffer']}")
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--calls-per-minute", type=int, default=100_000)
+    parser.add_argument("--fail-rate", type=float, default=0.01)
+    parser.add_argument("--skip-old", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# backend/benchmarks/leader_bench.py
+"""
+Background jobs across uvicorn workers: every worker vs leader election.
+
+`--workers` electors share one in-memory lease with the same semantics as
+MongoLease / RedisLease (owner + expiry, conditional take-over). Each job
+start/stop is counted, and the number of copies running is sampled every
+10 ms. The scenarios are run in order:
+
+  * election:  all workers start together
+  * handoff:   the leader shuts down cleanly (stops its job, releases)
+  * crash:     the leader dies without releasing (job gone, lease left to expire)
+  * partition: the leader can no longer reach the lease store
+
+Reports how many copies of the job ran at once (before: one per worker) and
+how long the job had no owner in each scenario.
+
+    python -m backend.benchmarks.leader_bench --workers 8 --ttl 1.5
+"""
+import argparse
+import asyncio
+import time
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.leader import LeaderElector  # noqa: E402
+
+
+class MemoryLeaseStore:
+    def __init__(self):
+        self.owner = None
+        self.expires_at = 0.0
+
+
+class MemoryLease:
+    def __init__(self, store, name, owner, ttl):
+        self.store = store
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.reachable = True
+
+    async def acquire(self):
+        await asyncio.sleep(0.002)  # a round trip
+        if not self.reachable:
+            raise ConnectionError("lease store unreachable")
+        now = time.monotonic()
+        if self.store.owner in (None, self.owner) or self.store.expires_at <= now:
+            self.store.owner, self.store.expires_at = self.owner, now + self.ttl
+            return True
+        return False
+
+    async def release(self):
+        if self.store.owner == self.owner:
+            self.store.owner = None
+
+
+class Job:
+    """Counts running copies; a copy "sends" while it runs"""
+
+    def __init__(self):
+        self.running = set()
+        self.max_running = 0
+        self.samples = []  # (time, copies)
+
+    def for_worker(self, worker):
+        async def start():
+            self.running.add(worker)
+            self.max_running = max(self.max_running, len(self.running))
+
+        async def stop():
+            self.running.discard(worker)
+        return start, stop
+
+    async def sample(self):
+        while True:
+            self.samples.append((time.monotonic(), len(self.running)))
+            self.max_running = max(self.max_running, len(self.running))
+            await asyncio.sleep(0.01)
+
+    def unowned_seconds(self, since):
+        points = [(t, n) for t, n in self.samples if t >= since]
+        return sum(b[0] - a[0] for a, b in zip(points, points[1:]) if a[1] == 0)
+
+
+async def wait_for(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def run(args):
+    store, job = MemoryLeaseStore(), Job()
+    electors = []
+    for i in range(args.workers):
+        owner = f"worker-{i}"
+        start, stop = job.for_worker(owner)
+        electors.append(LeaderElector(MemoryLease(store, "alerts", owner, args.ttl), start, stop))
+    sampler = asyncio.create_task(job.sample())
+
+    def leader():
+        return next((e for e in electors if e.is_leader), None)
+
+    def report(label, since):
+        print(f"{label:<10} max copies running {job.max_running}  "
+              f"no owner for {job.unowned_seconds(since):5.2f} s  "
+              f"(now led by {leader().lease.owner if leader() else '-'})")
+
+    print(f"before: every worker starts the job -> {args.workers} copies "
+          f"({args.workers}x upstream calls, up to {args.workers} emails per alert)")
+    print(f"lease ttl {args.ttl} s, renew/retry every {args.ttl / 3:.2f} s")
+
+    t0 = time.monotonic()
+    for elector in electors:
+        elector.start()
+    await wait_for(lambda: leader() is not None)
+    await asyncio.sleep(args.ttl)
+    report("election", t0)
+
+    t0 = time.monotonic()
+    old = leader()
+    await old.close()
+    electors.remove(old)
+    await wait_for(lambda: leader() is not None)
+    await asyncio.sleep(args.ttl)
+    report("handoff", t0)
+
+    t0 = time.monotonic()
+    old = leader()
+    old._task.cancel()  # the process is gone: no stop, no release
+    old.is_leader = False
+    job.running.discard(old.lease.owner)
+    electors.remove(old)
+    await wait_for(lambda: leader() is not None)
+    await asyncio.sleep(args.ttl)
+    report("crash", t0)
+
+    t0 = time.monotonic()
+    old = leader()
+    old.lease.reachable = False
+    await wait_for(lambda: not old.is_leader)
+    await wait_for(lambda: leader() is not None)
+    await asyncio.sleep(args.ttl)
+    report("partition", t0)
+
+    sampler.cancel()
+    for elector in electors:
+        await elector.close()
+    print(f"at most {job.max_running} copy of the job ran at any time (before: {args.workers})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ttl", type=float, default=1.5, help="lease seconds (15 in production)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
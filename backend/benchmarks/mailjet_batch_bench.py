@@ -0,0 +1,94 @@
+# backend/benchmarks/mailjet_batch_bench.py
+"""
+Alert emails per second against the local Mailjet stand-in.
+
+Compares the old path (one v3.1 call with a single message per trigger)
+with MailjetBatcher (up to 50 messages per call). A share of messages fails
+transiently so the retry path is exercised; every alert must end up with
+exactly one result.
+
+    python -m backend.benchmarks.mailjet_batch_bench --alerts 2000 --latency-ms 80
+"""
+import argparse
+import threading
+import time
+
+from mailjet_rest import Client
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.benchmarks.stub_mailjet import start_in_thread  # noqa: E402
+from backend.services.mailjet_batcher import MailjetBatcher  # noqa: E402
+
+PORT = 8780
+
+
+def make_message(i):
+    return {
+        "From": {"Email": "bench@example.com", "Name": "Stock Alert Bot"},
+        "To": [{"Email": f"user{i}@example.com"}],
+        "Subject": "📈 Stock Alert: AAPL (BUY)",
+        "TextPart": "body",
+        "CustomID": str(i),
+    }
+
+
+def old_send(client, n):
+    ok = 0
+    for i in range(n):
+        result = client.send.create(data={"Messages": [make_message(i)]})
+        ok += result.status_code == 200
+    return ok
+
+
+def batched_send(client, n, window):
+    batcher = MailjetBatcher(client, window=window, backoff=0.05)
+    results = {}
+    done = threading.Event()
+
+    def on_result(i):
+        def record(ok, result):
+            results[i] = ok
+            if len(results) == n:
+                done.set()
+        return record
+
+    batcher.start()
+    for i in range(n):
+        batcher.submit(make_message(i), on_result(i))
+    done.wait()
+    batcher.stop()
+    return batcher, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--old-alerts", type=int, default=200, help="the old path is slow; time a sample")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--transient-rate", type=float, default=0.02)
+    parser.add_argument("--window", type=float, default=0.2)
+    args = parser.parse_args()
+
+    app = start_in_thread(port=PORT, latency=args.latency_ms / 1000, transient_rate=args.transient_rate)
+    client = Client(auth=("bench", "bench"), version="v3.1", api_url=f"http://127.0.0.1:{PORT}/")
+
+    start = time.perf_counter()
+    ok = old_send(client, args.old_alerts)
+    elapsed = time.perf_counter() - start
+    print(f"one call per alert   {args.old_alerts / elapsed:8.1f} alerts/s  "
+          f"({ok}/{args.old_alerts} accepted, no retries, {args.old_alerts} requests)")
+
+    requests_before = app["stats"]["requests"]
+    start = time.perf_counter()
+    batcher, results = batched_send(client, args.alerts, args.window)
+    elapsed = time.perf_counter() - start
+    print(f"batched x50          {args.alerts / elapsed:8.1f} alerts/s  "
+          f"({batcher.sent} sent, {batcher.failed} failed, {batcher.retries} retries, "
+          f"{app['stats']['requests'] - requests_before} requests, {len(results)} results)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# backend/benchmarks/market_data_bench.py
+"""
+Upstream quote calls with and without the shared market data client.
+
+A local stub of Finnhub's /quote answers 429 once `--quota` requests have
+been made in the current minute. Three consumers ask for the same symbols
+on their own schedules, as the price monitor, the alert checker and live
+ingestion do:
+
+  * separate: each consumer requests every symbol itself (the old code)
+  * shared:   all three go through one MarketDataClient (token bucket sized
+              to the quota, singleflight, TTL cache, failover to a fallback
+              provider when the bucket is empty)
+
+    python -m backend.benchmarks.market_data_bench --symbols 50 --quota 60 --duration 30
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.market_data import FinnhubProvider, MarketDataClient, QuoteProvider  # noqa: E402
+from backend.utils.http import close_http_session  # noqa: E402
+from backend.utils.rate_limit import AsyncTokenBucket  # noqa: E402
+
+PORT = 8769
+
+
+def make_stub(quota, latency):
+    stats = {"requests": 0, "throttled": 0, "window": 0, "window_start": time.monotonic()}
+
+    async def quote(request):
+        now = time.monotonic()
+        if now - stats["window_start"] >= 60:
+            stats["window"], stats["window_start"] = 0, now
+        stats["requests"] += 1
+        stats["window"] += 1
+        over_quota = stats["window"] > quota
+        await asyncio.sleep(latency)
+        if over_quota:
+            stats["throttled"] += 1
+            return web.json_response({"error": "API limit reached"}, status=429)
+        return web.json_response({"c": 100.0, "h": 101.0, "l": 99.0, "o": 100.0, "t": int(time.time())})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/quote", quote)
+    return app, stats
+
+
+class FallbackProvider(QuoteProvider):
+    """Stands in for the Yahoo-backed history store: one call per batch"""
+    name = "fallback"
+    per_symbol = False
+
+    async def fetch_many(self, symbols):
+        await asyncio.sleep(0.05)
+        return {s: {"symbol": s, "price": 100.0, "provider": self.name} for s in symbols}
+
+
+async def consumer(stop, interval, lookup, symbols, priced):
+    while time.monotonic() < stop:
+        results = await lookup(symbols)
+        priced["lookups"] += len(symbols)
+        priced["priced"] += len(results)
+        await asyncio.sleep(interval)
+
+
+async def run_mode(args, mode, stats):
+    url = f"http://127.0.0.1:{PORT}/api/v1"
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    priced = {"lookups": 0, "priced": 0}
+    stats.update(requests=0, throttled=0, window=0, window_start=time.monotonic())
+
+    client = MarketDataClient(
+        [FinnhubProvider(url, "bench"), FallbackProvider()],
+        buckets={"finnhub": AsyncTokenBucket(args.quota, burst=max(1, args.quota // 6))},
+        ttl=args.ttl,
+    )
+    async with aiohttp.ClientSession() as session:
+        async def separate(batch):
+            async def one(symbol):
+                async with session.get(f"{url}/quote", params={"symbol": symbol, "token": "bench"}) as r:
+                    return symbol, (await r.json()) if r.status == 200 else None
+            return {s: q for s, q in await asyncio.gather(*(one(s) for s in batch)) if q}
+
+        lookup = separate if mode == "separate" else client.get_quotes
+        stop = time.monotonic() + args.duration
+        await asyncio.gather(
+            consumer(stop, args.monitor_interval, lookup, symbols, priced),
+            consumer(stop, args.checker_interval, lookup, symbols, priced),
+            consumer(stop, args.ingest_interval, lookup, symbols, priced),
+        )
+
+    per_minute = stats["requests"] * 60 / args.duration
+    print(f"{mode:>9}  upstream {stats['requests']:>5} ({per_minute:>6.0f}/min, quota {args.quota})  "
+          f"429s {stats['throttled']:>5}  priced {priced['priced']}/{priced['lookups']}")
+    if mode == "shared":
+        metrics = client.metrics()
+        print(f"           hit ratio {metrics['cache_hit_ratio']:.2f}  coalesced {metrics['coalesced']}  "
+              f"failovers {metrics['failovers']}  calls {metrics['upstream_calls_total']}")
+
+    # Singleflight: a burst of identical lookups is one upstream call
+    if mode == "shared":
+        burst = MarketDataClient([FinnhubProvider(url, "bench")], ttl=args.ttl)
+        stats["window"] = 0
+        before = stats["requests"]
+        await asyncio.gather(*(burst.get_quote("BURST") for _ in range(1000)))
+        print(f"           1000 concurrent lookups of one symbol -> {stats['requests'] - before} upstream call(s)")
+
+
+async def run(args):
+    app, stats = make_stub(args.quota, args.latency_ms / 1000)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    try:
+        for mode in ("separate", "shared"):
+            await run_mode(args, mode, stats)
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--quota", type=int, default=60, help="upstream calls per minute")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--ttl", type=float, default=5.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--monitor-interval", type=float, default=3.0)
+    parser.add_argument("--checker-interval", type=float, default=6.0)
+    parser.add_argument("--ingest-interval", type=float, default=4.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
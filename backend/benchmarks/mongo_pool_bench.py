@@ -0,0 +1,127 @@
+# backend/benchmarks/mongo_pool_bench.py
+"""
+Server connections and request latency under concurrency: separate sync
+MongoClients vs the shared async client.
+
+Needs a reachable MongoDB (MONGO_USER/MONGO_PASSWORD/MONGO_HOST/MONGO_PORT).
+Users are seeded into a scratch database, then `--concurrency` coroutines
+each look up users by email until `--requests` lookups are done:
+
+  * sync:  three pymongo clients (main.py, alert_service.py, mongo_model.py
+           before the change), called from coroutines, so every lookup
+           blocks the event loop
+  * async: the shared Motor client from backend.db.connection
+
+Latency is measured per lookup, including time spent waiting for the loop.
+Connections are read from serverStatus before and after each run.
+
+    python -m backend.benchmarks.mongo_pool_bench --concurrency 200 --requests 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from pymongo import MongoClient
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.core.config import settings  # noqa: E402
+from backend.db.connection import close_mongo, get_mongo_client  # noqa: E402
+
+BENCH_DB = "bench_mongo_pool"
+
+
+def mongo_uri():
+    return f"mongodb://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_HOST}:{settings.MONGO_PORT}/?authSource=admin"
+
+
+def current_connections(admin: MongoClient) -> int:
+    return admin.admin.command("serverStatus")["connections"]["current"]
+
+
+def seed(admin: MongoClient, n_users: int):
+    users = admin[BENCH_DB]["users"]
+    users.drop()
+    users.insert_many({"email": f"user{i}@example.com", "watchlist": ["AAPL", "TSLA"]} for i in range(n_users))
+    users.create_index("email", unique=True)
+
+
+def report(label, latencies, elapsed, connections):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<6} {len(latencies) / elapsed:>9.0f} req/s  p50 {p50:>7.2f} ms  p99 {p99:>8.2f} ms  "
+          f"connections +{connections}")
+
+
+async def run_sync(n_requests, concurrency, n_users):
+    clients = [MongoClient(mongo_uri()) for _ in range(3)]
+    collections = [client[BENCH_DB]["users"] for client in clients]
+    latencies, counter = [], iter(range(n_requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await asyncio.sleep(0)  # request arrives, waits for the loop
+            collections[i % 3].find_one({"email": f"user{i % n_users}@example.com"})
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, clients
+
+
+async def run_async(n_requests, concurrency, n_users):
+    collection = get_mongo_client()[BENCH_DB]["users"]
+    latencies, counter = [], iter(range(n_requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            await collection.find_one({"email": f"user{i % n_users}@example.com"})
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    admin = MongoClient(mongo_uri())
+    seed(admin, args.users)
+
+    try:
+        before = current_connections(admin)
+        start = time.perf_counter()
+        latencies, clients = asyncio.run(run_sync(args.requests, args.concurrency, args.users))
+        elapsed = time.perf_counter() - start
+        report("sync", latencies, elapsed, current_connections(admin) - before)
+        for client in clients:
+            client.close()
+
+        async def run_shared():
+            try:
+                before = current_connections(admin)
+                start = time.perf_counter()
+                latencies = await run_async(args.requests, args.concurrency, args.users)
+                elapsed = time.perf_counter() - start
+                report("async", latencies, elapsed, current_connections(admin) - before)
+            finally:
+                close_mongo()
+
+        asyncio.run(run_shared())
+    finally:
+        admin.drop_database(BENCH_DB)
+        admin.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/benchmarks/positions_bench.py
+"""
+Portfolio view latency: replaying trade history vs materialized positions.
+
+  * replay:       every view folds all of the user's trades with apply_trade
+                  and reads the latest bar of each symbol from its Parquet file
+  * materialized: positions already folded at log_trade time; each view is
+                  HistoryStore.cached_bars + value_positions
+
+Bars live in a temporary HistoryStore, so no network or MongoDB is needed.
+The Mongo side of the materialized path is one indexed find on `positions`.
+
+    python -m backend.benchmarks.positions_bench --trades 100000 --symbols 50 --views 200
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.history_store import FixtureProvider, HistoryStore  # noqa: E402
+from backend.services.positions_service import apply_trade, value_positions  # noqa: E402
+
+
+def make_trades(n, symbols, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"symbol": rng.choice(symbols), "action": rng.choice(["BUY", "BUY", "SELL"]),
+         "quantity": rng.randint(1, 100), "price": round(rng.uniform(50, 500), 2)}
+        for _ in range(n)
+    ]
+
+
+def seed_store(root, symbols, bars=390):
+    store = HistoryStore(root, FixtureProvider(root))
+    index = pd.date_range(end=pd.Timestamp.now(tz="UTC").floor("min"), periods=bars, freq="1min", name="timestamp")
+    rng = np.random.default_rng(0)
+    for symbol in symbols:
+        close = 100 + rng.standard_normal(bars).cumsum()
+        frame = pd.DataFrame({"open": close, "high": close, "low": close, "close": close,
+                              "volume": rng.integers(100, 1000, bars)}, index=index)
+        store._write(symbol, "1m", frame)
+    return store
+
+
+def fold(trades):
+    positions = {}
+    for trade in trades:
+        positions[trade["symbol"]] = apply_trade(
+            positions.get(trade["symbol"], {}), trade["action"], trade["quantity"], trade["price"])
+    return [{"symbol": symbol, **position} for symbol, position in positions.items()]
+
+
+def replay_view(store, trades):
+    positions = fold(trades)
+    bars = {}
+    for p in positions:
+        df = store.read(p["symbol"], "1m")
+        bars[p["symbol"]] = (df.index[-1], float(df["close"].iloc[-1]))
+    return value_positions(positions, bars)
+
+
+def materialized_view(store, positions):
+    bars = store.cached_bars([p["symbol"] for p in positions if p["quantity"]])
+    return value_positions(positions, bars)
+
+
+def timed(label, views, fn):
+    latencies = []
+    for _ in range(views):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"{label:<14} p50 {statistics.median(latencies) * 1000:>8.2f} ms  p99 {p99 * 1000:>8.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--views", type=int, default=200)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    trades = make_trades(args.trades, symbols)
+    with tempfile.TemporaryDirectory() as root:
+        store = seed_store(root, symbols)
+        replayed = timed("replay", max(1, args.views // 20), lambda: replay_view(store, trades))
+        positions = fold(trades)  # what the positions collection holds after the same trades
+        materialized = timed("materialized", args.views, lambda: materialized_view(store, positions))
+
+    assert np.isclose(replayed["totals"]["unrealized_pnl"], materialized["totals"]["unrealized_pnl"])
+    totals = materialized["totals"]
+    print(f"  {len(materialized['positions'])} open positions, value {totals['market_value']:,.2f}, "
+          f"unrealized {totals['unrealized_pnl']:,.2f}, realized {totals['realized_pnl']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend/benchmarks/prediction_engine_bench.py
+"""
+Latency and peak memory of the Prophet and Monte Carlo prediction engines.
+
+Both engines run on the same synthetic 6-month hourly history and answer
+the same set of thresholds. Peak memory is measured with tracemalloc, which
+covers NumPy buffers but not the cmdstan subprocess Prophet fits in.
+
+    python -m backend.benchmarks.prediction_engine_bench --thresholds 20
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backend.services.montecarlo_service import hit_probabilities
+
+
+def synthetic_history(n_bars=900, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n_bars)))
+    ds = pd.date_range(end=pd.Timestamp.utcnow().floor("h").tz_localize(None), periods=n_bars, freq="h")
+    return pd.DataFrame({"ds": ds, "y": closes})
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def run_prophet(df, thresholds):
+    from prophet import Prophet
+
+    model = Prophet(daily_seasonality=True, weekly_seasonality=True, changepoint_prior_scale=0.3)
+    model.fit(df[["ds", "y"]])
+    forecast = model.predict(model.make_future_dataframe(periods=90 * 24, freq="H"))
+    yhat = forecast["yhat"].to_numpy()
+    running_max, running_min = np.maximum.accumulate(yhat), np.minimum.accumulate(yhat)
+    current = df["y"].iloc[-1]
+    return [
+        np.searchsorted(running_max, t) if t > current else np.searchsorted(-running_min, -t)
+        for t in thresholds
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=900)
+    parser.add_argument("--thresholds", type=int, default=20)
+    parser.add_argument("--paths", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--skip-prophet", action="store_true")
+    args = parser.parse_args()
+
+    df = synthetic_history(args.bars)
+    current = float(df["y"].iloc[-1])
+    thresholds = list(np.linspace(current * 0.8, current * 1.2, args.thresholds))
+
+    print(f"{'engine':>18} {'latency_s':>10} {'peak_MiB':>9}")
+    for n_paths in args.paths:
+        _, elapsed, peak = measure(lambda: hit_probabilities(df["y"].to_numpy(), thresholds, n_paths=n_paths, seed=0))
+        print(f"{'montecarlo ' + str(n_paths):>18} {elapsed:>10.3f} {peak:>9.1f}")
+
+    if not args.skip_prophet:
+        _, elapsed, peak = measure(lambda: run_prophet(df, thresholds))
+        print(f"{'prophet':>18} {elapsed:>10.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# backend/benchmarks/prediction_load_bench.py
+"""
+p99 latency of an unrelated endpoint while predictions are running.
+
+Serves a small FastAPI app with `/ping` and `/predict/{symbol}`, then hammers
+`/ping` while a stream of prediction requests arrives. Predictions run
+either inline on the event loop (old `/add-alert/` behaviour) or through
+PredictionJobs. The fit is a synthetic CPU-bound stand-in for Prophet.
+
+    python -m backend.benchmarks.prediction_load_bench --fit-seconds 1.0
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import aiohttp
+import numpy as np
+import uvicorn
+from fastapi import FastAPI
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
+
+from backend.services.predict_service import Forecast, describe_crossing, forecast_cache  # noqa: E402
+from backend.services.prediction_jobs import PredictionJobs  # noqa: E402
+
+PORT = 8767
+FIT_SECONDS = float(os.environ.get("BENCH_FIT_SECONDS", "1.0"))  # read again in pool workers
+
+
+def synthetic_forecast(symbol: str) -> Forecast:
+    """Burn CPU for FIT_SECONDS, then return a flat forecast"""
+    deadline = time.process_time() + FIT_SECONDS
+    x = 0.0
+    while time.process_time() < deadline:
+        x += sum(i * i for i in range(1000))
+    yhat = np.linspace(100, 110, 3000)
+    ds = np.array([np.datetime64(datetime.utcnow() + timedelta(hours=i)) for i in range(3000)])
+    return Forecast(symbol, ds, yhat, np.maximum.accumulate(yhat), np.minimum.accumulate(yhat),
+                    100.0, datetime.utcnow() + timedelta(hours=1))
+
+
+def make_app(mode: str, jobs: PredictionJobs):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/predict/{symbol}")
+    async def predict(symbol: str, threshold: float = 105.0):
+        if mode == "inline":
+            return {"result": describe_crossing(synthetic_forecast(symbol), threshold)}
+        return jobs.submit(symbol, threshold)
+
+    return app
+
+
+async def load(args, mode):
+    forecast_cache._entries.clear()
+    jobs = PredictionJobs(max_workers=args.workers, forecast_fn=synthetic_forecast)
+    server = uvicorn.Server(uvicorn.Config(make_app(mode, jobs), port=PORT, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    latencies = []
+    stop = time.monotonic() + args.duration
+    async with aiohttp.ClientSession() as session:
+        async def ping(scheduled):
+            async with session.get(f"http://127.0.0.1:{PORT}/ping") as r:
+                await r.read()
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        async def pinger():
+            # Open loop: latency counts from the scheduled send time, so a
+            # blocked event loop cannot hide the requests it delayed
+            pending = []
+            scheduled = time.perf_counter()
+            while time.monotonic() < stop:
+                pending.append(asyncio.create_task(ping(scheduled)))
+                scheduled += args.ping_interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await asyncio.gather(*pending)
+
+        async def predictor():
+            i = 0
+            while time.monotonic() < stop:
+                # distinct symbols so the cache does not absorb the load
+                async with session.post(f"http://127.0.0.1:{PORT}/predict/SYM{i}") as r:
+                    await r.read()
+                i += 1
+                await asyncio.sleep(args.prediction_interval)
+
+        await asyncio.gather(*(pinger() for _ in range(args.pingers)), predictor())
+
+    jobs.shutdown()
+    server.should_exit = True
+    await serve_task
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{mode:>7}  /ping n={len(latencies):>5}  p50={statistics.median(latencies):8.1f} ms  "
+          f"p99={p99:8.1f} ms  max={latencies[-1]:8.1f} ms")
+
+
+def main():
+    global FIT_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--fit-seconds", type=float, default=1.0)
+    parser.add_argument("--prediction-interval", type=float, default=0.5)
+    parser.add_argument("--pingers", type=int, default=2)
+    parser.add_argument("--ping-interval", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    FIT_SECONDS = args.fit_seconds
+    os.environ["BENCH_FIT_SECONDS"] = str(args.fit_seconds)
+    for mode in ("inline", "jobs"):
+        asyncio.run(load(args, mode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/sentiment_bench.py
+"""
+Headlines per second for the sentiment scorers.
+
+Compares the old keyword substring scan, the lexicon scorer on every
+headline, and SentimentEngine with its per-article cache on a digest-like
+workload where the same headlines repeat across users.
+
+    python -m backend.benchmarks.sentiment_bench --headlines 2000 --users 5000
+"""
+import argparse
+import random
+import time
+
+from backend.services.sentiment import LexiconScorer, SentimentEngine
+
+SUBJECTS = ["Apple", "Tesla", "Nvidia", "Microsoft", "Amazon", "Alphabet", "Meta", "AMD"]
+TEMPLATES = [
+    "{s} shares surge after earnings beat estimates",
+    "{s} stock falls as guidance disappoints investors",
+    "{s} announces software update for enterprise customers",
+    "{s} reports record quarterly profit and revenue growth",
+    "{s} faces lawsuit over patent dispute",
+    "Analysts upgrade {s} citing strong demand",
+    "{s} did not miss expectations despite supply issues",
+    "{s} slumps amid broader market decline",
+]
+
+
+def old_analyze(text):
+    text = text.lower()
+    if any(word in text for word in ["gain", "positive", "growth", "up", "profit"]):
+        return "Positive"
+    elif any(word in text for word in ["loss", "down", "negative", "decline", "drop"]):
+        return "Negative"
+    return "Neutral"
+
+
+def make_articles(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"title": rng.choice(TEMPLATES).format(s=rng.choice(SUBJECTS)) + f" ({i})",
+         "url": f"https://news.example.com/{i}"}
+        for i in range(n)
+    ]
+
+
+def rate(label, count, elapsed):
+    print(f"{label:<28} {count / elapsed:>12,.0f} headlines/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headlines", type=int, default=2000, help="distinct articles")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--per-digest", type=int, default=18, help="headlines per user digest (6 tickers x 3)")
+    args = parser.parse_args()
+
+    articles = make_articles(args.headlines)
+    rng = random.Random(1)
+    digests = [rng.sample(articles, args.per_digest) for _ in range(args.users)]
+    total = args.users * args.per_digest
+
+    start = time.perf_counter()
+    for digest in digests:
+        for article in digest:
+            old_analyze(article["title"])
+    rate("substring scan", total, time.perf_counter() - start)
+
+    scorer = LexiconScorer()
+    start = time.perf_counter()
+    for digest in digests:
+        scorer.score_batch([article["title"] for article in digest])
+    rate("lexicon, no cache", total, time.perf_counter() - start)
+
+    engine = SentimentEngine(scorer)
+    start = time.perf_counter()
+    for digest in digests:
+        engine.analyze_articles(digest)
+    rate("engine, per-article cache", total, time.perf_counter() - start)
+    print(f"  cache hits {engine.hits}, misses {engine.misses}")
+
+    sample = ["Apple releases software update", "Tesla shares drop", "Nvidia posts record profit",
+              "Apple did not miss estimates"]
+    for headline in sample:
+        print(f"  {headline!r:40} old={old_analyze(headline):<8} new={engine.analyze(headline)}")
+
+
+if __name__ == "__main__":
+    main()
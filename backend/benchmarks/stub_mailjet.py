@@ -0,0 +1,109 @@
+# backend/benchmarks/stub_mailjet.py
+"""
+Local stand-in for the Mailjet v3.1 send endpoint.
+
+Accepts `POST /v3.1/send` with up to 50 messages, waits a fixed latency per
+request and answers with one result per message in request order, like the
+real API: 200 when every message succeeded, 400 with per-message errors
+otherwise. A fraction of messages can fail with a transient (500) or
+permanent (400) error, and whole requests can be rejected with 429.
+
+    python -m backend.benchmarks.stub_mailjet --port 8780 --latency-ms 80
+    MAILJET_API_URL=http://127.0.0.1:8780/ uvicorn backend.main:app
+"""
+import argparse
+import asyncio
+import random
+import threading
+import uuid
+
+from aiohttp import web
+
+MAX_MESSAGES = 50
+
+
+def make_app(latency: float = 0.08, transient_rate: float = 0.0, permanent_rate: float = 0.0,
+             throttle_rate: float = 0.0, seed: int = 0):
+    app = web.Application()
+    app["stats"] = {"requests": 0, "messages": 0, "delivered": 0, "throttled": 0}
+    rng = random.Random(seed)
+
+    async def send(request):
+        stats = request.app["stats"]
+        stats["requests"] += 1
+        payload = await request.json()
+        messages = payload.get("Messages") or []
+        await asyncio.sleep(latency)
+
+        if not messages or len(messages) > MAX_MESSAGES:
+            return web.json_response(
+                {"ErrorIdentifier": str(uuid.uuid4()), "StatusCode": 400,
+                 "ErrorMessage": f"Messages must contain 1 to {MAX_MESSAGES} items"},
+                status=400,
+            )
+        if rng.random() < throttle_rate:
+            stats["throttled"] += 1
+            return web.json_response({"StatusCode": 429, "ErrorMessage": "Too many requests"}, status=429)
+
+        results = []
+        for message in messages:
+            stats["messages"] += 1
+            roll = rng.random()
+            if roll < transient_rate:
+                errors = [{"ErrorCode": "send-0003", "StatusCode": 500, "ErrorMessage": "Internal error"}]
+            elif roll < transient_rate + permanent_rate:
+                errors = [{"ErrorCode": "mj-0013", "StatusCode": 400, "ErrorMessage": "Invalid email"}]
+            else:
+                errors = None
+
+            result = {"CustomID": message.get("CustomID", "")}
+            if errors:
+                result.update(Status="error", Errors=errors)
+            else:
+                stats["delivered"] += 1
+                result.update(Status="success", To=[{"Email": to["Email"], "MessageUUID": str(uuid.uuid4())}
+                                                    for to in message.get("To", [])])
+            results.append(result)
+
+        status = 200 if all(r["Status"] == "success" for r in results) else 400
+        return web.json_response({"Messages": results}, status=status)
+
+    app.router.add_post("/v3.1/send", send)
+    return app
+
+
+def start_in_thread(host="127.0.0.1", port=8780, **kwargs):
+    """Serve the stub from a background thread (for sync clients); returns the app"""
+    app = make_app(**kwargs)
+    ready = threading.Event()
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, host, port).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--transient-rate", type=float, default=0.0)
+    parser.add_argument("--permanent-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = make_app(args.latency_ms / 1000, args.transient_rate, args.permanent_rate, args.throttle_rate)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
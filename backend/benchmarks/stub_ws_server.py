@@ -0,0 +1,120 @@
+# backend/benchmarks/stub_ws_server.py
+"""
+Local stand-in for the Finnhub trade WebSocket.
+
+Speaks the same subscribe/unsubscribe protocol and replays ticks only for
+the symbols a client has subscribed to. Ticks come from a CSV file with
+`symbol,price` rows (optionally `timestamp_ms` as a third column) or from a
+seeded random walk.
+
+    python -m backend.benchmarks.stub_ws_server --port 8765 --symbols AAPL TSLA
+    PRICE_FEED_MODE=stream FINNHUB_WS_URL=ws://127.0.0.1:8765/ uvicorn backend.main:app
+
+`--drop-after N` closes each connection after N messages to exercise the
+client's reconnect path.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+
+from aiohttp import web, WSMsgType
+
+
+def random_walk_ticks(symbols, n_ticks, seed=0):
+    rng = random.Random(seed)
+    prices = {symbol: 100.0 for symbol in symbols}
+    for _ in range(n_ticks):
+        symbol = rng.choice(symbols)
+        prices[symbol] *= 1 + rng.gauss(0, 0.002)
+        yield symbol, round(prices[symbol], 4), None
+
+
+def csv_ticks(path):
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].lower() == "symbol":
+                continue
+            ts = int(row[2]) if len(row) > 2 and row[2] else None
+            yield row[0].upper(), float(row[1]), ts
+
+
+def make_app(ticks, interval: float = 0.01, drop_after: int | None = None, loop_ticks: bool = True):
+    """Build the aiohttp app; `ticks` is a list of (symbol, price, timestamp_ms)"""
+    app = web.Application()
+    app["stats"] = {"connections": 0, "subscribes": 0, "unsubscribes": 0, "sent": 0}
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        stats = request.app["stats"]
+        stats["connections"] += 1
+        subscribed = set()
+
+        async def replay():
+            sent = 0
+            while True:
+                for symbol, price, ts in ticks:
+                    if symbol not in subscribed:
+                        continue
+                    trade = {"s": symbol, "p": price, "t": ts or int(time.time() * 1000), "v": 1}
+                    await ws.send_str(json.dumps({"type": "trade", "data": [trade]}))
+                    stats["sent"] += 1
+                    sent += 1
+                    if drop_after and sent >= drop_after:
+                        await ws.close()
+                        return
+                    await asyncio.sleep(interval)
+                if not loop_ticks:
+                    return
+                await asyncio.sleep(interval)
+
+        replay_task = asyncio.create_task(replay())
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(msg.data)
+                symbol = str(payload.get("symbol", "")).upper()
+                if payload.get("type") == "subscribe":
+                    subscribed.add(symbol)
+                    stats["subscribes"] += 1
+                elif payload.get("type") == "unsubscribe":
+                    subscribed.discard(symbol)
+                    stats["unsubscribes"] += 1
+        finally:
+            replay_task.cancel()
+        return ws
+
+    app.router.add_get("/", handler)
+    return app
+
+
+async def start_stub_server(ticks, host="127.0.0.1", port=8765, **kwargs):
+    """Start the stub in the running loop; returns the runner (call `cleanup()` to stop)"""
+    runner = web.AppRunner(make_app(list(ticks), **kwargs))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ticks", help="CSV file with symbol,price[,timestamp_ms] rows")
+    parser.add_argument("--symbols", nargs="+", default=["AAPL", "TSLA", "GOOG"])
+    parser.add_argument("--count", type=int, default=10_000, help="random-walk ticks when no CSV is given")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between ticks")
+    parser.add_argument("--drop-after", type=int, default=None)
+    args = parser.parse_args()
+
+    ticks = list(csv_ticks(args.ticks)) if args.ticks else list(random_walk_ticks(args.symbols, args.count))
+    app = make_app(ticks, interval=args.interval, drop_after=args.drop_after)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
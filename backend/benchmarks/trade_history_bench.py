@@ -0,0 +1,127 @@
+# backend/benchmarks/trade_history_bench.py
+"""
+Trade history latency and memory at 1M trades for one user.
+
+Needs a reachable MongoDB (MONGO_* settings). Trades are seeded into a
+scratch database with the indexes from backend.db.indexes, then:
+
+  * full:   the old behaviour, every trade of the user materialized in one list
+  * pages:  DashboardService.stream_trade_history, following next_cursor
+            for `--pages` pages, timing each page end to end
+
+Peak Python memory is measured with tracemalloc.
+
+    python -m backend.benchmarks.trade_history_bench --trades 1000000 --pages 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings(MONGO_DB="bench_trade_history")
+
+from backend.db.connection import close_mongo, get_mongo_client, get_mongo_db  # noqa: E402
+from backend.db.indexes import ensure_indexes  # noqa: E402
+from backend.services.dashboard_service import DashboardService  # noqa: E402
+
+USER = "bench-user"
+SYMBOLS = ["AAPL", "TSLA", "NVDA", "MSFT", "AMZN", "GOOG", "META", "AMD"]
+
+
+async def seed(collection, n_trades, batch=10_000):
+    await collection.drop()
+    await ensure_indexes()
+    rng = random.Random(0)
+    start = datetime.utcnow() - timedelta(days=365 * 3)
+    step = timedelta(days=365 * 3) / n_trades
+    for offset in range(0, n_trades, batch):
+        await collection.insert_many([
+            {
+                "user_id": USER,
+                "symbol": rng.choice(SYMBOLS),
+                "action": rng.choice(["BUY", "SELL"]),
+                "quantity": rng.randint(1, 100),
+                "price": round(rng.uniform(50, 500), 2),
+                "timestamp": start + step * i,
+            }
+            for i in range(offset, min(offset + batch, n_trades))
+        ], ordered=False)
+
+
+async def full_history(collection):
+    trades = collection.find({"user_id": USER}).sort("timestamp", -1)
+    return [t async for t in trades]
+
+
+async def page(cursor, limit, symbol=None):
+    chunks = DashboardService.stream_trade_history(USER, limit=limit, cursor=cursor, symbol=symbol)
+    body = "".join([chunk async for chunk in chunks])
+    return json.loads(body)
+
+
+async def run(args):
+    collection = get_mongo_db()["trade_logs"]
+    if not args.reuse:
+        print(f"Seeding {args.trades:,} trades...")
+        await seed(collection, args.trades)
+
+    if not args.skip_full:
+        tracemalloc.start()
+        start = time.perf_counter()
+        trades = await full_history(collection)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        print(f"full history   {len(trades):>9,} rows  {elapsed * 1000:>9.1f} ms  peak {peak:>8.1f} MiB")
+        del trades
+
+    for symbol in (None, "AAPL"):
+        tracemalloc.start()
+        latencies, cursor, rows = [], None, 0
+        for _ in range(args.pages):
+            start = time.perf_counter()
+            result = await page(cursor, args.limit, symbol)
+            latencies.append(time.perf_counter() - start)
+            rows += result["count"]
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        latencies.sort()
+        p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+        label = f"pages {symbol or 'all'}"
+        print(f"{label:<14} {rows:>9,} rows  p50 {statistics.median(latencies) * 1000:>6.1f} ms  "
+              f"p99 {p99 * 1000:>6.1f} ms  peak {peak:>8.1f} MiB  ({len(latencies)} pages of {args.limit})")
+
+    if not args.keep:
+        await get_mongo_client().drop_database("bench_trade_history")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--skip-full", action="store_true")
+    parser.add_argument("--reuse", action="store_true", help="keep previously seeded trades")
+    parser.add_argument("--keep", action="store_true", help="do not drop the scratch database")
+    args = parser.parse_args()
+
+    async def wrapped():
+        try:
+            await run(args)
+        finally:
+            close_mongo()
+
+    asyncio.run(wrapped())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 # backend/core/config.py
 
-from pydantic import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Load environment variables from .env
@@ -19,18 +19,98 @@ class Settings(BaseSettings):
     MONGO_PASSWORD: str
     MONGO_HOST: str = "localhost"
     MONGO_PORT: int = 27017
+    MONGO_DB: str = "stock_app"
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_TIMEOUT_MS: int = 5000
 
     # API Keys
     FINNHUB_API_KEY: str
+    FINNHUB_API_URL: str = "https://finnhub.io/api/v1"
+    FINNHUB_CALLS_PER_MINUTE: int = 60
+
+    # Market data client: providers tried in order ("finnhub", "history" = Yahoo via the history store)
+    MARKET_DATA_PROVIDERS: str = "finnhub,history"
+    MARKET_DATA_QUOTE_TTL_SECONDS: float = 5.0
+    MARKET_DATA_FAILOVER_SECONDS: float = 30.0
+
+    # Live ingestion fan-out
+    INGEST_CONCURRENCY: int = 20
+
+    # Write-behind buffer for stock_prices
+    PRICE_BUFFER_MAX_ROWS: int = 500
+    PRICE_BUFFER_FLUSH_SECONDS: float = 1.0
+
+    # Active alerts are mirrored in memory; polling is the fallback without a replica set
+    ALERT_REGISTRY_CHANGE_STREAM: bool = True
+    ALERT_REGISTRY_POLL_SECONDS: float = 5.0
+
+    # Price feed: "poll" (REST quotes every ALERT_POLL_SECONDS), "adaptive" (each symbol
+    # polled by proximity to its nearest threshold, within a budget) or "stream" (WebSocket trades)
+    PRICE_FEED_MODE: str = "poll"
+    ALERT_POLL_SECONDS: float = 15.0
+    ALERT_POLL_BUDGET_PER_MINUTE: int = 50
+    ALERT_POLL_MIN_SECONDS: float = 2.0
+    ALERT_POLL_MAX_SECONDS: float = 900.0
+    ALERT_POLL_MARKET_HOURS_ONLY: bool = True
+    MARKET_TIMEZONE: str = "America/New_York"
+    MARKET_OPEN: str = "09:30"
+    MARKET_CLOSE: str = "16:00"
+    ALERT_PREDICTION_SECONDS: float = 60.0  # 0 disables the forecasts for waiting alerts
+    FINNHUB_WS_URL: str = "wss://ws.finnhub.io"
 
     # ✅ Mailjet Email Service
     MAILJET_API_KEY: str
     MAILJET_SECRET_KEY: str
     MAILJET_SENDER_EMAIL: str
+    MAILJET_API_URL: str = "https://api.mailjet.com/"
+    # Alert emails are batched into v3.1 send calls (API limit: 50 messages per call)
+    MAILJET_BATCH_SIZE: int = 50
+    MAILJET_BATCH_WINDOW_SECONDS: float = 1.0
+
+    # SMTP outbox (Mailjet relay, authenticated with the Mailjet keys)
+    SMTP_HOST: str = "in-v3.mailjet.com"
+    SMTP_PORT: int = 587
+    SMTP_USE_TLS: bool = True
+    EMAIL_WORKERS: int = 4
+
+    # Daily news digest: per-ticker cache shared by every user in a slot
+    NEWS_API_URL: str = "https://financialmodelingprep.com/api/v3"
+    NEWS_CACHE_TTL_SECONDS: int = 1800
+    NEWS_CALLS_PER_MINUTE: int = 300
+    NEWS_FETCH_CONCURRENCY: int = 10
+    NEWS_DISPATCH_CONCURRENCY: int = 50
+    # A slot that comes due while the scheduler is stalled or down is still sent late, unless it
+    # is further behind than this (a day by default: the next occurrence of the slot replaces it)
+    NEWS_MAX_CATCH_UP_MINUTES: int = 24 * 60
+
+    # Local OHLCV history (Parquet); set HISTORY_FIXTURE_DIR to read CSV fixtures instead of Yahoo
+    HISTORY_STORE_DIR: str = "data/history"
+    HISTORY_FIXTURE_DIR: str | None = None
+
+    # Prediction: fitted forecasts cached per symbol (LRU, bytes of arrays)
+    FORECAST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PREDICTION_WORKERS: int = 2
+    PREDICTION_ENGINE: str = "prophet"  # or "montecarlo"
+    MONTECARLO_PATHS: int = 5000
 
     # JWT
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    JWT_CLAIMS_CACHE_SIZE: int = 10_000
+
+    # bcrypt runs in this many threads, off the event loop
+    AUTH_HASH_WORKERS: int = 4
+
+    # Background jobs (alert engine, news scheduler) run in one process at a time, chosen by lease.
+    # Set RUN_BACKGROUND_JOBS=false on API workers when the jobs run in `python -m backend.worker`
+    RUN_BACKGROUND_JOBS: bool = True
+    LEADER_BACKEND: str = "mongo"  # or "redis" (REDIS_URL)
+    LEADER_LEASE_SECONDS: float = 15.0
+    # Split alert evaluation by symbol across every process running background jobs
+    # (consistent hashing) instead of electing one; the news scheduler is still elected
+    ALERT_SHARDING: bool = False
+    ALERT_SHARD_VNODES: int = 64
 
     # Member 2 specific
     REDIS_URL: str
@@ -45,9 +125,8 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # .env may carry keys for other tools (see .env.example); ignore them
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 # Global settings object
 settings = Settings()
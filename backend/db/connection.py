@@ -1,7 +1,7 @@
 import os
 import asyncpg
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
 # Load .env variables
 load_dotenv()
@@ -24,23 +24,45 @@ async def get_timescale_pool():
 # -------------------------------
 # MongoDB Setup
 # -------------------------------
-def get_mongo_client():
+# One Motor client (and so one connection pool) per process. Everything
+# that talks to Mongo goes through it, so I/O never blocks the event loop.
+_mongo_client: AsyncIOMotorClient | None = None
+
+
+def get_mongo_client() -> AsyncIOMotorClient:
     """
-    Return a MongoDB client connected using .env credentials
+    Return the shared async MongoDB client, creating it on first use.
+    No connection is opened until the first operation (or `connect_mongo`).
     """
-    mongo_user = os.getenv("MONGO_USER")
-    mongo_pass = os.getenv("MONGO_PASSWORD")
-    mongo_host = os.getenv("MONGO_HOST", "localhost")
-    mongo_port = int(os.getenv("MONGO_PORT", 27017))
+    global _mongo_client
+    if _mongo_client is None:
+        from backend.core.config import settings
 
-    client = MongoClient(
-        f"mongodb://{mongo_user}:{mongo_pass}@{mongo_host}:{mongo_port}/?authSource=admin"
-    )
-    return client
+        _mongo_client = AsyncIOMotorClient(
+            f"mongodb://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_HOST}:{settings.MONGO_PORT}/?authSource=admin",
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=settings.MONGO_TIMEOUT_MS,
+        )
+    return _mongo_client
 
-def get_mongo_db(db_name="stock_app"):
+
+def get_mongo_db(db_name: str | None = None):
     """
     Return MongoDB database instance
     """
-    client = get_mongo_client()
-    return client[db_name]
+    from backend.core.config import settings
+
+    return get_mongo_client()[db_name or settings.MONGO_DB]
+
+
+async def connect_mongo():
+    """Open the pool at startup so the first request does not pay for it"""
+    await get_mongo_client().admin.command("ping")
+
+
+def close_mongo():
+    global _mongo_client
+    if _mongo_client is not None:
+        _mongo_client.close()
+    _mongo_client = None
@@ -0,0 +1,135 @@
+# backend/db/indexes.py
+"""
+MongoDB indexes for the hot query patterns.
+
+`ensure_indexes` runs at startup and is idempotent: creating an index that
+already exists with the same keys and options is a no-op. `check_query_plans`
+runs `explain()` on each hot query and reports any that would scan the
+whole collection:
+
+    python -m backend.db.indexes            # create indexes
+    python -m backend.db.indexes --check    # create, then verify query plans
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from backend.db.connection import close_mongo, get_mongo_db
+
+INDEXES = {
+    "users": [
+        # login / signup / OTP lookups
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # news scheduler: users.find({"notify_news": True[, "news_time": "HH:MM"]})
+        IndexModel(
+            [("notify_news", ASCENDING), ("news_time", ASCENDING)],
+            name="notify_news_time",
+            partialFilterExpression={"notify_news": True},
+        ),
+    ],
+    "alerts": [
+        # monitors and alert checker: alerts.find({"active": True}), grouped by symbol
+        IndexModel(
+            [("active", ASCENDING), ("symbol", ASCENDING)],
+            name="active_symbol",
+            partialFilterExpression={"active": True},
+        ),
+        # alert registry polling fallback: find({"updated_at": {"$gte": mark}})
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ],
+    "trade_logs": [
+        # dashboard history: keyset pages on (timestamp, _id), newest first, optionally per symbol
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)], name="user_timestamp_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("symbol", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_symbol_timestamp_id",
+        ),
+    ],
+    "positions": [
+        # positions engine: one document per (user, symbol), upserted on every trade
+        IndexModel([("user_id", ASCENDING), ("symbol", ASCENDING)], name="user_symbol_unique", unique=True),
+    ],
+}
+
+# (collection, filter, sort) for every query the indexes above must serve
+HOT_QUERIES = [
+    ("users", {"email": "someone@example.com"}, None),
+    ("users", {"notify_news": True}, None),
+    ("users", {"notify_news": True, "news_time": "07:30"}, None),
+    ("users", {"email": {"$in": ["a@example.com", "b@example.com"]}, "notify_news": True}, None),
+    ("alerts", {"active": True}, None),
+    ("alerts", {"active": True, "symbol": "AAPL"}, None),
+    ("alerts", {"$or": [{"_id": {"$gt": ObjectId()}}, {"updated_at": {"$gte": datetime(2024, 1, 1)}}]}, None),
+    ("trade_logs", {"user_id": "user-1"}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("trade_logs", {"user_id": "user-1", "symbol": "AAPL"}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("positions", {"user_id": "user-1"}, None),
+    ("positions", {"user_id": "user-1", "symbol": "AAPL"}, None),
+]
+
+
+async def ensure_indexes(db=None) -> dict:
+    """Create missing indexes; returns the index names per collection"""
+    db = db if db is not None else get_mongo_db()
+    created = {}
+    for collection, models in INDEXES.items():
+        for model in models:
+            try:
+                created.setdefault(collection, []).extend(await db[collection].create_indexes([model]))
+            except OperationFailure as e:
+                # e.g. duplicate emails already stored; keep starting, but say so
+                print(f"⚠️ Could not create index {model.document['name']} on {collection}: {e}")
+    print(f"✅ MongoDB indexes ensured: {created}")
+    return created
+
+
+def _stages(plan: dict) -> set:
+    """Every stage name in an explain() plan tree"""
+    stages = {plan.get("stage")}
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages |= _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= _stages(child)
+    return stages - {None}
+
+
+async def check_query_plans(db=None) -> list[str]:
+    """Problems found in the winning plan of each hot query (empty when all use an index)"""
+    db = db if db is not None else get_mongo_db()
+    problems = []
+    for collection, query, sort in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _stages(explain["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages or "IXSCAN" not in stages:
+            problems.append(f"{collection}.find({query}) sort={sort}: {sorted(stages)}")
+        elif sort and "SORT" in stages:
+            problems.append(f"{collection}.find({query}) sort={sort}: in-memory sort")
+    return problems
+
+
+async def _main(check: bool):
+    try:
+        await ensure_indexes()
+        if check:
+            problems = await check_query_plans()
+            for problem in problems:
+                print(f"❌ {problem}")
+            if problems:
+                raise SystemExit(1)
+            print(f"✅ All {len(HOT_QUERIES)} hot queries use an index scan")
+    finally:
+        close_mongo()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="verify query plans with explain()")
+    asyncio.run(_main(parser.parse_args().check))
@@ -2,15 +2,17 @@ import asyncio
 from backend.db.connection import get_timescale_pool
 
 # SQL to create stock_prices table if it doesn't exist
+# (same layout as database_setup.py: ingestion upserts on (symbol, timestamp))
 CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS stock_prices (
-    id SERIAL PRIMARY KEY,
-    symbol VARCHAR(10) NOT NULL,
-    price DOUBLE PRECISION NOT NULL,
+    symbol TEXT NOT NULL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    open DOUBLE PRECISION,
     high DOUBLE PRECISION,
     low DOUBLE PRECISION,
-    volume DOUBLE PRECISION,
-    timestamp TIMESTAMP NOT NULL DEFAULT NOW()
+    close DOUBLE PRECISION,
+    volume BIGINT,
+    PRIMARY KEY (symbol, timestamp)
 );
 """
 
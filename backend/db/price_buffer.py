@@ -0,0 +1,144 @@
+# backend/db/price_buffer.py
+"""
+Write-behind buffer for the stock_prices hypertable.
+
+Records accumulate in memory and are flushed when `max_rows` is reached or
+every `flush_interval` seconds. A flush COPYs the batch into a per-connection
+temp table and merges it with `ON CONFLICT (symbol, timestamp)`, so replays
+of the same bar are idempotent.
+"""
+import asyncio
+import time
+
+from backend.core.logging import logger
+
+COLUMNS = ("symbol", "timestamp", "open", "high", "low", "close", "volume")
+
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS stock_prices_staging
+    (LIKE stock_prices INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+"""
+
+MERGE_SQL = """
+INSERT INTO stock_prices (symbol, timestamp, open, high, low, close, volume)
+SELECT symbol, timestamp, open, high, low, close, volume FROM stock_prices_staging
+ON CONFLICT (symbol, timestamp) DO UPDATE SET
+    open = EXCLUDED.open,
+    high = EXCLUDED.high,
+    low = EXCLUDED.low,
+    close = EXCLUDED.close,
+    volume = EXCLUDED.volume;
+"""
+
+
+def to_row(record) -> tuple:
+    """Map an ingestion record onto the stock_prices columns"""
+    volume = record.get("volume")
+    return (
+        record["symbol"],
+        record["timestamp"],
+        record.get("open"),
+        record.get("high"),
+        record.get("low"),
+        record["price"],
+        int(volume) if volume is not None else None,
+    )
+
+
+class PriceWriteBuffer:
+    def __init__(self, pool, max_rows: int = 500, flush_interval: float = 1.0):
+        self.pool = pool
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        # keyed by (symbol, timestamp): a batch must not hit the same row twice
+        self._rows = {}
+        self._oldest = None
+        self._flush_lock = asyncio.Lock()
+        self._timer = None
+        self._pending_flush = None
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.rows_written = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def add(self, record):
+        """Queue one record; triggers a background flush once the batch is full"""
+        if not record:
+            return
+        row = to_row(record)
+        self._rows[(row[0], row[1])] = row
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if len(self._rows) >= self.max_rows and (self._pending_flush is None or self._pending_flush.done()):
+            self._pending_flush = asyncio.create_task(self._safe_flush())
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written"""
+        async with self._flush_lock:
+            if not self._rows:
+                return 0
+            rows, self._rows = list(self._rows.values()), {}
+            oldest, self._oldest = self._oldest, None
+
+            start = time.perf_counter()
+            try:
+                async with self.pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.execute(CREATE_STAGING_SQL)
+                        await conn.copy_records_to_table("stock_prices_staging", records=rows, columns=COLUMNS)
+                        await conn.execute(MERGE_SQL)
+            except Exception:
+                # Put the batch back without clobbering newer values added meanwhile
+                for row in rows:
+                    self._rows.setdefault((row[0], row[1]), row)
+                self._oldest = oldest
+                self.failed_flushes += 1
+                raise
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flushes += 1
+            self.rows_written += len(rows)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            logger.info(f"[PriceWriteBuffer] Flushed {len(rows)} rows in {elapsed_ms:.1f} ms")
+            return len(rows)
+
+    async def _safe_flush(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"[PriceWriteBuffer] Flush failed, {len(self._rows)} rows kept: {e}")
+
+    async def _run_timer(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._safe_flush()
+
+    def start(self):
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._run_timer())
+
+    async def stop(self):
+        """Stop the timer and flush what is left"""
+        if self._timer is not None:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+        if self._pending_flush is not None:
+            await self._pending_flush
+        await self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            "backlog": len(self._rows),
+            "oldest_pending_seconds": time.monotonic() - self._oldest if self._oldest else 0.0,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "rows_written": self.rows_written,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
@@ -1,20 +1,26 @@
 # backend/main.py
 import asyncio
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
-from pymongo import MongoClient
 
+from backend.db.connection import connect_mongo, close_mongo
+from backend.db.indexes import ensure_indexes
+from backend.db.mongo_model import users_col, alerts_col as alerts_collection
 from backend.core.config import settings
-from backend.db.mongo_model import users_col
-from backend.services.alert_service import start_background_monitor
-from backend.services.predict_service import predict_threshold_time
-from backend.tasks.alert_checker import check_alerts_background
-from backend.tasks.news_scheduler import user_specific_news_job
+from backend.services.alert_service import alert_engine, alert_registry, mailjet_batcher
+from backend.services.market_data import market_data
+from backend.services.dashboard_service import normalize_trade_symbols
+from backend.services.positions_service import backfill as backfill_positions
+from backend.services.prediction_jobs import prediction_jobs
+from backend.tasks.background import background_status, start_background_jobs, stop_background_jobs
+from backend.tasks.news_scheduler import news_schedule
 from backend.routes.auth_routes import router as auth_router
 from backend.routes.profile_routes import router as profile_router
 from backend.routes.watchlist_routes import router as watchlist_router
 from backend.routes.dashboard_routes import router as dashboard_router
+from backend.services.email_services import email_outbox
+from backend.utils.http import close_http_session
 # ----------------------------------------
 # ✅ Initialize FastAPI app
 # ----------------------------------------
@@ -29,15 +35,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ----------------------------------------
-# ✅ MongoDB connection (same as mongo_model)
-# ----------------------------------------
-mongo_client = MongoClient(
-    f"mongodb://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_HOST}:{settings.MONGO_PORT}/?authSource=admin"
-)
-db = mongo_client["stock_app"]  # 👈 make this same as in mongo_model.py
-alerts_collection = db["alerts"]
-
 # ----------------------------------------
 # ✅ Root endpoint
 # ----------------------------------------
@@ -63,29 +60,59 @@ async def add_alert(symbol: str, threshold: float, type: str, email: str):
         "email": email,
         "active": True,
         "created_at": datetime.now(),
+        "updated_at": datetime.utcnow(),
     }
-    result = alerts_collection.insert_one(alert)
+    result = await alerts_collection.insert_one(alert)
+    if alert_engine.running:
+        # Only the process running the engine; others learn of it through the registry's change feed
+        alert_registry.upsert({**alert, "_id": result.inserted_id})
     alert["_id"] = str(result.inserted_id)
 
-    # Step 2: Predict when the target will be reached
-    print(f"🔮 Running prediction for {symbol} ...")
-    prediction_result = predict_threshold_time(symbol, threshold)
-    print(f"📊 Prediction result: {prediction_result}")
+    # Step 2: Queue the prediction; poll /predictions/{job_id} for the result
+    job = prediction_jobs.submit(symbol, threshold)
+    print(f"🔮 Prediction job {job['job_id']} for {symbol}: {job['status']}")
 
     # Step 3: Return result
     return {
         "message": "✅ Alert added successfully.",
         "alert": alert,
-        "prediction": prediction_result,
+        "prediction": job,
     }
 
 
+# ----------------------------------------
+# ✅ Prediction job status
+# ----------------------------------------
+@app.get("/predictions/{job_id}")
+def get_prediction(job_id: str):
+    job = prediction_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Prediction job not found")
+    return job
+
+
+# ----------------------------------------
+# ✅ Market data client counters
+# ----------------------------------------
+@app.get("/metrics/market-data")
+def get_market_data_metrics():
+    return market_data.metrics()
+
+
+# ----------------------------------------
+# ✅ Which background jobs this process leads
+# ----------------------------------------
+@app.get("/metrics/background-jobs")
+def get_background_jobs():
+    return {"enabled": settings.RUN_BACKGROUND_JOBS, "jobs": background_status()}
+
+
 # ----------------------------------------
 # ✅ Fetch all active alerts
 # ----------------------------------------
 @app.get("/alerts/")
-def get_alerts():
-    active_alerts = list(alerts_collection.find({"active": True}))
+async def get_alerts():
+    active_alerts = await alerts_collection.find({"active": True}).to_list(None)
     for alert in active_alerts:
         alert["_id"] = str(alert["_id"])
     return {"active_alerts": active_alerts}
@@ -109,11 +136,12 @@ async def set_news_time(email: str, news_time: str, notify_news: bool = True):
         return {"error": "Invalid time format. Use HH:MM (24-hr)."}
 
     # update or create user record
-    users_col.update_one(
+    await users_col.update_one(
         {"email": email},
         {"$set": {"news_time": news_time, "notify_news": notify_news}},
         upsert=True
     )
+    news_schedule.set(email, news_time, notify_news)
 
     return {
         "message": f"✅ News time set successfully for {email}",
@@ -132,19 +160,33 @@ app.include_router(dashboard_router)
 async def startup_event():
     print("🚀 Starting Stock Price Alert System...")
 
-    # ✅ Start background price monitor
-    start_background_monitor()
+    # ✅ Shared MongoDB connection pool
+    await connect_mongo()
+    await ensure_indexes()
+    await normalize_trade_symbols()  # before the backfill, so legacy trades land in one position per symbol
+    await backfill_positions()  # once per deployment: positions for trades logged before they existed
+
+    # ✅ Email outbox workers
+    await email_outbox.start()
+    mailjet_batcher.start()
 
-    # ✅ Start alert checker
-    asyncio.create_task(check_alerts_background())
+    # ✅ Process pool for prediction jobs
+    prediction_jobs.start()
 
-    # ✅ Start personalized daily news scheduler
-    asyncio.create_task(user_specific_news_job())
+    # ✅ Alert engine and news scheduler: whichever process wins each job's lease runs it
+    if settings.RUN_BACKGROUND_JOBS:
+        await start_background_jobs()
 
 
 # ----------------------------------------
 # ✅ Shutdown event
 # ----------------------------------------
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
     print("🛑 Shutting down Stock Price Alert System...")
+    await stop_background_jobs()
+    prediction_jobs.shutdown()
+    await email_outbox.stop()
+    await asyncio.to_thread(mailjet_batcher.stop)
+    await close_http_session()
+    close_mongo()
@@ -35,7 +35,7 @@ class VerifyOtpRequest(BaseModel):
 async def signup_user(request: SignupRequest):
     """Register a new user"""
     try:
-        user = create_user(request.email, request.password, request.full_name)
+        user = await create_user(request.email, request.password, request.full_name)
         return {"message": "✅ User created successfully", "user": user}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -43,13 +43,13 @@ async def signup_user(request: SignupRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/login")
-def login(user: LoginSchema):
-    auth_user = authenticate_user(user.email, user.password)
+async def login(user: LoginSchema):
+    auth_user = await authenticate_user(user.email, user.password)
     if not auth_user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     # ✅ Create access token (valid 1 hour by default)
-    token = create_access_token({"user_id": auth_user["_id"], "email": auth_user["email"]})
+    token = create_access_token({"sub": auth_user["_id"], "user_id": auth_user["_id"], "email": auth_user["email"]})
 
     return {
         "message": "✅ Login successful",
@@ -61,7 +61,7 @@ def login(user: LoginSchema):
 @router.post("/forgot-password")
 async def forgot_password(request: ForgotPasswordRequest):
     """Send OTP for password reset"""
-    success = generate_and_send_otp(request.email)
+    success = await generate_and_send_otp(request.email)
     if success:
         return {"message": "📧 OTP sent successfully"}
     raise HTTPException(status_code=404, detail="User not found")
@@ -69,7 +69,7 @@ async def forgot_password(request: ForgotPasswordRequest):
 @router.post("/verify-otp")
 async def verify_otp(request: VerifyOtpRequest):
     """Verify OTP and reset password"""
-    success = verify_otp_and_reset_password(request.email, request.otp, request.new_password)
+    success = await verify_otp_and_reset_password(request.email, request.otp, request.new_password)
     if success:
         return {"message": "🔐 Password reset successfully"}
     raise HTTPException(status_code=400, detail="Invalid or expired OTP")
@@ -1,20 +1,51 @@
 # backend/routes/dashboard_routes.py
-from fastapi import APIRouter, Depends
-from backend.services.dashboard_service import DashboardService
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from backend.services.dashboard_service import DashboardService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from backend.utils.token import verify_access_token
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.post("/log")
 async def log_trade(data: dict, current_user=Depends(verify_access_token)):
-    return await DashboardService.log_trade(
-        current_user["_id"],
-        data["symbol"],
-        data["action"],
-        data["qty"],
-        data["price"]
-    )
+    try:
+        return await DashboardService.log_trade(
+            current_user["_id"],
+            data["symbol"],
+            data["action"],
+            data["qty"],
+            data["price"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/positions")
+async def get_positions(current_user=Depends(verify_access_token)):
+    """Open positions valued at the last cached prices, with realized and unrealized P&L"""
+    return await DashboardService.get_positions(current_user["_id"])
 
 @router.get("/history")
-async def get_trade_history(current_user=Depends(verify_access_token)):
-    return await DashboardService.get_trade_history(current_user["_id"])
+async def get_trade_history(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated, e.g. symbol,price,timestamp"),
+    symbol: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    current_user=Depends(verify_access_token),
+):
+    """Newest trades first; pass `next_cursor` back as `cursor` for the next page"""
+    try:
+        page = DashboardService.stream_trade_history(
+            current_user["_id"],
+            limit=limit,
+            cursor=cursor,
+            fields=fields.split(",") if fields else None,
+            symbol=symbol,
+            start=start,
+            end=end,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(page, media_type="application/json")
@@ -0,0 +1,171 @@
+# backend/services/alert_engine.py
+"""
+The one alert evaluation loop.
+
+Prices come from a pluggable source (fixed-period or adaptive REST polling
+through the market data client, or the WebSocket trade stream) and are checked against the
+in-memory alert index. Trigger semantics are the same everywhere:
+
+    buy   fires when the price falls to the threshold or below
+    sell  fires when the price rises to the threshold or above
+
+A fired alert is claimed in Mongo with `find_one_and_update` on
+`active: True` before anything is sent, so an alert is notified at most
+once even if another evaluator saw the same price (e.g. two shards during
+a rebalance). The email goes to the claimed document, not the cached copy.
+
+`stop()` stops the price source first, then waits for triggers already in
+progress to finish their claim and queue their email.
+"""
+import asyncio
+from datetime import datetime
+
+from backend.core.config import settings
+from backend.services.alert_evaluation import group_alerts_by_symbol
+from backend.services.market_data import market_data
+from backend.services.poll_scheduler import AdaptivePollingSource, TradingHours
+from backend.services.price_stream import PriceStream
+
+
+class PollingPriceSource:
+    """Quotes for the watched symbols every `interval` seconds"""
+
+    def __init__(self, client, interval: float = 15.0):
+        self.client = client
+        self.interval = interval
+
+    async def run(self, symbols_provider, on_tick):
+        while True:
+            symbols = sorted(symbols_provider())
+            if symbols:
+                prices = await self.client.get_prices(symbols)
+                for symbol, price in prices.items():
+                    await on_tick(symbol, price, None)
+            await asyncio.sleep(self.interval)
+
+
+class StreamPriceSource:
+    """Live trades from a Finnhub-protocol WebSocket"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def run(self, symbols_provider, on_tick):
+        await PriceStream(self.url, symbols_provider, on_tick).run()
+
+
+class AlertEngine:
+    def __init__(self, registry, collection, source, notify, predictor=None, predict_interval: float = 0.0):
+        self.registry = registry
+        self.index = registry.index
+        self.collection = collection
+        self.source = source
+        self.notify = notify            # notify(alert, price) queues the email
+        self.predictor = predictor      # async predictor(symbol, thresholds) -> list of messages
+        self.predict_interval = predict_interval
+        self._tasks = []
+        self._pending = set()           # triggers being claimed / notified
+        self.ticks = 0
+        self.fired = 0
+        self.lost_claims = 0            # already claimed elsewhere
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._run_source()))
+        if self.predictor is not None and self.predict_interval > 0:
+            self._tasks.append(asyncio.create_task(self._predict_loop()))
+
+    async def stop(self):
+        """Stop taking prices, then let in-flight triggers finish"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pending:
+            print(f"⏳ Draining {len(self._pending)} alert triggers")
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _run_source(self):
+        print(f"🚀 Alert engine started ({type(self.source).__name__})")
+        while True:
+            try:
+                await self.source.run(self.index.symbols, self.on_tick)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Price source failed: {e}; restarting in 5s")
+                await asyncio.sleep(5)
+
+    # ----------------------------------------
+    # Evaluation
+    # ----------------------------------------
+    async def on_tick(self, symbol: str, price: float, timestamp_ms: int | None = None):
+        self.ticks += 1
+        triggered = self.index.pop_triggered(symbol, price)
+        if not triggered:
+            return
+        for alert in triggered:
+            self.registry.retire(alert["_id"])
+        # Its own task: cancelling the feed must not abandon an alert already popped from the index
+        task = asyncio.create_task(self._fire(symbol, price, triggered))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _fire(self, symbol: str, price: float, alerts: list):
+        for alert in alerts:
+            try:
+                now = datetime.utcnow()
+                claimed = await self.collection.find_one_and_update(
+                    {"_id": alert["_id"], "active": True},
+                    {"$set": {"active": False, "triggered_price": price, "triggered_at": now, "updated_at": now}},
+                )
+                if claimed is None:
+                    self.lost_claims += 1
+                    continue
+                self.fired += 1
+                self.notify(claimed, price)
+                print(f"✅ Alert triggered for {symbol} | Type: {alert['type']} | "
+                      f"Current: {price} | Threshold: {alert['threshold']}")
+            except Exception as e:
+                # Still active in Mongo as far as we know: put it back so the next tick retries
+                self.registry.restore(alert)
+                print(f"❌ Error firing alert {alert['_id']} for {symbol}: {e}; will retry")
+
+    async def _predict_loop(self):
+        """Forecast when waiting alerts might fire (one batched prediction per symbol)"""
+        while True:
+            await asyncio.sleep(self.predict_interval)
+            for symbol, alerts in group_alerts_by_symbol(self.registry.active()).items():
+                thresholds = [float(alert["threshold"]) for alert in alerts]
+                try:
+                    for threshold, message in zip(thresholds, await self.predictor(symbol, thresholds)):
+                        print(f"📈 Predicted movement for {symbol} @ {threshold}: {message}")
+                except Exception as e:
+                    print(f"❌ Error predicting {symbol}: {e}")
+
+
+def build_price_source(index):
+    if settings.PRICE_FEED_MODE == "stream":
+        return StreamPriceSource(f"{settings.FINNHUB_WS_URL}?token={settings.FINNHUB_API_KEY}")
+    if settings.PRICE_FEED_MODE == "adaptive":
+        hours = None
+        if settings.ALERT_POLL_MARKET_HOURS_ONLY:
+            hours = TradingHours(settings.MARKET_TIMEZONE, settings.MARKET_OPEN, settings.MARKET_CLOSE)
+        return AdaptivePollingSource(
+            market_data,
+            index,
+            budget_per_minute=settings.ALERT_POLL_BUDGET_PER_MINUTE,
+            hours=hours,
+            min_interval=settings.ALERT_POLL_MIN_SECONDS,
+            max_interval=settings.ALERT_POLL_MAX_SECONDS,
+        )
+    return PollingPriceSource(market_data, settings.ALERT_POLL_SECONDS)
@@ -0,0 +1,17 @@
+# backend/services/alert_evaluation.py
+"""
+Helpers shared by the alert monitors.
+
+Alerts are grouped by symbol so that each cycle fetches one quote per
+distinct symbol instead of one quote per alert document.
+"""
+from collections import defaultdict
+
+
+def group_alerts_by_symbol(alerts):
+    """Group alert documents by (upper-cased) symbol"""
+    grouped = defaultdict(list)
+    for alert in alerts:
+        grouped[alert["symbol"].upper()].append(alert)
+    return dict(grouped)
+
@@ -0,0 +1,172 @@
+# backend/services/alert_index.py
+"""
+In-memory index of active alerts.
+
+Per symbol, thresholds are kept in two sorted arrays: one for alerts that fire
+when the price rises to the threshold and one for alerts that fire when the
+price falls to it. A new price bisects each array once, so a tick costs
+O(log n + k) where k is the number of alerts that actually fire.
+"""
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+
+class _ThresholdArray:
+    """Sorted thresholds with the matching alert ids in a parallel list"""
+
+    __slots__ = ("thresholds", "ids")
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.thresholds = array("d", (threshold for threshold, _ in pairs))
+        self.ids = [alert_id for _, alert_id in pairs]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def insert(self, threshold: float, alert_id):
+        i = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, threshold: float, alert_id) -> bool:
+        lo = bisect_left(self.thresholds, threshold)
+        hi = bisect_right(self.thresholds, threshold, lo)
+        for i in range(lo, hi):
+            if self.ids[i] == alert_id:
+                del self.thresholds[i]
+                del self.ids[i]
+                return True
+        return False
+
+    def at_or_below(self, price: float) -> slice:
+        """Slice of entries with threshold <= price"""
+        return slice(0, bisect_right(self.thresholds, price))
+
+    def at_or_above(self, price: float) -> slice:
+        """Slice of entries with threshold >= price"""
+        return slice(bisect_left(self.thresholds, price), len(self.ids))
+
+    def pop(self, span: slice) -> list:
+        ids = self.ids[span]
+        del self.thresholds[span]
+        del self.ids[span]
+        return ids
+
+
+class AlertIndex:
+    """
+    Thread-safe index of active alert documents.
+
+    `rising` alert types fire when price >= threshold and `falling` types
+    fire when price <= threshold.
+    """
+
+    def __init__(self, rising=("buy",), falling=("sell",)):
+        self._rising_types = frozenset(rising)
+        self._falling_types = frozenset(falling)
+        self._rising = {}   # symbol -> _ThresholdArray
+        self._falling = {}  # symbol -> _ThresholdArray
+        self._alerts = {}   # alert id -> alert document
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def __contains__(self, alert_id):
+        return alert_id in self._alerts
+
+    def _side(self, alert_type: str):
+        if alert_type in self._rising_types:
+            return self._rising
+        if alert_type in self._falling_types:
+            return self._falling
+        return None
+
+    def load(self, alerts):
+        """Replace the index contents with `alerts` in one O(n log n) build"""
+        pairs = {id(self._rising): defaultdict(list), id(self._falling): defaultdict(list)}
+        docs = {}
+        for alert in alerts:
+            side = self._side(alert["type"])
+            if side is None:
+                continue
+            symbol = alert["symbol"].upper()
+            pairs[id(side)][symbol].append((float(alert["threshold"]), alert["_id"]))
+            docs[alert["_id"]] = alert
+
+        with self._lock:
+            rising = {s: _ThresholdArray(p) for s, p in pairs[id(self._rising)].items()}
+            falling = {s: _ThresholdArray(p) for s, p in pairs[id(self._falling)].items()}
+            self._rising, self._falling, self._alerts = rising, falling, docs
+
+    def add(self, alert) -> bool:
+        """Index one alert document; unknown alert types are ignored"""
+        with self._lock:
+            side = self._side(alert["type"])
+            if side is None or alert["_id"] in self._alerts:
+                return False
+            symbol = alert["symbol"].upper()
+            side.setdefault(symbol, _ThresholdArray()).insert(float(alert["threshold"]), alert["_id"])
+            self._alerts[alert["_id"]] = alert
+            return True
+
+    def remove(self, alert_id):
+        """Drop an alert from the index, returning its document if it was indexed"""
+        with self._lock:
+            alert = self._alerts.pop(alert_id, None)
+            if alert is None:
+                return None
+            side = self._side(alert["type"])
+            symbol = alert["symbol"].upper()
+            entries = side.get(symbol)
+            if entries is not None:
+                entries.remove(float(alert["threshold"]), alert_id)
+                if not entries:
+                    del side[symbol]
+            return alert
+
+    def symbols(self) -> set:
+        with self._lock:
+            return set(self._rising) | set(self._falling)
+
+    def bounds(self, symbol: str) -> tuple[float | None, float | None]:
+        """(lowest rising threshold, highest falling threshold): the nearest levels on each side"""
+        symbol = symbol.upper()
+        with self._lock:
+            rising = self._rising.get(symbol)
+            falling = self._falling.get(symbol)
+            return (rising.thresholds[0] if rising else None,
+                    falling.thresholds[-1] if falling else None)
+
+    def triggered(self, symbol: str, price: float) -> list:
+        """Alert documents on `symbol` that fire at `price` (index unchanged)"""
+        symbol = symbol.upper()
+        with self._lock:
+            ids = []
+            rising = self._rising.get(symbol)
+            if rising is not None:
+                ids += rising.ids[rising.at_or_below(price)]
+            falling = self._falling.get(symbol)
+            if falling is not None:
+                ids += falling.ids[falling.at_or_above(price)]
+            return [self._alerts[alert_id] for alert_id in ids]
+
+    def pop_triggered(self, symbol: str, price: float) -> list:
+        """Like `triggered`, but also removes the fired alerts from the index"""
+        symbol = symbol.upper()
+        with self._lock:
+            ids = []
+            rising = self._rising.get(symbol)
+            if rising is not None:
+                ids += rising.pop(rising.at_or_below(price))
+                if not rising:
+                    del self._rising[symbol]
+            falling = self._falling.get(symbol)
+            if falling is not None:
+                ids += falling.pop(falling.at_or_above(price))
+                if not falling:
+                    del self._falling[symbol]
+            return [self._alerts.pop(alert_id) for alert_id in ids]
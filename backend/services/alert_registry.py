@@ -0,0 +1,240 @@
+# backend/services/alert_registry.py
+"""
+In-process registry of active alerts.
+
+The registry loads the active alerts once and then applies inserts, updates,
+deactivations and deletes as they happen, so evaluation loops read only
+from memory. Changes come from a MongoDB change stream. On deployments
+without a replica set (change streams unavailable) it polls for documents
+past a high-water mark on `_id` (new alerts) and `updated_at` (changes),
+with an occasional full reload to pick up deletes.
+
+Writers should set `updated_at` whenever they change an alert so the
+polling fallback sees the change.
+
+With a `symbol_filter` the registry holds only the alerts on symbols the
+filter accepts (this process's shard, see alert_shards.py); `reshard()`
+swaps the filter, dropping alerts on symbols given away and loading those
+on symbols taken over.
+"""
+import asyncio
+import random
+from datetime import datetime
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from backend.services.alert_index import AlertIndex
+
+CHANGE_STREAM_UNSUPPORTED = {40573, 40324, 136}  # not a replica set / unknown stage / capped
+
+
+class AlertRegistry:
+    def __init__(self, collection, index: AlertIndex, poll_interval: float = 5.0,
+                 full_reload_seconds: float = 3600.0, use_change_stream: bool = True, symbol_filter=None):
+        self.collection = collection
+        self.index = index
+        self.poll_interval = poll_interval
+        self.full_reload_seconds = full_reload_seconds
+        self.use_change_stream = use_change_stream
+        self.symbol_filter = symbol_filter  # symbol -> bool; None holds every symbol
+        self._alerts = {}      # alert id -> document (active alerts only)
+        self._retired = set()  # fired here; ignore stale "active" events until the deactivation arrives
+        self._last_id = None
+        self._last_updated = None
+        self._ready = asyncio.Event()
+        self._task = None
+        self.mode = None
+        self.loads = 0
+        self.changes = 0
+
+    # ----------------------------------------
+    # Reads (memory only)
+    # ----------------------------------------
+    def __len__(self):
+        return len(self._alerts)
+
+    def __contains__(self, alert_id):
+        return alert_id in self._alerts
+
+    def active(self) -> list:
+        return list(self._alerts.values())
+
+    def owns(self, symbol: str) -> bool:
+        return self.symbol_filter is None or self.symbol_filter(symbol.upper())
+
+    # ----------------------------------------
+    # Local writes
+    # ----------------------------------------
+    def upsert(self, alert: dict):
+        """Apply one alert document (inactive documents are dropped)"""
+        alert_id = alert["_id"]
+        self._advance(alert)
+        if not alert.get("active"):
+            self._retired.discard(alert_id)  # the deactivation arrived; nothing stale can follow
+        if not alert.get("active") or alert_id in self._retired or not self.owns(alert["symbol"]):
+            self.discard(alert_id)
+            return
+        previous = self._alerts.get(alert_id)
+        self._alerts[alert_id] = alert
+        if previous is not None and (previous["symbol"], previous["threshold"], previous["type"]) != (
+                alert["symbol"], alert["threshold"], alert["type"]):
+            self.index.remove(alert_id)
+        if previous is None or alert_id not in self.index:
+            self.index.add(alert)
+
+    def discard(self, alert_id):
+        self._alerts.pop(alert_id, None)
+        self.index.remove(alert_id)
+
+    def retire(self, alert_id):
+        """An alert fired here: forget it now rather than when Mongo reports the deactivation"""
+        self._retired.add(alert_id)
+        self.discard(alert_id)
+
+    def restore(self, alert: dict):
+        """Its claim failed: evaluate the alert again (unless its deactivation arrived meanwhile)"""
+        if alert["_id"] in self._retired:
+            self._retired.discard(alert["_id"])
+            self.upsert(alert)
+
+    def _advance(self, alert: dict):
+        if self._last_id is None or alert["_id"] > self._last_id:
+            self._last_id = alert["_id"]
+        updated_at = alert.get("updated_at")
+        if isinstance(updated_at, datetime) and (self._last_updated is None or updated_at > self._last_updated):
+            self._last_updated = updated_at
+
+    async def load(self):
+        """Replace the registry contents with the active alerts in Mongo"""
+        alerts = await self.collection.find(await self._active_query()).to_list(None)
+        self._alerts = {alert["_id"]: alert for alert in alerts}
+        self._retired.clear()
+        self.index.load(alerts)
+        for alert in alerts:
+            self._advance(alert)
+        self.loads += 1
+        print(f"📋 Alert registry loaded {len(alerts)} active alerts")
+
+    async def _active_query(self, symbol_filter=None) -> dict:
+        """Active alerts on the symbols this registry holds (uses the active_symbol index)"""
+        symbol_filter = symbol_filter or self.symbol_filter
+        if symbol_filter is None:
+            return {"active": True}
+        symbols = await self.collection.distinct("symbol", {"active": True})
+        return {"active": True, "symbol": {"$in": [s for s in symbols if symbol_filter(s.upper())]}}
+
+    async def reshard(self, symbol_filter) -> tuple[int, int]:
+        """
+        Hold the symbols `symbol_filter` accepts from now on; returns (alerts
+        dropped, alerts loaded). A change applied while the new symbols load
+        may be overwritten by the slightly older loaded copy; that is harmless,
+        since a trigger is only sent after an atomic claim on `active`.
+        """
+        previous = self.symbol_filter
+        self.symbol_filter = symbol_filter
+        dropped = [alert_id for alert_id, alert in self._alerts.items() if not self.owns(alert["symbol"])]
+        for alert_id in dropped:
+            self.discard(alert_id)
+
+        def gained(symbol):
+            return symbol_filter(symbol) and previous is not None and not previous(symbol)
+
+        loaded = 0
+        if previous is not None:
+            async for alert in self.collection.find(await self._active_query(gained)):
+                if alert["_id"] not in self._alerts:
+                    loaded += 1
+                self.upsert(alert)
+        return len(dropped), loaded
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+    async def start(self):
+        """Load, start following changes, and return once the registry is usable"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._ready = asyncio.Event()  # a later start() waits for a fresh load
+
+    async def _run(self):
+        if self.use_change_stream:
+            try:
+                await self._watch()
+                return
+            except OperationFailure as e:
+                if e.code not in CHANGE_STREAM_UNSUPPORTED:
+                    raise
+                print(f"ℹ️ Change streams unavailable ({e.code}); polling alerts every {self.poll_interval}s")
+        await self._poll()
+
+    async def _watch(self):
+        self.mode = "change_stream"
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        resume_token = None
+        backoff = 1.0
+        while True:
+            try:
+                async with self.collection.watch(pipeline, full_document="updateLookup",
+                                                 resume_after=resume_token) as stream:
+                    # Load after the stream is open so nothing between the two is missed
+                    if resume_token is None:
+                        await self.load()
+                        self._ready.set()
+                    backoff = 1.0
+                    async for change in stream:
+                        self._apply(change)
+                        resume_token = stream.resume_token
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED and not self._ready.is_set():
+                    raise
+                print(f"⚠️ Alert change stream failed: {e}; reloading")
+                resume_token = None  # token may be gone from the oplog; start over with a full load
+            except PyMongoError as e:
+                print(f"⚠️ Alert change stream interrupted: {e}")
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, 60.0)
+
+    def _apply(self, change: dict):
+        self.changes += 1
+        document = change.get("fullDocument")
+        if change["operationType"] == "delete" or document is None:  # None: deleted before the lookup ran
+            alert_id = change["documentKey"]["_id"]
+            self._retired.discard(alert_id)
+            self.discard(alert_id)
+            return
+        self.upsert(document)
+
+    async def _poll(self):
+        self.mode = "polling"
+        loop = asyncio.get_running_loop()
+        last_load = None
+        while True:
+            try:
+                if last_load is None or loop.time() - last_load >= self.full_reload_seconds:
+                    await self.load()
+                    last_load = loop.time()
+                    self._ready.set()
+                else:
+                    await self._poll_changes()
+            except PyMongoError as e:
+                print(f"⚠️ Alert registry poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll_changes(self):
+        clauses = []
+        if self._last_id is not None:
+            clauses.append({"_id": {"$gt": self._last_id}})
+        if self._last_updated is not None:
+            # $gte: writes in the same millisecond as the mark are re-read, applying is idempotent
+            clauses.append({"updated_at": {"$gte": self._last_updated}})
+        query = {"$or": clauses} if clauses else {}
+        async for alert in self.collection.find(query):
+            self.changes += 1
+            self.upsert(alert)
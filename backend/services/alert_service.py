@@ -1,30 +1,56 @@
-import time
-import requests
+import asyncio
 from datetime import datetime
-from threading import Thread
 from mailjet_rest import Client
-from pymongo import MongoClient
 from backend.core.config import settings
-
-# ----------------------------------------
-# ✅ MongoDB Connection
-# ----------------------------------------
-mongo_client = MongoClient(
-    f"mongodb://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_HOST}:{settings.MONGO_PORT}/"
-)
-db = mongo_client["stock_alerts"]
-alerts_collection = db["alerts"]
+from backend.db.mongo_model import alerts_col as alerts_collection
+from backend.services.alert_engine import AlertEngine, build_price_source
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_registry import AlertRegistry
+from backend.services.mailjet_batcher import MailjetBatcher
+from backend.services.market_data import market_data
+from backend.services.prediction_jobs import prediction_jobs
 
 # ----------------------------------------
 # ✅ Mailjet Setup
 # ----------------------------------------
 mailjet = Client(
     auth=(settings.MAILJET_API_KEY, settings.MAILJET_SECRET_KEY),
-    version="v3.1"
+    version="v3.1",
+    api_url=settings.MAILJET_API_URL,
 )
+# Triggered alerts are sent in multi-message v3.1 calls instead of one call each
+mailjet_batcher = MailjetBatcher(
+    mailjet,
+    batch_size=settings.MAILJET_BATCH_SIZE,
+    window=settings.MAILJET_BATCH_WINDOW_SECONDS,
+)
+
+
+def _record_notification(alert_id, email: str, symbol: str, loop):
+    """
+    Map the per-message Mailjet result back onto the alert document.
+    Results arrive on the batcher thread; the write runs on `loop`.
+    """
+    def on_result(ok: bool, result: dict):
+        if ok:
+            print(f"✅ Email sent to {email} for {symbol}")
+        else:
+            print(f"❌ Email failed for {email}: {result.get('Errors')}")
+        if alert_id is not None and loop is not None:
+            asyncio.run_coroutine_threadsafe(
+                alerts_collection.update_one(
+                    {"_id": alert_id},
+                    {"$set": {"notification_status": "sent" if ok else "failed",
+                              "notified_at": datetime.utcnow(), "updated_at": datetime.utcnow()}},
+                ),
+                loop,
+            )
+    return on_result
+
 
-def send_email_alert(email: str, symbol: str, current_price: float, threshold: float, alert_type: str):
-    """Send an email notification using Mailjet"""
+def send_email_alert(email: str, symbol: str, current_price: float, threshold: float, alert_type: str,
+                     alert_id=None, loop=None):
+    """Queue an email notification on the Mailjet batcher"""
     subject = f"📈 Stock Alert: {symbol} ({alert_type.upper()})"
     body = (
         f"Hello,\n\n"
@@ -37,81 +63,53 @@ def send_email_alert(email: str, symbol: str, current_price: float, threshold: f
         f"Stock Price Alert System 🚀"
     )
 
-    data = {
-        "Messages": [
-            {
-                "From": {
-                    "Email": settings.MAILJET_SENDER_EMAIL,
-                    "Name": "Stock Alert Bot"
-                },
-                "To": [{"Email": email}],
-                "Subject": subject,
-                "TextPart": body
-            }
-        ]
+    message = {
+        "From": {
+            "Email": settings.MAILJET_SENDER_EMAIL,
+            "Name": "Stock Alert Bot"
+        },
+        "To": [{"Email": email}],
+        "Subject": subject,
+        "TextPart": body,
     }
+    if alert_id is not None:
+        message["CustomID"] = str(alert_id)
 
-    result = mailjet.send.create(data=data)
-    if result.status_code == 200:
-        print(f"✅ Email sent to {email} for {symbol}")
-    else:
-        print(f"❌ Email failed for {email}: {result.status_code}, {result.json()}")
+    mailjet_batcher.submit(message, _record_notification(alert_id, email, symbol, loop))
 
 # ----------------------------------------
-# ✅ Fetch live price from Finnhub
+# ✅ Fetch live price (shared, rate-limited market data client)
 # ----------------------------------------
-def get_stock_price(symbol: str) -> float | None:
-    """Fetch the latest stock price using Finnhub API."""
-    try:
-        url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={settings.FINNHUB_API_KEY}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("c")  # 'c' = current price
-    except Exception as e:
-        print(f"Error fetching price for {symbol}: {e}")
-        return None
+async def get_stock_price(symbol: str) -> float | None:
+    """Latest price for `symbol`, or None when no provider has one"""
+    return await market_data.get_price(symbol)
 
 # ----------------------------------------
-# ✅ Worker to monitor alerts
+# ✅ Alert evaluation
 # ----------------------------------------
-def monitor_alerts():
-    print("🚀 Starting stock price monitoring...")
-    while True:
-        active_alerts = list(alerts_collection.find({"active": True}))
-        if not active_alerts:
-            print("ℹ️ No active alerts found.")
-            time.sleep(10)
-            continue
-
-        for alert in active_alerts:
-            symbol = alert["symbol"]
-            threshold = float(alert["threshold"])
-            alert_type = alert["type"]
-            email = alert["email"]
-
-            current_price = get_stock_price(symbol)
-            if current_price is None:
-                continue
-
-            print(f"🔍 Checking {symbol} | Type: {alert_type} | Current: {current_price} | Threshold: {threshold}")
+# Shared index of active alerts: BUY fires at or below the threshold,
+# SELL at or above it. The registry loads it once and keeps it in sync
+# with Mongo; triggers remove alerts from it.
+alert_index = AlertIndex(rising=("sell",), falling=("buy",))
+alert_registry = AlertRegistry(
+    alerts_collection,
+    alert_index,
+    poll_interval=settings.ALERT_REGISTRY_POLL_SECONDS,
+    use_change_stream=settings.ALERT_REGISTRY_CHANGE_STREAM,
+)
 
-            trigger = False
-            if alert_type == "buy" and current_price >= threshold:
-                trigger = True
-            elif alert_type == "sell" and current_price <= threshold:
-                trigger = True
 
-            if trigger:
-                send_email_alert(email, symbol, current_price, threshold, alert_type)
-                alerts_collection.update_one({"_id": alert["_id"]}, {"$set": {"active": False}})
-                print(f"✅ Alert triggered and deactivated for {symbol}")
+def _notify(alert: dict, price: float):
+    send_email_alert(alert["email"], alert["symbol"], price, float(alert["threshold"]), alert["type"],
+                     alert_id=alert["_id"], loop=asyncio.get_running_loop())
 
-        time.sleep(15)  # check every 15 seconds to avoid API limits
 
-# ----------------------------------------
-# ✅ Start background monitoring thread
-# ----------------------------------------
-def start_background_monitor():
-    thread = Thread(target=monitor_alerts, daemon=True)
-    thread.start()
+# One engine for polling and streaming; PRICE_FEED_MODE picks the source
+alert_engine = AlertEngine(
+    alert_registry,
+    alerts_collection,
+    build_price_source(alert_index),
+    _notify,
+    predictor=prediction_jobs.predict_many,
+    predict_interval=settings.ALERT_PREDICTION_SECONDS,
+)
@@ -0,0 +1,132 @@
+# backend/services/alert_shards.py
+"""
+Alert evaluation split across worker processes by symbol.
+
+Every alert worker heartbeats a member document in `alert_shards`; the
+live members form a consistent-hash ring, and a worker holds (registry,
+index, price subscriptions) only the alerts whose symbol hashes to it.
+Each member has `vnodes` points on the ring, so a worker joining or
+leaving moves about 1/N of the symbols and leaves the rest where they are.
+
+Rebalancing is not coordinated: each worker notices the new member list
+on its next heartbeat and reshards on its own, so for up to one heartbeat
+two workers may watch the same symbol. That is safe because a trigger is
+claimed with `find_one_and_update` on `active: True` before the email is
+queued (see alert_engine.py); the loser of a claim sends nothing.
+"""
+import asyncio
+import bisect
+import hashlib
+from datetime import datetime, timedelta
+
+from pymongo.errors import PyMongoError
+
+
+def _point(key: str) -> int:
+    # Stable across processes and restarts (unlike hash())
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, members, vnodes: int = 64):
+        self.members = sorted(members)
+        ring = sorted((_point(f"{member}#{i}"), member) for member in self.members for i in range(vnodes))
+        self._points = [point for point, _ in ring]
+        self._owners = [member for _, member in ring]
+
+    def owner(self, symbol: str) -> str | None:
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, _point(symbol.upper())) % len(self._points)
+        return self._owners[i]
+
+
+class ShardMembership:
+    """Live alert workers: one document each, expiring `ttl` seconds after the last heartbeat"""
+
+    def __init__(self, collection, member: str, ttl: float = 15.0):
+        self.collection = collection
+        self.member = member
+        self.ttl = ttl
+
+    async def heartbeat(self):
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": self.member},
+            {"$set": {"expires_at": now + timedelta(seconds=self.ttl), "heartbeat_at": now}},
+            upsert=True,
+        )
+
+    async def members(self) -> list[str]:
+        live = self.collection.find({"expires_at": {"$gt": datetime.utcnow()}}, {"_id": 1})
+        return sorted([doc["_id"] async for doc in live])
+
+    async def leave(self):
+        await self.collection.delete_one({"_id": self.member})
+
+
+class AlertShard:
+    """Runs this worker's share of alert evaluation and follows membership changes"""
+
+    def __init__(self, registry, engine, membership: ShardMembership, vnodes: int = 64,
+                 heartbeat_interval: float | None = None):
+        self.registry = registry
+        self.engine = engine
+        self.membership = membership
+        self.vnodes = vnodes
+        self.heartbeat_interval = heartbeat_interval if heartbeat_interval is not None else membership.ttl / 3
+        self.members = []
+        self.rebalances = 0
+        self._task = None
+
+    def _filter(self, members):
+        ring = HashRing(members, self.vnodes)
+        me = self.membership.member
+        return lambda symbol: ring.owner(symbol) == me
+
+    def status(self) -> dict:
+        return {"member": self.membership.member, "members": len(self.members), "alerts": len(self.registry),
+                "symbols": len(self.engine.index.symbols()), "rebalances": self.rebalances}
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+    async def start(self):
+        await self.membership.heartbeat()
+        self.members = await self.membership.members()
+        self.registry.symbol_filter = self._filter(self.members)
+        await self.registry.start()
+        self.engine.start()
+        self._task = asyncio.create_task(self._follow())
+        print(f"🧩 Alert shard {self.membership.member}: {len(self.registry)} alerts, "
+              f"{len(self.members)} workers")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.engine.stop()
+        await self.registry.stop()
+        try:
+            await self.membership.leave()  # the others take over its symbols on their next heartbeat
+        except PyMongoError as e:
+            print(f"⚠️ Could not leave alert shard ring: {e}")
+
+    async def _follow(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.membership.heartbeat()
+                members = await self.membership.members()
+                if members != self.members:
+                    await self.rebalance(members)
+            except PyMongoError as e:
+                print(f"⚠️ Alert shard heartbeat failed: {e}")
+
+    async def rebalance(self, members: list[str]):
+        self.members = members
+        dropped, loaded = await self.registry.reshard(self._filter(members))
+        self.rebalances += 1
+        print(f"🔀 Alert shards rebalanced: {len(members)} workers | dropped {dropped} alerts, "
+              f"loaded {loaded} | now {len(self.registry)} alerts")
@@ -1,5 +1,7 @@
 # backend/services/auth_service.py
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import secrets
 from typing import Optional
@@ -14,6 +16,10 @@ from backend.services.email_services import send_email_notification
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~100-300 ms); it releases the GIL, so a small
+# thread pool keeps logins off the event loop and caps the CPU they can take
+_hash_pool = ThreadPoolExecutor(max_workers=settings.AUTH_HASH_WORKERS, thread_name_prefix="bcrypt")
+
 # JWT settings
 JWT_SECRET = settings.JWT_SECRET
 JWT_ALGORITHM = settings.JWT_ALGORITHM
@@ -21,7 +27,6 @@ JWT_EXP_MINUTES = int(getattr(settings, "JWT_EXP_MINUTES", 60))
 
 # --------------- Password utilities ----------------
 def hash_password(password: str) -> str:
-    print("DEBUG: hash_password called with:", password)  # 👈 Add this line
     password = password[:72]
     return pwd_context.hash(password)
 
@@ -30,6 +35,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     plain_password = plain_password[:72]
     return pwd_context.verify(plain_password, hashed_password)
 
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, verify_password, plain_password, hashed_password)
+
 # --------------- JWT utilities ----------------
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -49,19 +60,19 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 # --------------- User CRUD / Auth ----------------
-def get_user_by_email(email: str):
-    return users_col.find_one({"email": email})
+async def get_user_by_email(email: str):
+    return await users_col.find_one({"email": email})
 
-def create_user(email: str, password: str, full_name: str = None) -> dict:
+async def create_user(email: str, password: str, full_name: str = None) -> dict:
     """
     Create user with hashed password.
     Returns inserted user dict (without password).
     """
     email = email.lower()
-    if get_user_by_email(email):
+    if await get_user_by_email(email):
         raise ValueError("User already exists")
 
-    hashed = hash_password(password)
+    hashed = await hash_password_async(password)
     user_doc = {
         "email": email,
         "password": hashed,
@@ -76,20 +87,20 @@ def create_user(email: str, password: str, full_name: str = None) -> dict:
         "pwd_reset_otp": None,
         "pwd_reset_expires": None,
     }
-    res = users_col.insert_one(user_doc)
+    res = await users_col.insert_one(user_doc)
     user_doc["_id"] = str(res.inserted_id)
     # don't return password
     user_doc.pop("password", None)
     return user_doc
 
-def authenticate_user(email: str, password: str) -> Optional[dict]:
-    user = get_user_by_email(email.lower())
+async def authenticate_user(email: str, password: str) -> Optional[dict]:
+    user = await get_user_by_email(email.lower())
     if not user:
         return None
     hashed = user.get("password")
     if not hashed:
         return None
-    if verify_password(password, hashed):
+    if await verify_password_async(password, hashed):
         # convert _id to string for convenience
         user["_id"] = str(user["_id"])
         user.pop("password", None)
@@ -97,12 +108,12 @@ def authenticate_user(email: str, password: str) -> Optional[dict]:
     return None
 
 # --------------- Password reset (OTP) ----------------
-def generate_and_send_otp(email: str, otp_lifetime_minutes: int = 10) -> bool:
+async def generate_and_send_otp(email: str, otp_lifetime_minutes: int = 10) -> bool:
     """
     Generate OTP, store hashed or plain OTP in db with expiry,
     send email via email service.
     """
-    user = get_user_by_email(email.lower())
+    user = await get_user_by_email(email.lower())
     if not user:
         # do not reveal user existence to client ideally
         return False
@@ -112,7 +123,7 @@ def generate_and_send_otp(email: str, otp_lifetime_minutes: int = 10) -> bool:
     expiry = datetime.utcnow() + timedelta(minutes=otp_lifetime_minutes)
 
     # store (we store plain OTP here for simplicity; for higher security hash it)
-    users_col.update_one(
+    await users_col.update_one(
         {"email": email.lower()},
         {"$set": {"pwd_reset_otp": otp, "pwd_reset_expires": expiry}}
     )
@@ -132,8 +143,8 @@ def generate_and_send_otp(email: str, otp_lifetime_minutes: int = 10) -> bool:
 
     return True
 
-def verify_otp_and_reset_password(email: str, otp: str, new_password: str) -> bool:
-    user = get_user_by_email(email.lower())
+async def verify_otp_and_reset_password(email: str, otp: str, new_password: str) -> bool:
+    user = await get_user_by_email(email.lower())
     if not user:
         return False
 
@@ -159,8 +170,8 @@ def verify_otp_and_reset_password(email: str, otp: str, new_password: str) -> bo
         return False
 
     # All good: update password and clear otp fields
-    hashed = hash_password(new_password)
-    users_col.update_one(
+    hashed = await hash_password_async(new_password)
+    await users_col.update_one(
         {"email": email.lower()},
         {"$set": {"password": hashed}, "$unset": {"pwd_reset_otp": "", "pwd_reset_expires": ""}}
     )
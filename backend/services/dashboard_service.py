@@ -1,22 +1,154 @@
 # backend/services/dashboard_service.py
-from backend.db.mongo_model import trade_logs_col as trade_logs_collection
+import base64
+import json
 from datetime import datetime
+from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from backend.db.mongo_model import migrations_col, trade_logs_col as trade_logs_collection
+from backend.services.positions_service import PositionsService, trade_sign
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+TRADE_FIELDS = ("symbol", "action", "quantity", "price", "timestamp")
+SYMBOLS_MARKER = "trade_symbols_uppercase"
+
+
+def encode_cursor(timestamp: datetime, trade_id: ObjectId) -> str:
+    """Opaque keyset cursor: the (timestamp, _id) of the last trade on a page"""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{trade_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        timestamp, trade_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), ObjectId(trade_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def normalize_trade_symbols() -> int | None:
+    """
+    Uppercase the symbol of trades logged before log_trade did, so the
+    exact-match history filter (and the positions backfill) sees them. Runs
+    once, claimed by a marker in `migrations`; returns the trades changed,
+    None when the marker was already there.
+    """
+    try:
+        await migrations_col.insert_one({"_id": SYMBOLS_MARKER, "started_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        return None
+    result = await trade_logs_collection.update_many(
+        {"symbol": {"$regex": "[a-z]"}}, [{"$set": {"symbol": {"$toUpper": "$symbol"}}}]
+    )
+    await migrations_col.update_one(
+        {"_id": SYMBOLS_MARKER}, {"$set": {"trades": result.modified_count, "finished_at": datetime.utcnow()}}
+    )
+    if result.modified_count:
+        print(f"✅ Uppercased the symbol of {result.modified_count} legacy trades")
+    return result.modified_count
+
 
 class DashboardService:
     @staticmethod
     async def log_trade(user_id: str, symbol: str, action: str, qty: float, price: float):
+        """Record a trade and fold it into the user's position; ValueError on a bad trade"""
+        trade_sign(action)
+        if qty <= 0 or price < 0:
+            raise ValueError("Trade quantity must be positive and price non-negative")
         log = {
             "user_id": user_id,
-            "symbol": symbol,
-            "action": action,
+            "symbol": symbol.upper(),
+            "action": action.upper(),
             "quantity": qty,
             "price": price,
             "timestamp": datetime.utcnow(),
         }
-        await trade_logs_collection.insert_one(log)
+        trade_id = (await trade_logs_collection.insert_one(log)).inserted_id
+        try:
+            await PositionsService.apply_trade(user_id, log["symbol"], log["action"], qty, price, trade_id)
+        except PyMongoError as e:
+            # Keyed on the trade id, so retrying cannot count the trade twice
+            print(f"⚠️ Position update for trade {trade_id} failed ({e}); retrying")
+            await PositionsService.apply_trade(user_id, log["symbol"], log["action"], qty, price, trade_id)
         return {"message": "Trade logged"}
 
     @staticmethod
-    async def get_trade_history(user_id: str):
-        trades = trade_logs_collection.find({"user_id": user_id}).sort("timestamp", -1)
-        return [t async for t in trades]
+    async def get_positions(user_id: str) -> dict:
+        return await PositionsService.get_portfolio(user_id)
+
+    @staticmethod
+    def trade_history_query(user_id: str, symbol: str | None = None, start: datetime | None = None,
+                            end: datetime | None = None, cursor: str | None = None) -> dict:
+        """Filter for one page, newest first; `cursor` resumes after the previous page"""
+        query = {"user_id": user_id}
+        if symbol:
+            query["symbol"] = symbol.upper()  # stored uppercase by log_trade
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gte"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        if cursor:
+            timestamp, trade_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "_id": {"$lt": trade_id}},
+            ]
+        return query
+
+    @staticmethod
+    def stream_trade_history(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None,
+                             fields: list[str] | None = None, symbol: str | None = None,
+                             start: datetime | None = None, end: datetime | None = None):
+        """
+        One page of trades as an async iterator of JSON chunks:
+        {"trades": [...], "count": n, "next_cursor": "..." | null}.
+        Trades are written as they arrive from Mongo, so memory per request
+        stays constant however large the history is. Raises ValueError for
+        a bad cursor before anything is streamed.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        fields = [f for f in (fields or TRADE_FIELDS) if f in TRADE_FIELDS]
+        projection = {field: 1 for field in fields}
+        projection["timestamp"] = 1  # needed for the cursor
+
+        query = DashboardService.trade_history_query(user_id, symbol, start, end, cursor)
+        trades = (
+            trade_logs_collection.find(query, projection)
+            .sort([("timestamp", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit + 1)  # one extra row tells whether there is a next page
+            .batch_size(min(limit + 1, 500))
+        )
+        return DashboardService._write_page(trades, limit, fields)
+
+    @staticmethod
+    async def _write_page(trades, limit: int, fields: list[str]):
+        count, last = 0, None
+        yield '{"trades":['
+        try:
+            async for trade in trades:
+                if count == limit:
+                    break
+                if count:
+                    yield ","
+                last = (trade["timestamp"], trade["_id"])
+                if "timestamp" not in fields:
+                    trade.pop("timestamp")
+                yield json.dumps(trade, default=_json_default)
+                count += 1
+            else:
+                last = None  # ran out before the extra row: this is the last page
+        finally:
+            await trades.close()
+        next_cursor = encode_cursor(*last) if last else None
+        yield f'],"count":{count},"next_cursor":{json.dumps(next_cursor)}}}'
@@ -1,62 +1,64 @@
 # backend/services/data_ingestion.py
 
 import asyncio
-import aiohttp
 from backend.core.config import settings
 from backend.db.connection import get_timescale_pool
+from backend.db.price_buffer import PriceWriteBuffer
 from backend.core.logging import logger
+from backend.services.market_data import market_data
+from backend.utils.http import close_http_session
 
 
-async def fetch_stock(symbol: str):
-    """Fetch live stock data from Finnhub"""
-    try:
-        url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={settings.FINNHUB_API_KEY}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.json()
-
-        if not data or data.get("c") is None:
-            raise ValueError(f"Invalid data received for {symbol}")
-
-        logger.info(f"Fetched live data for {symbol}: {data}")
-        return {
-            "symbol": symbol,
-            "price": float(data.get("c")),
-            "high": float(data.get("h", 0)),
-            "low": float(data.get("l", 0)),
-            "volume": float(data.get("v", 0))
-        }
-    except Exception as e:
-        logger.error(f"[DataIngestor] Failed to fetch {symbol}: {e}")
-        return None
-
-
-async def insert_stock_data(pool, record):
-    """Insert one stock record into TimescaleDB"""
-    if record:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO stock_prices (symbol, price, high, low, volume, timestamp)
-                VALUES ($1, $2, $3, $4, $5, NOW());
-                """,
-                record["symbol"], record["price"], record["high"], record["low"], record["volume"]
-            )
-        logger.info(f"Inserted live data for {record['symbol']}")
-
-
-async def ingest_all(symbols=["AAPL", "TSLA", "GOOG"]):
-    """Fetch and store live stock data for multiple symbols"""
+async def ingest_all(symbols=["AAPL", "TSLA", "GOOG"], concurrency: int | None = None, pool=None):
+    """
+    Fetch and store live stock data for multiple symbols concurrently.
+    At most `concurrency` quote lookups are in flight through the market data
+    client, which keeps upstream calls within the provider quotas; a slow
+    symbol holds up only its own slot. A symbol nobody can price is logged and
+    skipped. Records go through a write-behind buffer that flushes in COPY batches.
+    """
     logger.info("Starting live data ingestion...")
-    pool = await get_timescale_pool()
+    semaphore = asyncio.Semaphore(concurrency or settings.INGEST_CONCURRENCY)
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    owns_pool = pool is None
+    if owns_pool:
+        pool = await get_timescale_pool()
+    buffer = PriceWriteBuffer(
+        pool,
+        max_rows=settings.PRICE_BUFFER_MAX_ROWS,
+        flush_interval=settings.PRICE_BUFFER_FLUSH_SECONDS,
+    )
+    buffer.start()
+
+    failed = []
 
-    for symbol in symbols:
-        data = await fetch_stock(symbol)
-        await insert_stock_data(pool, data)
+    async def ingest(symbol):
+        async with semaphore:
+            quotes = await market_data.get_quotes([symbol])
+        if symbol in quotes:
+            buffer.add(quotes[symbol])
+        else:
+            logger.error(f"[DataIngestor] Failed to fetch {symbol}")
+            failed.append(symbol)
+
+    try:
+        await asyncio.gather(*(ingest(s) for s in symbols))
+    finally:
+        await buffer.stop()  # flush what was fetched, even when cancelled
+        if owns_pool:
+            await pool.close()
 
-    await pool.close()
-    logger.info("✅ Live data ingestion completed.")
+    logger.info(f"✅ Live data ingestion completed: {len(symbols) - len(failed)} ok, {len(failed)} failed. "
+                f"Buffer: {buffer.metrics()}")
+    return {"ingested": len(symbols) - len(failed), "failed": failed, "buffer": buffer.metrics()}
+
+
+async def _main():
+    try:
+        await ingest_all()
+    finally:
+        await close_http_session()
 
 
 if __name__ == "__main__":
-    asyncio.run(ingest_all())
+    asyncio.run(_main())
@@ -1,25 +1,171 @@
 # backend/services/email_services.py
 
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from backend.core.config import settings
 
-def send_email_notification(to_email: str, subject: str, message: str):
-    try:
-        sender_email = settings.MAILJET_SENDER_EMAIL
 
-        msg = MIMEMultipart()
-        msg["From"] = sender_email
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        msg.attach(MIMEText(message, "html"))
+def build_message(sender_email: str, to_email: str, subject: str, message: str) -> str:
+    msg = MIMEMultipart()
+    msg["From"] = sender_email
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(message, "html"))
+    return msg.as_string()
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies (bad recipient, rejected content) will not succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class EmailOutbox:
+    """
+    In-memory outbox drained by a pool of workers.
+
+    Each worker keeps its own authenticated SMTP session open across
+    messages, reconnects when the server drops it and retries transient
+    failures with exponential backoff. `enqueue` never blocks and is safe
+    to call from other threads.
+    """
+
+    def __init__(self, host: str, port: int, username: str | None, password: str | None,
+                 sender_email: str, workers: int = 4, use_tls: bool = True,
+                 max_attempts: int = 5, backoff: float = 1.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender_email = sender_email
+        self.workers = workers
+        self.use_tls = use_tls
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connections = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        print(f"📮 Email outbox started with {self.workers} workers")
+
+    async def stop(self, timeout: float = 30.0):
+        """Drain what is queued (up to `timeout`), then stop the workers"""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Email outbox stopped with {self._queue.qsize()} messages undelivered")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
 
+    def enqueue(self, to_email: str, subject: str, message: str):
+        item = (to_email, build_message(self.sender_email, to_email, subject, message))
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._queue.put_nowait(item)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
 
-        mail_server = smtplib.SMTP("in-v3.mailjet.com", 587)
-        mail_server.starttls()
+    def backlog(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        self.connections += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    async def _worker(self):
+        server = None
+        try:
+            while True:
+                to_email, raw = await self._queue.get()
+                try:
+                    server = await self._deliver(server, to_email, raw)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if server is not None:
+                await asyncio.to_thread(self._close, server)
+
+    async def _deliver(self, server, to_email: str, raw: str):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if server is None:
+                    server = await asyncio.to_thread(self._connect)
+                await asyncio.to_thread(server.sendmail, self.sender_email, [to_email], raw)
+                self.sent += 1
+                return server
+            except Exception as e:
+                if server is not None:
+                    await asyncio.to_thread(self._close, server)
+                    server = None
+                if _is_permanent(e) or attempt == self.max_attempts:
+                    self.failed += 1
+                    print(f"❌ Error sending email to {to_email}: {e}")
+                    return server
+                self.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        return server
+
+
+email_outbox = EmailOutbox(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    settings.MAILJET_API_KEY,
+    settings.MAILJET_SECRET_KEY,
+    settings.MAILJET_SENDER_EMAIL,
+    workers=settings.EMAIL_WORKERS,
+    use_tls=settings.SMTP_USE_TLS,
+)
+
+
+def send_email_notification(to_email: str, subject: str, message: str):
+    """Queue an email on the outbox; sends inline when the outbox is not running (scripts)"""
+    if email_outbox.running:
+        email_outbox.enqueue(to_email, subject, message)
+        return
+
+    try:
+        sender_email = settings.MAILJET_SENDER_EMAIL
+        mail_server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+        if settings.SMTP_USE_TLS:
+            mail_server.starttls()
         mail_server.login(settings.MAILJET_API_KEY, settings.MAILJET_SECRET_KEY)
-        mail_server.sendmail(sender_email, to_email, msg.as_string())
+        mail_server.sendmail(sender_email, to_email, build_message(sender_email, to_email, subject, message))
         mail_server.quit()
 
         print("✅ Email sent successfully!")
@@ -0,0 +1,209 @@
+# backend/services/history_store.py
+"""
+Local OHLCV history store.
+
+Bars are kept on disk as one Parquet file per symbol and interval. A refresh
+only asks the provider for bars since the last stored one (the last bar is
+re-fetched because it may still have been forming), merges, trims to the
+retention window and writes the file back atomically. Downloads run
+without any lock held; only the read-merge-write of one symbol's file is
+serialized, per symbol and interval.
+
+Providers are pluggable: `YFinanceProvider` talks to Yahoo, `FixtureProvider`
+reads CSV files so tests and benchmarks never touch the network.
+"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from backend.core.config import settings
+from backend.core.logging import logger
+
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# interval -> (first-download period, provider lookback limit, retention)
+INTERVALS = {
+    "1m": ("1d", timedelta(days=7), timedelta(days=7)),
+    "1h": ("6mo", timedelta(days=729), timedelta(days=183)),
+}
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case OHLCV columns on a UTC DatetimeIndex named `timestamp`"""
+    df = df.rename(columns=lambda c: str(c).lower().replace("adj close", "adj_close"))
+    df = df[[c for c in COLUMNS if c in df.columns]].copy()
+    index = pd.to_datetime(df.index)
+    df.index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    df.index.name = "timestamp"
+    df = df.dropna(subset=["close"])
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+class HistoryProvider:
+    """Source of OHLCV bars; `start=None` means "first download, use `period`" """
+
+    def fetch(self, symbols: list[str], interval: str, start: datetime | None, period: str) -> dict[str, pd.DataFrame]:
+        raise NotImplementedError
+
+
+class YFinanceProvider(HistoryProvider):
+    def fetch(self, symbols, interval, start, period):
+        import yfinance as yf
+
+        kwargs = {"start": start} if start is not None else {"period": period}
+        data = yf.download(
+            tickers=symbols,
+            interval=interval,
+            group_by="ticker",
+            progress=False,
+            threads=True,
+            **kwargs,
+        )
+        if data.empty:
+            return {}
+
+        frames = {}
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol in data.columns.get_level_values(0):
+                    frame = data[symbol]
+                elif symbol in data.columns.get_level_values(1):
+                    frame = data.xs(symbol, axis=1, level=1)
+                else:
+                    continue
+            else:
+                frame = data
+            frame = frame.dropna(how="all")
+            if not frame.empty:
+                frames[symbol] = _normalize(frame)
+        return frames
+
+
+class FixtureProvider(HistoryProvider):
+    """Reads `<root>/<SYMBOL>_<interval>.csv` with timestamp,open,high,low,close,volume rows"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.calls = 0
+
+    def fetch(self, symbols, interval, start, period):
+        self.calls += 1
+        frames = {}
+        for symbol in symbols:
+            path = self.root / f"{symbol}_{interval}.csv"
+            if not path.exists():
+                continue
+            frame = _normalize(pd.read_csv(path, index_col=0, parse_dates=True))
+            if start is not None:
+                frame = frame[frame.index >= pd.Timestamp(start)]
+            frames[symbol] = frame
+        return frames
+
+
+class HistoryStore:
+    def __init__(self, root, provider: HistoryProvider):
+        self.root = Path(root)
+        self.provider = provider
+        self._locks = {}  # (interval, symbol) -> lock around that file's read-merge-write
+        self._locks_guard = threading.Lock()
+        self._last_bar = {}  # (interval, symbol) -> (file mtime, timestamp, close)
+        self.upstream_calls = 0
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / f"{symbol.upper()}.parquet"
+
+    def read(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Stored bars for `symbol` (empty frame when nothing is stored yet)"""
+        path = self._path(symbol, interval)
+        if not path.exists():
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], tz="UTC", name="timestamp"))
+        return pd.read_parquet(path)
+
+    def _write(self, symbol: str, interval: str, df: pd.DataFrame):
+        path = self._path(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_parquet(tmp)
+        os.replace(tmp, path)  # readers in other processes never see a partial file
+
+    def _file_lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((interval, symbol), threading.Lock())
+
+    def refresh(self, symbols: list[str], interval: str) -> dict[str, pd.DataFrame]:
+        """Fetch only the missing bars for `symbols` and return their full history"""
+        period, lookback, retention = INTERVALS[interval]
+        now = datetime.now(timezone.utc)
+        symbols = [s.upper() for s in symbols]
+
+        stored = {symbol: self.read(symbol, interval) for symbol in symbols}
+
+        # Symbols with history share one delta request from their oldest last bar;
+        # symbols seen for the first time share one full-period request.
+        bar = pd.Timedelta(interval.replace("m", "min"))
+        stale = [s for s, df in stored.items() if not df.empty and df.index[-1] + bar <= now]
+        fresh = [s for s, df in stored.items() if df.empty]
+
+        fetched = {}
+        if stale:
+            start = min(stored[s].index[-1] for s in stale).to_pydatetime()
+            start = max(start, now - lookback)
+            fetched.update(self._fetch(stale, interval, start, period))
+        if fresh:
+            fetched.update(self._fetch(fresh, interval, None, period))
+
+        for symbol, delta in fetched.items():
+            with self._file_lock(symbol, interval):
+                # Re-read: a concurrent refresh may have written the file since
+                current = self.read(symbol, interval)
+                merged = pd.concat([current, delta]) if not current.empty else delta
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                merged = merged[merged.index >= now - retention]
+                self._write(symbol, interval, merged)
+            stored[symbol] = merged
+
+        return stored
+
+    def _fetch(self, symbols, interval, start, period):
+        self.upstream_calls += 1
+        try:
+            return self.provider.fetch(symbols, interval, start, period)
+        except Exception as e:
+            logger.error(f"[HistoryStore] Fetch failed for {len(symbols)} symbols ({interval}): {e}")
+            return {}
+
+    def cached_bars(self, symbols: list[str], interval: str = "1m") -> dict[str, tuple[pd.Timestamp, float]]:
+        """
+        (timestamp, close) of the last stored bar per symbol, without contacting
+        the provider. Files are only re-read when they changed on disk.
+        """
+        bars = {}
+        for symbol in (s.upper() for s in symbols):
+            path = self._path(symbol, interval)
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            cached = self._last_bar.get((interval, symbol))
+            if cached is None or cached[0] != mtime:
+                df = self.read(symbol, interval)
+                if df.empty:
+                    continue
+                cached = (mtime, df.index[-1], float(df["close"].iloc[-1]))
+                self._last_bar[(interval, symbol)] = cached
+            bars[symbol] = cached[1:]
+        return bars
+
+    def latest_closes(self, symbols: list[str], interval: str = "1m") -> dict[str, float]:
+        """Last close per symbol after bringing the store up to date"""
+        frames = self.refresh(symbols, interval)
+        return {symbol: float(df["close"].iloc[-1]) for symbol, df in frames.items() if not df.empty}
+
+
+history_store = HistoryStore(
+    settings.HISTORY_STORE_DIR,
+    FixtureProvider(settings.HISTORY_FIXTURE_DIR) if settings.HISTORY_FIXTURE_DIR else YFinanceProvider(),
+)
@@ -0,0 +1,185 @@
+# backend/services/leader.py
+"""
+Lease-based leader election, one lease per background job.
+
+Every process that may run a job campaigns for its lease; the holder runs
+the job and renews the lease every `ttl / 3` seconds, everyone else retries
+on the same period. A lease is a single record with an owner and an expiry:
+
+    MongoLease   a document in `leases`, taken with one conditional upsert
+    RedisLease   a key set with NX + PX, renewed / released by owner-checked scripts
+
+Failover: a leader that stops cleanly releases its lease, so a standby takes
+over within one retry period. One that dies stops renewing and the lease is
+free after `ttl`. A leader that cannot reach the lease store stops its job
+before the lease could have expired, so two owners never overlap (clocks
+must agree to well within `ttl / 3`).
+"""
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+def process_identity() -> str:
+    """Owner id for this process: host, pid and a random suffix (pids are reused)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class MongoLease:
+    def __init__(self, collection, name: str, owner: str, ttl: float):
+        self.collection = collection
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+
+    async def acquire(self) -> bool:
+        """Take or renew the lease; False while someone else holds it"""
+        now = datetime.utcnow()
+        try:
+            lease = await self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.ttl), "renewed_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The filter missed because the lease is held; the upsert then collides on _id
+            return False
+        return lease is not None and lease["owner"] == self.owner
+
+    async def release(self):
+        await self.collection.delete_one({"_id": self.name, "owner": self.owner})
+
+    async def holder(self) -> str | None:
+        lease = await self.collection.find_one({"_id": self.name, "expires_at": {"$gt": datetime.utcnow()}})
+        return lease["owner"] if lease else None
+
+
+_RENEW = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    def __init__(self, client, name: str, owner: str, ttl: float, prefix: str = "lease:"):
+        self.client = client
+        self.key = f"{prefix}{name}"
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self._renew = client.register_script(_RENEW)
+        self._release = client.register_script(_RELEASE)
+
+    async def acquire(self) -> bool:
+        ttl_ms = int(self.ttl * 1000)
+        if await self.client.set(self.key, self.owner, nx=True, px=ttl_ms):
+            return True
+        return bool(await self._renew(keys=[self.key], args=[self.owner, ttl_ms]))
+
+    async def release(self):
+        await self._release(keys=[self.key], args=[self.owner])
+
+    async def holder(self) -> str | None:
+        owner = await self.client.get(self.key)
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+
+class LeaderElector:
+    """
+    Runs `start()` when this process wins `lease` and `stop()` when it loses
+    it (or `close()` is called). Both are async callables. `start()` runs in
+    its own task so renewals continue while a job loads.
+    """
+
+    def __init__(self, lease, start, stop, renew_interval: float | None = None):
+        self.lease = lease
+        self.name = lease.name
+        self._start = start
+        self._stop = stop
+        self.renew_interval = renew_interval if renew_interval is not None else lease.ttl / 3
+        self.is_leader = False
+        self.elected = 0        # times this process became leader
+        self._renewed = None    # monotonic time of the last successful acquire / renew
+        self._starting = None
+        self._task = None
+
+    def status(self) -> dict:
+        return {"job": self.name, "owner": self.lease.owner, "leader": self.is_leader, "elected": self.elected}
+
+    # ----------------------------------------
+    # Lifecycle
+    # ----------------------------------------
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._campaign())
+
+    async def close(self):
+        """Stop campaigning; a leader stops its job and hands the lease over"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            await self._demote("shutting down")
+            await self._release()
+
+    async def _campaign(self):
+        while True:
+            try:
+                held = await self.lease.acquire()
+                if held:
+                    self._renewed = time.monotonic()
+            except Exception as e:
+                print(f"⚠️ Lease {self.name} unavailable: {e}")
+                # Keep the job only while the lease cannot have expired for the others
+                held = self.is_leader and time.monotonic() - self._renewed < self.lease.ttl - self.renew_interval
+
+            if held and not self.is_leader:
+                self._promote()
+            elif not held and self.is_leader:
+                await self._demote("lease lost")
+            elif held and self._starting.done() and self._starting.exception() is not None:
+                print(f"❌ Could not start {self.name}: {self._starting.exception()}; stepping down")
+                await self._demote("start failed")
+                await self._release()
+            await asyncio.sleep(self.renew_interval)
+
+    def _promote(self):
+        print(f"👑 {self.lease.owner} is now leader for {self.name}")
+        self.is_leader = True
+        self.elected += 1
+        self._starting = asyncio.create_task(self._start())
+
+    async def _demote(self, reason: str):
+        print(f"🔻 {self.lease.owner} stops {self.name} ({reason})")
+        self.is_leader = False
+        if self._starting is not None and not self._starting.done():
+            self._starting.cancel()
+        await asyncio.gather(self._starting, return_exceptions=True)
+        self._starting = None
+        try:
+            await self._stop()
+        except Exception as e:
+            print(f"❌ Error stopping {self.name}: {e}")
+
+    async def _release(self):
+        try:
+            await self.lease.release()
+        except Exception as e:
+            print(f"⚠️ Could not release lease {self.name}: {e}")
@@ -0,0 +1,179 @@
+# backend/services/mailjet_batcher.py
+"""
+Batched Mailjet v3.1 sender.
+
+Messages submitted from any thread are collected for a short window (or
+until a batch is full) and sent as one multi-message `send` call. The v3.1
+response lists one result per message, in request order; each result is
+handed back to the message's callback. Only messages that failed with a
+transient error (429/5xx or a dropped connection) are retried, with
+exponential backoff, in a later batch.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+MAX_MESSAGES_PER_CALL = 50  # Mailjet v3.1 send API limit
+
+_STOP = object()
+
+
+def _is_transient(status_code: int | None) -> bool:
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+@dataclass
+class _Pending:
+    message: dict
+    on_result: Callable[[bool, dict], None] | None
+    attempts: int = 0
+    due: float = field(default=0.0)
+
+
+class MailjetBatcher:
+    def __init__(self, client, batch_size: int = MAX_MESSAGES_PER_CALL, window: float = 1.0,
+                 max_attempts: int = 5, backoff: float = 1.0):
+        self.client = client
+        self.batch_size = min(batch_size, MAX_MESSAGES_PER_CALL)
+        self.window = window
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._retry: list[_Pending] = []
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.requests = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="mailjet-batcher", daemon=True)
+        self._thread.start()
+        print(f"📮 Mailjet batcher started (up to {self.batch_size} messages every {self.window}s)")
+
+    def stop(self, timeout: float = 30.0):
+        """Send what is queued (up to `timeout`), then stop the sender thread"""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ Mailjet batcher stopped with {self.backlog()} messages unsent")
+        self._thread = None
+
+    def submit(self, message: dict, on_result: Callable[[bool, dict], None] | None = None):
+        """
+        Queue one v3.1 message. `on_result(ok, result)` is called from the
+        sender thread with the message's entry of the API response.
+        Sends inline when the batcher is not running (scripts).
+        """
+        item = _Pending(message, on_result)
+        if self.running:
+            self._queue.put(item)
+            return
+        self._send([item])
+        while self._retry:
+            time.sleep(self._next_retry_in())
+            self._send(self._due_retries())
+
+    def backlog(self) -> int:
+        return self._queue.qsize() + len(self._retry)
+
+    # ----------------------------------------
+    # Sender thread
+    # ----------------------------------------
+    def _due_retries(self) -> list[_Pending]:
+        now = time.monotonic()
+        self._retry.sort(key=lambda item: item.due)
+        count = 0
+        while count < min(len(self._retry), self.batch_size) and self._retry[count].due <= now:
+            count += 1
+        due, self._retry = self._retry[:count], self._retry[count:]
+        return due
+
+    def _next_retry_in(self) -> float | None:
+        if not self._retry:
+            return None
+        return max(0.0, min(item.due for item in self._retry) - time.monotonic())
+
+    def _run(self):
+        stopping = False
+        while True:
+            batch = self._due_retries()
+            if not batch and not stopping:
+                try:
+                    first = self._queue.get(timeout=self._next_retry_in())
+                except queue.Empty:
+                    continue
+                if first is _STOP:
+                    stopping = True
+                else:
+                    batch.append(first)
+
+            # Fill the batch until it is full or the window closes; no waiting once stopping
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.batch_size:
+                remaining = 0 if stopping else deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    continue
+                batch.append(item)
+
+            if batch:
+                self._send(batch)
+            elif stopping:
+                if not self._retry:
+                    return
+                time.sleep(self._next_retry_in())
+
+    def _send(self, batch: list[_Pending]):
+        self.requests += 1
+        try:
+            response = self.client.send.create(data={"Messages": [item.message for item in batch]})
+            status_code = response.status_code
+            body = response.json() if response.content else {}
+        except Exception as e:
+            status_code, body = None, {"Error": str(e)}
+
+        # 200 = all sent, 400 = per-message results (some failed); anything else failed as a whole
+        results = body.get("Messages") if isinstance(body, dict) else None
+        if not isinstance(results, list) or len(results) != len(batch):
+            results = [{"Status": "error", "Errors": [{"StatusCode": status_code, "ErrorMessage": str(body)}]}] * len(batch)
+
+        for item, result in zip(batch, results):
+            if result.get("Status") == "success":
+                self.sent += 1
+                self._notify(item, True, result)
+                continue
+
+            errors = result.get("Errors") or [{}]
+            transient = any(_is_transient(error.get("StatusCode")) for error in errors)
+            item.attempts += 1
+            if transient and item.attempts < self.max_attempts:
+                self.retries += 1
+                item.due = time.monotonic() + self.backoff * 2 ** (item.attempts - 1)
+                self._retry.append(item)
+            else:
+                self.failed += 1
+                self._notify(item, False, result)
+
+    @staticmethod
+    def _notify(item: _Pending, ok: bool, result: dict):
+        if item.on_result is None:
+            return
+        try:
+            item.on_result(ok, result)
+        except Exception as e:
+            print(f"❌ Mailjet result callback failed: {e}")
@@ -0,0 +1,288 @@
+# backend/services/market_data.py
+"""
+One market data client for the whole process.
+
+Every quote lookup (alert monitor, alert checker, live ingestion) goes
+through `market_data`, so the upstream quota is shared instead of being
+spent three times over:
+
+  * a token bucket per provider, sized to that provider's per-minute quota
+  * singleflight: concurrent requests for a symbol share one upstream call
+  * a short-TTL quote cache
+  * failover: symbols the first provider cannot serve (no tokens left,
+    errors) go to the next one; a provider that fails a whole batch is
+    skipped for MARKET_DATA_FAILOVER_SECONDS
+
+Quotes are dicts: symbol, timestamp, price, open, high, low, volume, provider.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from backend.core.config import settings
+from backend.core.logging import logger
+from backend.utils.http import get_http_session
+from backend.utils.rate_limit import AsyncTokenBucket
+
+
+class QuoteProvider:
+    name = "provider"
+    per_symbol = True  # one upstream call per symbol (False: one call per batch)
+
+    async def fetch_many(self, symbols: list[str]) -> dict[str, dict]:
+        raise NotImplementedError
+
+
+class FinnhubProvider(QuoteProvider):
+    name = "finnhub"
+
+    def __init__(self, api_url: str, api_key: str):
+        self.api_url = api_url
+        self.api_key = api_key
+
+    async def fetch(self, session, symbol: str) -> dict:
+        params = {"symbol": symbol, "token": self.api_key}
+        async with session.get(f"{self.api_url}/quote", params=params) as response:
+            response.raise_for_status()
+            data = await response.json()
+        if not data or not data.get("c"):
+            raise ValueError(f"Invalid data received for {symbol}")
+        # 't' is the quote time (unix seconds) reported by the feed
+        quote_time = data.get("t")
+        return {
+            "symbol": symbol,
+            "timestamp": (datetime.fromtimestamp(quote_time, tz=timezone.utc) if quote_time
+                          else datetime.now(timezone.utc)),
+            "price": float(data["c"]),
+            "open": float(data.get("o", 0)),
+            "high": float(data.get("h", 0)),
+            "low": float(data.get("l", 0)),
+            "volume": float(data.get("v", 0)),
+            "provider": self.name,
+        }
+
+    async def fetch_many(self, symbols):
+        session = await get_http_session()
+        results = await asyncio.gather(*(self.fetch(session, s) for s in symbols), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception) and not isinstance(r, ValueError)]
+        if failures and len(failures) == len(symbols):
+            raise failures[0]  # the provider itself is failing, not just unknown symbols
+        quotes = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"[MarketData] finnhub failed for {symbol}: {result}")
+            else:
+                quotes[symbol] = result
+        return quotes
+
+
+class HistoryStoreProvider(QuoteProvider):
+    """Last 1m bar from the local history store (refreshed from Yahoo in one batched download)"""
+    name = "history"
+    per_symbol = False
+
+    def __init__(self, store=None, interval: str = "1m"):
+        self.store = store
+        self.interval = interval
+
+    async def fetch_many(self, symbols):
+        if self.store is None:
+            from backend.services.history_store import history_store
+            self.store = history_store
+        frames = await asyncio.to_thread(self.store.refresh, symbols, self.interval)
+        quotes = {}
+        for symbol, df in frames.items():
+            if df.empty:
+                continue
+            bar = df.iloc[-1]
+            quotes[symbol] = {
+                "symbol": symbol,
+                "timestamp": df.index[-1].to_pydatetime(),
+                "price": float(bar["close"]),
+                "open": float(bar["open"]),
+                "high": float(bar["high"]),
+                "low": float(bar["low"]),
+                "volume": float(bar["volume"]),
+                "provider": self.name,
+            }
+        return quotes
+
+
+class MarketDataClient:
+    def __init__(self, providers: list[QuoteProvider], buckets: dict[str, AsyncTokenBucket] | None = None,
+                 ttl: float = 5.0, failover_seconds: float = 30.0, max_entries: int = 10_000):
+        self.providers = providers
+        self.buckets = buckets or {}  # provider name -> limiter; providers without one are unmetered
+        self.ttl = ttl
+        self.failover_seconds = failover_seconds
+        self.max_entries = max_entries
+        self._cache = {}        # symbol -> (expires, quote)
+        self._inflight = {}     # symbol -> future shared by every waiter
+        self._down_until = {}   # provider name -> monotonic time it is tried again
+        self._calls = deque()   # (monotonic time, provider name) per upstream call, last minute
+        self._tasks = set()     # running lookups (the loop only keeps weak references)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failovers = 0
+        self.upstream_calls = {p.name: 0 for p in providers}
+
+    # ----------------------------------------
+    # Lookups
+    # ----------------------------------------
+    async def get_quote(self, symbol: str) -> dict | None:
+        return (await self.get_quotes([symbol])).get(symbol.upper())
+
+    async def get_price(self, symbol: str) -> float | None:
+        quote = await self.get_quote(symbol)
+        return quote["price"] if quote else None
+
+    async def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        return {symbol: quote["price"] for symbol, quote in (await self.get_quotes(symbols)).items()}
+
+    async def get_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """Quotes for `symbols` (missing when no provider could price them)"""
+        now = time.monotonic()
+        quotes, waiting, missing = {}, {}, []
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            cached = self._cache.get(symbol)
+            if cached is not None and cached[0] > now:
+                self.hits += 1
+                quotes[symbol] = cached[1]
+            elif symbol in self._inflight:
+                self.coalesced += 1
+                waiting[symbol] = self._inflight[symbol]
+            else:
+                self.misses += 1
+                missing.append(symbol)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {symbol: loop.create_future() for symbol in missing}
+            self._inflight.update(futures)
+            # A task of its own: a cancelled caller must not strand the other waiters
+            task = asyncio.create_task(self._resolve(missing, futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            waiting.update(futures)
+
+        for symbol, future in waiting.items():
+            quote = await asyncio.shield(future)
+            if quote is not None:
+                quotes[symbol] = quote
+        return quotes
+
+    async def _resolve(self, symbols: list[str], futures: dict):
+        quotes = {}
+        try:
+            quotes = await self._fetch(symbols)
+        except Exception as e:
+            logger.error(f"[MarketData] Quote lookup failed for {len(symbols)} symbols: {e}")
+        finally:
+            expires = time.monotonic() + self.ttl
+            for symbol in symbols:
+                quote = quotes.get(symbol)
+                if quote is not None:
+                    self._cache[symbol] = (expires, quote)
+                self._inflight.pop(symbol, None)
+                if not futures[symbol].done():
+                    futures[symbol].set_result(quote)
+            if len(self._cache) > self.max_entries:
+                self._purge()
+
+    async def _fetch(self, symbols: list[str]) -> dict[str, dict]:
+        now = time.monotonic()
+        providers = [p for p in self.providers if self._down_until.get(p.name, 0) <= now] or self.providers[-1:]
+        quotes, remaining = {}, list(symbols)
+        for position, provider in enumerate(providers):
+            if not remaining:
+                break
+            last = position == len(providers) - 1
+            bucket = self.buckets.get(provider.name)
+            if bucket is None:
+                fetched = await self._call(provider, remaining)
+            elif not last:
+                # Spend only the tokens on hand; the rest fail over instead of waiting
+                batch = remaining[:bucket.try_acquire(len(remaining))]
+                fetched = await self._call(provider, batch) if batch else {}
+            else:
+                # Nowhere left to go: wait for tokens, one symbol at a time
+                async def paced(symbol):
+                    await bucket.acquire()
+                    return await self._call(provider, [symbol])
+
+                results = await asyncio.gather(*(paced(s) for s in remaining))
+                fetched = None if all(r is None for r in results) else {}
+                for result in results:
+                    fetched.update(result or {})
+
+            if fetched is None:
+                self._down_until[provider.name] = time.monotonic() + self.failover_seconds
+                logger.warning(f"[MarketData] {provider.name} is failing; "
+                               f"sending its symbols elsewhere for {self.failover_seconds}s")
+                fetched = {}
+            quotes.update(fetched)
+            remaining = [s for s in remaining if s not in quotes]
+            if remaining and not last:
+                self.failovers += len(remaining)
+        return quotes
+
+    async def _call(self, provider: QuoteProvider, symbols: list[str]) -> dict[str, dict] | None:
+        """Quotes from one provider call; None when the call itself failed"""
+        count = len(symbols) if provider.per_symbol else 1
+        self.upstream_calls[provider.name] += count
+        now = time.monotonic()
+        self._calls.extend([(now, provider.name)] * count)
+        try:
+            return await provider.fetch_many(symbols)
+        except Exception as e:
+            logger.error(f"[MarketData] {provider.name} failed for {len(symbols)} symbols: {e}")
+            return None
+
+    def _purge(self):
+        now = time.monotonic()
+        for symbol in [s for s, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[symbol]
+
+    # ----------------------------------------
+    # Counters
+    # ----------------------------------------
+    def calls_last_minute(self) -> dict[str, int]:
+        cutoff = time.monotonic() - 60
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+        counts = {p.name: 0 for p in self.providers}
+        for _, name in self._calls:
+            counts[name] += 1
+        return counts
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "upstream_calls_per_minute": self.calls_last_minute(),
+            "upstream_calls_total": dict(self.upstream_calls),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "coalesced": self.coalesced,
+            "cache_hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "failovers": self.failovers,
+            "providers_down": [name for name, until in self._down_until.items() if until > time.monotonic()],
+        }
+
+
+def build_market_data_client() -> MarketDataClient:
+    available = {
+        "finnhub": lambda: FinnhubProvider(settings.FINNHUB_API_URL, settings.FINNHUB_API_KEY),
+        "history": lambda: HistoryStoreProvider(),
+    }
+    names = [name.strip() for name in settings.MARKET_DATA_PROVIDERS.split(",") if name.strip()]
+    return MarketDataClient(
+        [available[name]() for name in names],
+        buckets={"finnhub": AsyncTokenBucket(settings.FINNHUB_CALLS_PER_MINUTE)},
+        ttl=settings.MARKET_DATA_QUOTE_TTL_SECONDS,
+        failover_seconds=settings.MARKET_DATA_FAILOVER_SECONDS,
+    )
+
+
+market_data = build_market_data_client()
@@ -0,0 +1,154 @@
+# backend/services/montecarlo_service.py
+"""
+Monte Carlo hit-probability forecaster.
+
+Fits drift and volatility of hourly log returns from stored history and
+simulates price paths as a geometric random walk in one vectorized NumPy
+batch. For every threshold it reports the probability of being crossed
+within the horizon and the distribution of first-passage times, so all
+alerts on a symbol are answered by a single simulation.
+
+Hourly bars only exist during the trading session (overnight and weekend
+gaps are folded into the first bar of the day), so a step is one trading
+bar, not one wall-clock hour. The horizon is the number of bars in the next
+90 calendar days, and bar counts are mapped back to calendar time through
+the exchange's trading hours.
+"""
+from datetime import datetime, timezone
+import numpy as np
+
+BARS_PER_TRADING_DAY = 7  # Yahoo 1h bars: 09:30, 10:30, ... 15:30
+HORIZON_DAYS = 90
+
+
+def fit_drift_volatility(closes) -> tuple[float, float]:
+    """Mean and standard deviation of per-bar log returns"""
+    closes = np.asarray(closes, dtype=np.float64)
+    closes = closes[np.isfinite(closes) & (closes > 0)]
+    if len(closes) < 3:
+        raise ValueError("not enough history to fit drift and volatility")
+    log_returns = np.diff(np.log(closes))
+    return float(log_returns.mean()), float(log_returns.std(ddof=1))
+
+
+def simulate_first_passage(current_price: float, thresholds, drift: float, volatility: float,
+                           horizon_steps: int = HORIZON_DAYS * BARS_PER_TRADING_DAY, n_paths: int = 5000,
+                           chunk_steps: int = 240, seed=None) -> np.ndarray:
+    """
+    First-passage step (1-based) of every path for every threshold, or 0
+    when the path never crosses within `horizon_steps`.
+    Thresholds above the current price are crossed upwards, the rest downwards.
+    Paths are generated `chunk_steps` bars at a time to bound memory.
+    """
+    rng = np.random.default_rng(seed)
+    log_thresholds = np.log(np.asarray(thresholds, dtype=np.float64))
+    upward = log_thresholds > np.log(current_price)
+    first_passage = np.zeros((n_paths, len(log_thresholds)), dtype=np.int32)
+    level = np.full(n_paths, np.log(current_price), dtype=np.float64)
+
+    for offset in range(0, horizon_steps, chunk_steps):
+        steps = min(chunk_steps, horizon_steps - offset)
+        shocks = rng.standard_normal((n_paths, steps), dtype=np.float32)
+        shocks *= volatility
+        shocks += drift
+        paths = np.cumsum(shocks, axis=1, dtype=np.float64)
+        paths += level[:, None]
+        del shocks
+        level = paths[:, -1].copy()
+
+        pending = (first_passage == 0).any(axis=0)
+        if not pending.any():
+            break
+        # Running extremes are monotone, so "bars before the crossing" is a count
+        running_max = np.maximum.accumulate(paths, axis=1) if (pending & upward).any() else None
+        running_min = np.minimum.accumulate(paths, axis=1) if (pending & ~upward).any() else None
+
+        for k in np.flatnonzero(pending):
+            if upward[k]:
+                before = (running_max < log_thresholds[k]).sum(axis=1)
+            else:
+                before = (running_min > log_thresholds[k]).sum(axis=1)
+            newly_hit = (before < steps) & (first_passage[:, k] == 0)
+            first_passage[newly_hit, k] = offset + before[newly_hit] + 1
+
+    return first_passage
+
+
+def summarize_first_passage(first_passage: np.ndarray, thresholds, current_price: float) -> list[dict]:
+    """Crossing probability and p10/median/p90 trading bars to target per threshold"""
+    summaries = []
+    for k, threshold in enumerate(thresholds):
+        hits = first_passage[:, k]
+        hits = hits[hits > 0]
+        summary = {
+            "threshold": float(threshold),
+            "direction": "up" if threshold > current_price else "down",
+            "probability": float(len(hits) / first_passage.shape[0]),
+            "p10_bars": None,
+            "median_bars": None,
+            "p90_bars": None,
+        }
+        if len(hits):
+            p10, p50, p90 = np.percentile(hits, [10, 50, 90])
+            summary.update(p10_bars=float(p10), median_bars=float(p50), p90_bars=float(p90))
+        summaries.append(summary)
+    return summaries
+
+
+def trading_sessions(hours, start: float, days: int = HORIZON_DAYS) -> list[float]:
+    """Open time of every session from `start` (mid-session: `start` itself) for `days` calendar days"""
+    end = start + days * 86400
+    sessions = []
+    ts = hours.next_open(start)
+    while ts < end:
+        sessions.append(ts)
+        ts = hours.next_open(hours.session_close(ts))
+    return sessions
+
+
+def bar_time(sessions: list[float], hours, bars: float) -> datetime:
+    """Calendar time at which `bars` hourly trading bars (fractional allowed) have elapsed"""
+    day, offset = divmod(max(bars, 0.0), BARS_PER_TRADING_DAY)
+    day = min(int(day), len(sessions) - 1)
+    ts = min(sessions[day] + offset * 3600, hours.session_close(sessions[day]))
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def hit_probabilities(closes, thresholds, horizon_bars: int | None = None, n_paths: int = 5000,
+                      seed=None) -> list[dict]:
+    """Fit on hourly `closes` and simulate every threshold in one pass (horizon in trading bars)"""
+    closes = np.asarray(closes, dtype=np.float64)
+    current_price = float(closes[-1])
+    drift, volatility = fit_drift_volatility(closes)
+    first_passage = simulate_first_passage(
+        current_price, thresholds, drift, volatility,
+        horizon_steps=horizon_bars or HORIZON_DAYS * BARS_PER_TRADING_DAY, n_paths=n_paths, seed=seed,
+    )
+    return summarize_first_passage(first_passage, thresholds, current_price)
+
+
+def describe_hit_probability(symbol: str, current_price: float, summary: dict, n_paths: int,
+                             sessions: list[float], hours) -> str:
+    """`sessions` / `hours` map bar counts to calendar time (see trading_sessions)"""
+    target_price = summary["threshold"]
+    trend = "📈 Uptrend" if summary["direction"] == "up" else "📉 Downtrend"
+    header = (
+        f"🎲 {symbol} {trend} (Monte Carlo, {n_paths} paths)\n"
+        f"Current price: ${current_price:.2f}\n"
+        f"Target price: ${target_price:.2f}\n"
+        f"Probability of reaching within {HORIZON_DAYS} days: {summary['probability']:.1%}"
+    )
+    if summary["median_bars"] is None:
+        return header
+
+    now = datetime.utcnow()
+    eta = bar_time(sessions, hours, summary["median_bars"])
+    lower_time = bar_time(sessions, hours, summary["p10_bars"]).strftime("%Y-%m-%d %H:%M UTC")
+    upper_time = bar_time(sessions, hours, summary["p90_bars"]).strftime("%Y-%m-%d %H:%M UTC")
+    elapsed = (eta - now).total_seconds() / 3600
+    return (
+        f"{header}\n"
+        f"Median time to target: {eta.strftime('%Y-%m-%d %H:%M UTC')}\n"
+        f"≈ In {elapsed:.1f} hours ({elapsed/24:.1f} days, {summary['median_bars']:.0f} hourly bars)\n"
+        f"Likely window (p10 → p90): {lower_time} → {upper_time}"
+    )
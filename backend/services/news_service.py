@@ -1,17 +1,30 @@
 # backend/services/news_service.py
 
+import asyncio
+import threading
+import time
 import requests
 import os
 from backend.core.config import settings
+from backend.services.sentiment import sentiment_engine
+from backend.utils.http import get_http_session
+from backend.utils.rate_limit import AsyncTokenBucket
 
 # ✅ Replace with your own API key or load from .env
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "your_news_api_key_here")
 
+DIGEST_TICKERS = 6        # companies per digest
+DIGEST_ARTICLES = 3       # headlines per company
+
+
+def _news_url(ticker: str, limit: int) -> str:
+    return f"{settings.NEWS_API_URL}/stock_news?tickers={ticker}&limit={limit}&apikey={NEWS_API_KEY}"
+
+
 def fetch_company_news(ticker: str, limit: int = 5):
     """Fetch latest financial news for a company using FinancialModelingPrep API"""
     try:
-        url = f"https://financialmodelingprep.com/api/v3/stock_news?tickers={ticker}&limit={limit}&apikey={NEWS_API_KEY}"
-        response = requests.get(url)
+        response = requests.get(_news_url(ticker, limit))
         if response.status_code == 200:
             return response.json()
         else:
@@ -21,42 +34,137 @@ def fetch_company_news(ticker: str, limit: int = 5):
         print(f"❌ Error fetching news for {ticker}: {e}")
         return []
 
+
+# ----------------------------------------
+# ✅ Shared per-ticker news cache
+# ----------------------------------------
+class NewsCache:
+    """Articles per ticker with a TTL; one entry serves every user following the ticker"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, list]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ticker: str) -> list | None:
+        """Cached articles, or None when the ticker was never fetched or has expired"""
+        with self._lock:
+            entry = self._entries.get(ticker.upper())
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, ticker: str, articles: list):
+        with self._lock:
+            self._entries[ticker.upper()] = (time.monotonic() + self.ttl_seconds, articles)
+
+    def missing(self, tickers) -> list[str]:
+        """Tickers with no fresh entry"""
+        now = time.monotonic()
+        with self._lock:
+            return [t for t in tickers if (entry := self._entries.get(t)) is None or entry[0] <= now]
+
+    def purge(self):
+        """Drop expired entries"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {t: e for t, e in self._entries.items() if e[0] > now}
+
+
+news_cache = NewsCache(settings.NEWS_CACHE_TTL_SECONDS)
+_news_bucket: AsyncTokenBucket | None = None
+
+
+async def fetch_company_news_async(ticker: str, limit: int = 5, session=None) -> list | None:
+    """Async fetch on the shared HTTP session; None on failure so it is not cached"""
+    session = session or await get_http_session()
+    try:
+        async with session.get(_news_url(ticker, limit)) as response:
+            if response.status != 200:
+                print(f"⚠️ Failed to fetch news for {ticker}. Status: {response.status}")
+                return None
+            return await response.json()
+    except Exception as e:
+        print(f"❌ Error fetching news for {ticker}: {e}")
+        return None
+
+
+async def prefetch_news(tickers, limit: int = DIGEST_ARTICLES,
+                        concurrency: int | None = None, bucket: AsyncTokenBucket | None = None) -> dict:
+    """
+    Fill the cache for every ticker in `tickers` that is not already fresh.
+    Requests run concurrently, bounded by `concurrency` and paced by the
+    shared rate budget.
+    """
+    global _news_bucket
+    if bucket is None:
+        if _news_bucket is None:
+            _news_bucket = AsyncTokenBucket(settings.NEWS_CALLS_PER_MINUTE)
+        bucket = _news_bucket
+
+    tickers = sorted({t.upper() for t in tickers})
+    needed = news_cache.missing(tickers)
+    semaphore = asyncio.Semaphore(concurrency or settings.NEWS_FETCH_CONCURRENCY)
+    session = await get_http_session()
+
+    async def fetch(ticker):
+        async with semaphore:
+            await bucket.acquire()
+            articles = await fetch_company_news_async(ticker, limit, session)
+        if articles is not None:
+            news_cache.put(ticker, articles)
+        return articles
+
+    fetched = await asyncio.gather(*(fetch(t) for t in needed))
+    results = [articles is not None for articles in fetched]
+    # Score every new headline in one batch so digests only hit the sentiment cache
+    sentiment_engine.analyze_articles([a for articles in fetched if articles for a in articles[:limit]])
+    news_cache.purge()
+    return {"requested": len(tickers), "fetched": sum(results), "failed": len(needed) - sum(results),
+            "cached": len(tickers) - len(needed)}
+
+
+def digest_tickers(user: dict) -> list[str]:
+    return [t.upper() for t in user.get("watchlist", [])[:DIGEST_TICKERS]]
+
+
 def analyze_sentiment(text: str):
-    """Very basic sentiment placeholder — can replace with FinBERT later"""
-    text = text.lower()
-    if any(word in text for word in ["gain", "positive", "growth", "up", "profit"]):
-        return "Positive"
-    elif any(word in text for word in ["loss", "down", "negative", "decline", "drop"]):
-        return "Negative"
-    return "Neutral"
-
-def get_user_specific_news(email: str):
+    """Sentiment label for one headline (see backend.services.sentiment)"""
+    return sentiment_engine.analyze(text)
+
+
+async def get_user_specific_news(email: str, user: dict | None = None):
     """
     Generate a daily news summary for user's tracked companies.
     This function returns a string message that can be emailed.
+    Articles come from `news_cache` only; call `prefetch_news` first.
     """
-    from backend.db.mongo_model import users_col
+    if user is None:
+        from backend.db.mongo_model import users_col
 
-    user = users_col.find_one({"email": email})
+        user = await users_col.find_one({"email": email})
     if not user:
         return f"No user found for {email}."
 
-    watchlist = user.get("watchlist", [])
+    watchlist = digest_tickers(user)
     if not watchlist:
         return f"No companies tracked for {email}."
 
     summary_lines = [f"📰 **Daily Stock News Summary for {email}**\n"]
 
-    for ticker in watchlist[:6]:  # limit to top 6
-        news_list = fetch_company_news(ticker, limit=3)
+    for ticker in watchlist:
+        news_list = (news_cache.get(ticker) or [])[:DIGEST_ARTICLES]
         if not news_list:
             summary_lines.append(f"\n⚠️ No recent news for {ticker}")
             continue
 
         summary_lines.append(f"\n📈 **{ticker}**:")
-        for article in news_list:
+        for article, sentiment in zip(news_list, sentiment_engine.analyze_articles(news_list)):
             title = article.get("title", "No Title")
-            sentiment = analyze_sentiment(title)
             summary_lines.append(f" - {title} → {sentiment}")
 
     return "\n".join(summary_lines)
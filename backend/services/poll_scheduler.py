@@ -0,0 +1,192 @@
+# backend/services/poll_scheduler.py
+"""
+Adaptive REST polling for the alert engine.
+
+Instead of quoting every watched symbol on the same fixed period, each
+symbol is re-polled after an interval derived from how close its price is
+to the nearest active threshold, relative to how fast it has been moving:
+
+    interval = (distance / (safety * sigma)) ** 2
+
+where `distance` is the log distance to the nearest threshold on either
+side and `sigma` an EWMA of the symbol's volatility per sqrt(second). That
+is roughly the time a `safety`-sigma move needs to reach the threshold, so a
+symbol 0.1% away from an alert is polled within seconds and one 40% away
+only every `max_interval`. Symbols sit in a heap keyed by due time; a token
+bucket caps the total request rate, and polling pauses outside exchange
+trading hours.
+"""
+import asyncio
+import heapq
+import math
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from backend.utils.rate_limit import AsyncTokenBucket
+
+# ~2% daily move over a 6.5 h session, per sqrt(second); used until a symbol has history
+DEFAULT_SIGMA = 0.02 / math.sqrt(6.5 * 3600)
+
+
+class TradingHours:
+    """Regular session of one exchange (no holiday calendar)"""
+
+    def __init__(self, timezone: str = "America/New_York", open_time: str = "09:30",
+                 close_time: str = "16:00", weekdays=(0, 1, 2, 3, 4)):
+        self.tz = ZoneInfo(timezone)
+        self.open_time = datetime.strptime(open_time, "%H:%M").time()
+        self.close_time = datetime.strptime(close_time, "%H:%M").time()
+        self.weekdays = frozenset(weekdays)
+
+    def is_open(self, ts: float) -> bool:
+        local = datetime.fromtimestamp(ts, self.tz)
+        return local.weekday() in self.weekdays and self.open_time <= local.time() < self.close_time
+
+    def session_close(self, ts: float) -> float:
+        """Unix time of the close on the (local) day of `ts`"""
+        local = datetime.fromtimestamp(ts, self.tz)
+        return datetime.combine(local.date(), self.close_time, self.tz).timestamp()
+
+    def next_open(self, ts: float) -> float:
+        """Unix time of the next session open at or after `ts` (ts itself when open)"""
+        if self.is_open(ts):
+            return ts
+        local = datetime.fromtimestamp(ts, self.tz)
+        day = local.date()
+        for _ in range(8):
+            candidate = datetime.combine(day, self.open_time, self.tz)
+            if day.weekday() in self.weekdays and candidate.timestamp() > ts:
+                return candidate.timestamp()
+            day += timedelta(days=1)
+        raise ValueError("No trading day configured")
+
+
+class PollScheduler:
+    """Which symbols to quote next; pure bookkeeping, driven by the caller's clock"""
+
+    def __init__(self, index, min_interval: float = 2.0, max_interval: float = 900.0,
+                 safety: float = 3.0, smoothing: float = 0.2, default_sigma: float = DEFAULT_SIGMA):
+        self.index = index
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.safety = safety
+        self.smoothing = smoothing
+        self.default_sigma = default_sigma
+        self._heap = []    # (due, symbol); stale entries are skipped on pop
+        self._due = {}     # symbol -> current due time
+        self._last = {}    # symbol -> (time, price)
+        self._var = {}     # symbol -> EWMA of squared log return per second
+
+    def __len__(self):
+        return len(self._due)
+
+    def sync(self, symbols, now: float):
+        """Watch exactly `symbols`; new ones are due immediately"""
+        symbols = {s.upper() for s in symbols}
+        for symbol in symbols - self._due.keys():
+            self._push(symbol, now)
+        for symbol in self._due.keys() - symbols:
+            del self._due[symbol]
+            self._last.pop(symbol, None)
+            self._var.pop(symbol, None)
+
+    def _push(self, symbol: str, due: float):
+        self._due[symbol] = due
+        heapq.heappush(self._heap, (due, symbol))
+
+    def next_due(self) -> float | None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, limit: int | None = None) -> list[str]:
+        """Symbols due at `now`, most overdue first"""
+        symbols = []
+        while (limit is None or len(symbols) < limit) and self.next_due() is not None and self._heap[0][0] <= now:
+            _, symbol = heapq.heappop(self._heap)
+            symbols.append(symbol)
+        return symbols
+
+    def defer(self, symbols, due: float | None = None):
+        """
+        Put symbols that could not be polled back in the queue. Without `due`
+        they keep their original due time, so the most overdue go first next
+        time instead of whichever sorts first.
+        """
+        for symbol in symbols:
+            if symbol in self._due:
+                self._push(symbol, self._due[symbol] if due is None else due)
+
+    def sigma(self, symbol: str) -> float:
+        var = self._var.get(symbol)
+        return max(math.sqrt(var), self.default_sigma / 4) if var is not None else self.default_sigma
+
+    def distance(self, symbol: str, price: float) -> float:
+        """Log distance from `price` to the nearest threshold (inf when there is none)"""
+        rising, falling = self.index.bounds(symbol)
+        distance = math.inf
+        if rising is not None:
+            distance = min(distance, math.log(rising / price))
+        if falling is not None:
+            distance = min(distance, math.log(price / falling))
+        return max(distance, 0.0)
+
+    def interval(self, symbol: str, price: float) -> float:
+        scaled = self.distance(symbol, price) / (self.safety * self.sigma(symbol))
+        return min(self.max_interval, max(self.min_interval, scaled * scaled))
+
+    def observe(self, symbol: str, price: float, now: float) -> float:
+        """Record a quote, update the volatility estimate and reschedule; returns the interval"""
+        if symbol not in self._due or price <= 0:
+            return 0.0
+        last = self._last.get(symbol)
+        if last is not None and now > last[0]:
+            sample = math.log(price / last[1]) ** 2 / (now - last[0])
+            var = self._var.get(symbol)
+            self._var[symbol] = sample if var is None else (1 - self.smoothing) * var + self.smoothing * sample
+        self._last[symbol] = (now, price)
+        interval = self.interval(symbol, price)
+        self._push(symbol, now + interval)
+        return interval
+
+
+class AdaptivePollingSource:
+    """Alert engine price source that polls through the scheduler within `budget_per_minute`"""
+
+    def __init__(self, client, index, budget_per_minute: float = 50, hours: TradingHours | None = None,
+                 **scheduler_options):
+        self.client = client
+        self.scheduler = PollScheduler(index, **scheduler_options)
+        self.budget = AsyncTokenBucket(budget_per_minute, burst=max(1, int(budget_per_minute) // 12))
+        self.hours = hours
+        self.polls = 0
+
+    async def run(self, symbols_provider, on_tick):
+        while True:
+            now = time.time()
+            if self.hours is not None and not self.hours.is_open(now):
+                await asyncio.sleep(min(300.0, self.hours.next_open(now) - now))
+                continue
+
+            self.scheduler.sync(symbols_provider(), now)
+            due = self.scheduler.pop_due(now)
+            granted = self.budget.try_acquire(len(due))
+            self.scheduler.defer(due[granted:])
+            batch = due[:granted]
+            if batch:
+                self.polls += len(batch)
+                prices = await self.client.get_prices(batch)
+                now = time.time()
+                for symbol in batch:
+                    price = prices.get(symbol)
+                    if price is None:
+                        self.scheduler.defer([symbol], now + self.scheduler.min_interval)
+                        continue
+                    await on_tick(symbol, price, None)
+                    self.scheduler.observe(symbol, price, now)
+
+            # Wake for the next due symbol, but at least every second to pick up new alerts
+            next_due = self.scheduler.next_due()
+            wait = 1.0 if next_due is None else min(1.0, max(0.05, next_due - time.time()))
+            await asyncio.sleep(wait)
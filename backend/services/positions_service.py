@@ -0,0 +1,251 @@
+# backend/services/positions_service.py
+"""
+Materialized positions per user and symbol.
+
+Each logged trade updates the user's position in one atomic pipeline
+update: quantity (negative when short), average cost and realized P&L
+under the average-cost method. The update is keyed on the trade's `_id`
+(the position keeps its last RECENT_TRADES ids), so applying a trade again
+after a failed or timed-out write cannot count it twice. Page views never replay trade history;
+unrealized P&L is computed in one vectorized pass over the open positions
+against current quotes from the shared market data client, falling back to
+the last cached 1m bar for symbols it cannot price in time.
+
+`apply_trade` is the same arithmetic in Python, used to rebuild positions
+from trade_logs and to check the pipeline. Positions of trades logged
+before positions existed are backfilled once at startup (`backfill`), or
+by hand:
+
+    python -m backend.services.positions_service --backfill [--force]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+import numpy as np
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from backend.db.connection import close_mongo
+from backend.db.mongo_model import migrations_col, positions_col, trade_logs_col
+from backend.services.history_store import history_store
+from backend.services.market_data import market_data
+
+QUOTE_TIMEOUT_SECONDS = 3.0  # then value from cached bars rather than hold the page
+RECENT_TRADES = 100          # trade ids kept per position to recognise a trade applied twice
+BACKFILL_MARKER = "positions_backfill"
+
+SIDES = {"BUY": 1, "SELL": -1}
+
+
+def trade_sign(action: str) -> int:
+    try:
+        return SIDES[action.upper()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown trade action: {action!r}")
+
+
+def apply_trade(position: dict, action: str, quantity: float, price: float) -> dict:
+    """New {quantity, avg_cost, realized_pnl} after one trade"""
+    if quantity <= 0:
+        raise ValueError("Trade quantity must be positive")
+    q = position.get("quantity", 0.0)
+    a = position.get("avg_cost", 0.0)
+    r = position.get("realized_pnl", 0.0)
+    s = trade_sign(action) * quantity
+    new_q = q + s
+
+    if q * s >= 0:  # opening or adding
+        avg = (abs(q) * a + abs(s) * price) / abs(new_q)
+    else:           # reducing, closing or flipping
+        r += min(abs(s), abs(q)) * (price - a) * (1 if q > 0 else -1)
+        if new_q == 0:
+            avg = 0.0
+        elif new_q * q < 0:
+            avg = float(price)
+        else:
+            avg = a
+    return {"quantity": new_q, "avg_cost": avg, "realized_pnl": r}
+
+
+def _trade_pipeline(trade_id, action: str, quantity: float, price: float, now: datetime) -> list:
+    """
+    apply_trade as an update pipeline, so the read-modify-write is atomic in
+    Mongo. A position that already lists `trade_id` is left as it is.
+    """
+    if quantity <= 0:
+        raise ValueError("Trade quantity must be positive")
+    s = trade_sign(action) * quantity
+    new_q = {"$add": ["$_q", s]}
+    same_direction = {"$gte": [{"$multiply": ["$_q", s]}, 0]}
+    applied = {
+        "quantity": new_q,
+        "avg_cost": {"$switch": {
+            "branches": [
+                {"case": same_direction,
+                 "then": {"$divide": [{"$add": [{"$multiply": [{"$abs": "$_q"}, "$_a"]}, abs(s) * price]},
+                                      {"$abs": new_q}]}},
+                {"case": {"$eq": [new_q, 0]}, "then": 0.0},
+                {"case": {"$lt": [{"$multiply": ["$_q", new_q]}, 0]}, "then": price},
+            ],
+            "default": "$_a",
+        }},
+        "realized_pnl": {"$cond": [
+            same_direction,
+            "$_r",
+            {"$add": ["$_r", {"$multiply": [
+                {"$min": [abs(s), {"$abs": "$_q"}]},
+                {"$subtract": [price, "$_a"]},
+                {"$cond": [{"$gt": ["$_q", 0]}, 1, -1]},
+            ]}]},
+        ]},
+        "trades": {"$add": [{"$ifNull": ["$trades", 0]}, 1]},
+        "recent_trades": {"$slice": [{"$concatArrays": ["$_seen_ids", [trade_id]]}, -RECENT_TRADES]},
+        "updated_at": now,
+    }
+    return [
+        {"$set": {
+            "_q": {"$ifNull": ["$quantity", 0]},
+            "_a": {"$ifNull": ["$avg_cost", 0]},
+            "_r": {"$ifNull": ["$realized_pnl", 0]},
+            "_seen_ids": {"$ifNull": ["$recent_trades", []]},
+        }},
+        {"$set": {"_seen": {"$in": [trade_id, "$_seen_ids"]}}},
+        {"$set": {field: {"$cond": ["$_seen", f"${field}", value]} for field, value in applied.items()}},
+        {"$unset": ["_q", "_a", "_r", "_seen_ids", "_seen"]},
+    ]
+
+
+def value_positions(positions: list[dict], bars: dict) -> dict:
+    """
+    Mark open positions to market in one vectorized pass. `bars` maps
+    symbol -> (timestamp, price), as HistoryStore.cached_bars returns;
+    positions without a price are reported but left out of the totals.
+    """
+    open_positions = [p for p in positions if p["quantity"]]
+    symbols = [p["symbol"].upper() for p in open_positions]
+    qty = np.array([p["quantity"] for p in open_positions], dtype=np.float64)
+    avg = np.array([p["avg_cost"] for p in open_positions], dtype=np.float64)
+    price = np.array([bars[s][1] if s in bars else np.nan for s in symbols], dtype=np.float64)
+    priced = ~np.isnan(price)
+    cost_basis = qty * avg
+    market_value = qty * price
+    unrealized = market_value - cost_basis
+
+    rows = []
+    for i, p in enumerate(open_positions):
+        bar = bars.get(symbols[i])
+        rows.append({
+            **p,
+            "price": float(price[i]) if priced[i] else None,
+            "price_time": bar[0].isoformat() if bar else None,
+            "cost_basis": float(cost_basis[i]),
+            "market_value": float(market_value[i]) if priced[i] else None,
+            "unrealized_pnl": float(unrealized[i]) if priced[i] else None,
+        })
+
+    return {
+        "positions": rows,
+        "totals": {
+            "market_value": float(market_value[priced].sum()),
+            "cost_basis": float(cost_basis[priced].sum()),
+            "unrealized_pnl": float(unrealized[priced].sum()),
+            "realized_pnl": float(sum(p.get("realized_pnl", 0.0) for p in positions)),
+            "unpriced": [s for s, ok in zip(symbols, priced) if not ok],
+        },
+    }
+
+
+class PositionsService:
+    @staticmethod
+    async def apply_trade(user_id: str, symbol: str, action: str, quantity: float, price: float, trade_id):
+        """Fold one trade (trade_logs `_id`) into the user's materialized position; a repeat is a no-op"""
+        await positions_col.update_one(
+            {"user_id": user_id, "symbol": symbol},
+            _trade_pipeline(trade_id, action, float(quantity), float(price), datetime.utcnow()),
+            upsert=True,
+        )
+
+    @staticmethod
+    async def rebuild(user_id: str) -> int:
+        """Recompute a user's positions by replaying trade_logs (backfill / repair)"""
+        positions = {}
+        trades = trade_logs_col.find(
+            {"user_id": user_id}, {"symbol": 1, "action": 1, "quantity": 1, "price": 1}
+        ).sort([("timestamp", ASCENDING), ("_id", ASCENDING)])
+        async for trade in trades:
+            symbol = trade["symbol"]
+            previous = positions.get(symbol, {})
+            positions[symbol] = {
+                **apply_trade(previous, trade["action"], float(trade["quantity"]), float(trade["price"])),
+                "trades": previous.get("trades", 0) + 1,
+                "recent_trades": (previous.get("recent_trades", []) + [trade["_id"]])[-RECENT_TRADES:],
+            }
+
+        now = datetime.utcnow()
+        await positions_col.delete_many({"user_id": user_id, "symbol": {"$nin": list(positions)}})
+        if positions:
+            await positions_col.bulk_write([
+                ReplaceOne({"user_id": user_id, "symbol": symbol},
+                           {"user_id": user_id, "symbol": symbol, **position, "updated_at": now}, upsert=True)
+                for symbol, position in positions.items()
+            ])
+        return len(positions)
+
+    @staticmethod
+    async def get_portfolio(user_id: str) -> dict:
+        """Positions valued at current quotes (cached bars where none arrive in time), plus portfolio totals"""
+        positions = await positions_col.find(
+            {"user_id": user_id}, {"_id": 0, "symbol": 1, "quantity": 1, "avg_cost": 1, "realized_pnl": 1}
+        ).to_list(None)
+        symbols = [p["symbol"].upper() for p in positions if p["quantity"]]
+        prices = {}
+        try:
+            quotes = await asyncio.wait_for(market_data.get_quotes(symbols), QUOTE_TIMEOUT_SECONDS)
+            prices = {s: (q["timestamp"], q["price"]) for s, q in quotes.items()}
+        except Exception as e:
+            print(f"⚠️ Quotes unavailable for positions ({e!r}); using cached bars")
+        missing = [s for s in symbols if s not in prices]
+        if missing:
+            prices.update(await asyncio.to_thread(history_store.cached_bars, missing))
+        return value_positions(positions, prices)
+
+
+async def backfill(force: bool = False) -> int | None:
+    """
+    Rebuild the positions of every user with trade_logs, once. The first
+    process to insert the marker in `migrations` runs it (the others carry
+    on); returns the users rebuilt, None when the marker was already there.
+    """
+    now = datetime.utcnow()
+    if force:
+        await migrations_col.replace_one({"_id": BACKFILL_MARKER}, {"started_at": now}, upsert=True)
+    else:
+        try:
+            await migrations_col.insert_one({"_id": BACKFILL_MARKER, "started_at": now})
+        except DuplicateKeyError:
+            return None
+    user_ids = await trade_logs_col.distinct("user_id")
+    for user_id in user_ids:
+        await PositionsService.rebuild(user_id)
+    await migrations_col.update_one(
+        {"_id": BACKFILL_MARKER}, {"$set": {"users": len(user_ids), "finished_at": datetime.utcnow()}}
+    )
+    print(f"✅ Positions backfilled from trade_logs for {len(user_ids)} users")
+    return len(user_ids)
+
+
+async def _main(force: bool):
+    try:
+        if await backfill(force) is None:
+            print("ℹ️ Positions already backfilled; pass --force to rebuild them again")
+    finally:
+        close_mongo()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backfill", action="store_true", required=True,
+                        help="rebuild every user's positions from trade_logs")
+    parser.add_argument("--force", action="store_true", help="run even if the backfill already ran")
+    asyncio.run(_main(parser.parse_args().force))
@@ -1,92 +1,217 @@
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from prophet import Prophet
-
-def predict_threshold_time(symbol: str, target_price: float):
-    try:
-        print(f"🔮 Running prediction for {symbol} ...")
-
-        # --- Download 6 months of hourly data ---
-        df = yf.download(symbol, period="6mo", interval="1h", progress=False)
-        if df.empty:
-            return f"⚠️ Unable to fetch data for {symbol}"
-
-        # --- Flatten any multi-index columns ---
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = ['_'.join(col).strip() if isinstance(col, tuple) else col for col in df.columns]
-
-        # --- Reset index so Datetime becomes a column ---
-        df = df.reset_index()
-
-        # --- Normalize column names ---
-        df.columns = [c.lower() for c in df.columns]
-        print(f"✅ Columns after normalization: {df.columns.tolist()}")
-
-        # --- Detect datetime column ---
-        time_col = next((c for c in ["datetime", "date", "index", "time"] if c in df.columns), None)
-        if not time_col:
-            return f"⚠️ Could not find datetime column for {symbol}."
-
-        # --- Detect close column ---
-        close_col = next((c for c in df.columns if "close" in c), None)
-        if not close_col:
-            return f"⚠️ Data for {symbol} missing 'Close' prices."
-
-        # --- Rename for Prophet ---
-        df = df.rename(columns={time_col: "ds", close_col: "y"})
-
-        # --- Clean timezone info ---
-        df["ds"] = pd.to_datetime(df["ds"]).dt.tz_localize(None)  # ✅ FIX HERE
-        df["y"] = pd.to_numeric(df["y"], errors="coerce")
-        df = df.dropna(subset=["y"])
-
-        # --- Train Prophet model ---
-        model = Prophet(
-            daily_seasonality=True,
-            weekly_seasonality=True,
-            changepoint_prior_scale=0.3,
-        )
-        model.fit(df[["ds", "y"]])
-
-        # --- Forecast next 90 days hourly ---
-        future = model.make_future_dataframe(periods=90 * 24, freq="H")
-        forecast = model.predict(future)
-
-        # --- Determine trend & crossing ---
-        current_price = float(df["y"].iloc[-1])
-        if current_price < target_price:
-            crossing = forecast[forecast["yhat"] >= target_price]
-            trend = "📈 Uptrend"
+from backend.core.config import settings
+from backend.services.history_store import history_store
+from backend.services.montecarlo_service import (
+    BARS_PER_TRADING_DAY, describe_hit_probability, hit_probabilities, trading_sessions,
+)
+from backend.services.poll_scheduler import TradingHours
+
+BAR_INTERVAL = timedelta(hours=1)
+BAR_GRACE = timedelta(minutes=5)  # provider delay before a new hourly bar shows up
+
+
+@dataclass
+class Forecast:
+    """A fitted 90-day hourly forecast, reduced to what threshold questions need"""
+    symbol: str
+    ds: np.ndarray          # datetime64 timestamps
+    yhat: np.ndarray
+    running_max: np.ndarray  # np.maximum.accumulate(yhat)
+    running_min: np.ndarray  # np.minimum.accumulate(yhat)
+    current_price: float
+    expires_at: datetime
+
+    @property
+    def nbytes(self) -> int:
+        return self.ds.nbytes + self.yhat.nbytes + self.running_max.nbytes + self.running_min.nbytes
+
+    def first_crossing(self, target_price: float, upward: bool) -> int | None:
+        """Index of the first forecast row at/above (or at/below) the target"""
+        if upward:
+            i = int(np.searchsorted(self.running_max, target_price, side="left"))
         else:
-            crossing = forecast[forecast["yhat"] <= target_price]
-            trend = "📉 Downtrend"
-
-        if crossing.empty:
-            max_pred = forecast["yhat"].max()
-            min_pred = forecast["yhat"].min()
-            extreme = max_pred if trend == "📈 Uptrend" else min_pred
-            eta = forecast.iloc[-1]["ds"]
-            return (
-                f"⚠️ {symbol}: Target ${target_price:.2f} not reached within next 90 days.\n"
-                f"Current: ${current_price:.2f}\n"
-                f"Trend: {trend}\n"
-                f"Max expected: ${extreme:.2f} by {eta.strftime('%Y-%m-%d %H:%M UTC')}"
-            )
-
-        eta = crossing.iloc[0]["ds"]
-        hours_remaining = (eta - datetime.utcnow()).total_seconds() / 3600
-        lower_time = (eta - pd.Timedelta(hours=6)).strftime("%Y-%m-%d %H:%M UTC")
-        upper_time = (eta + pd.Timedelta(hours=6)).strftime("%Y-%m-%d %H:%M UTC")
-
+            # running_min is non-increasing, so search its negation
+            i = int(np.searchsorted(-self.running_min, -target_price, side="left"))
+        return i if i < len(self.yhat) else None
+
+
+class ForecastCache:
+    """LRU of forecasts per symbol, bounded by total array bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol: str) -> Forecast | None:
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None or entry.expires_at <= datetime.utcnow():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(symbol)
+            self.hits += 1
+            return entry
+
+    def put(self, forecast: Forecast):
+        with self._lock:
+            old = self._entries.pop(forecast.symbol, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[forecast.symbol] = forecast
+            self._bytes += forecast.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def invalidate(self, symbol: str):
+        with self._lock:
+            old = self._entries.pop(symbol, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+
+
+forecast_cache = ForecastCache(settings.FORECAST_CACHE_MAX_BYTES)
+
+
+def _next_bar_expiry(now: datetime) -> datetime:
+    """Expire when the next hourly bar should be available"""
+    next_bar = now.replace(minute=0, second=0, microsecond=0) + BAR_INTERVAL
+    return next_bar + BAR_GRACE
+
+
+def _load_history(symbol: str) -> pd.DataFrame | str:
+    """6 months of hourly closes as a Prophet frame (ds, y), or an error message"""
+    # --- Hourly bars from the local store (only the delta is downloaded) ---
+    bars = history_store.refresh([symbol], "1h")[symbol.upper()]
+    if bars.empty:
+        return f"⚠️ Unable to fetch data for {symbol}"
+
+    # --- Prophet wants naive timestamps ---
+    df = pd.DataFrame({
+        "ds": bars.index.tz_localize(None),
+        "y": pd.to_numeric(bars["close"], errors="coerce"),
+    })
+    return df.dropna(subset=["y"]).reset_index(drop=True)
+
+
+def build_forecast(symbol: str) -> Forecast | str:
+    """Fit Prophet on the symbol's history and keep the 90-day forecast arrays"""
+    df = _load_history(symbol)
+    if isinstance(df, str):
+        return df
+
+    # --- Train Prophet model ---
+    model = Prophet(
+        daily_seasonality=True,
+        weekly_seasonality=True,
+        changepoint_prior_scale=0.3,
+    )
+    model.fit(df[["ds", "y"]])
+
+    # --- Forecast next 90 days hourly ---
+    future = model.make_future_dataframe(periods=90 * 24, freq="H")
+    forecast = model.predict(future)
+
+    yhat = forecast["yhat"].to_numpy(dtype=np.float64)
+    return Forecast(
+        symbol=symbol,
+        ds=forecast["ds"].to_numpy(),
+        yhat=yhat,
+        running_max=np.maximum.accumulate(yhat),
+        running_min=np.minimum.accumulate(yhat),
+        current_price=float(df["y"].iloc[-1]),
+        expires_at=_next_bar_expiry(datetime.utcnow()),
+    )
+
+
+def get_forecast(symbol: str) -> Forecast | str:
+    """Cached forecast for `symbol`, fitting a new one when missing or stale"""
+    forecast = forecast_cache.get(symbol)
+    if forecast is None:
+        forecast = build_forecast(symbol)
+        if isinstance(forecast, Forecast):
+            forecast_cache.put(forecast)
+    return forecast
+
+
+def describe_crossing(forecast: Forecast, target_price: float) -> str:
+    """Answer "when does the forecast reach target_price" from a fitted forecast"""
+    symbol = forecast.symbol
+    current_price = forecast.current_price
+
+    # --- Determine trend & crossing ---
+    upward = current_price < target_price
+    trend = "📈 Uptrend" if upward else "📉 Downtrend"
+    idx = forecast.first_crossing(target_price, upward)
+
+    if idx is None:
+        extreme = forecast.running_max[-1] if upward else forecast.running_min[-1]
+        eta = pd.Timestamp(forecast.ds[-1])
         return (
-            f"🎯 {symbol} {trend}\n"
-            f"Current price: ${current_price:.2f}\n"
-            f"Target price: ${target_price:.2f}\n"
-            f"Predicted to reach around {eta.strftime('%Y-%m-%d %H:%M UTC')}\n"
-            f"≈ In {hours_remaining:.1f} hours ({hours_remaining/24:.1f} days)\n"
-            f"Confidence window: {lower_time} → {upper_time}"
+            f"⚠️ {symbol}: Target ${target_price:.2f} not reached within next 90 days.\n"
+            f"Current: ${current_price:.2f}\n"
+            f"Trend: {trend}\n"
+            f"Max expected: ${extreme:.2f} by {eta.strftime('%Y-%m-%d %H:%M UTC')}"
         )
 
+    eta = pd.Timestamp(forecast.ds[idx])
+    hours_remaining = (eta - datetime.utcnow()).total_seconds() / 3600
+    lower_time = (eta - pd.Timedelta(hours=6)).strftime("%Y-%m-%d %H:%M UTC")
+    upper_time = (eta + pd.Timedelta(hours=6)).strftime("%Y-%m-%d %H:%M UTC")
+
+    return (
+        f"🎯 {symbol} {trend}\n"
+        f"Current price: ${current_price:.2f}\n"
+        f"Target price: ${target_price:.2f}\n"
+        f"Predicted to reach around {eta.strftime('%Y-%m-%d %H:%M UTC')}\n"
+        f"≈ In {hours_remaining:.1f} hours ({hours_remaining/24:.1f} days)\n"
+        f"Confidence window: {lower_time} → {upper_time}"
+    )
+
+
+def predict_thresholds(symbol: str, thresholds: list[float], engine: str | None = None) -> list[str]:
+    """
+    Answer several thresholds on one symbol in a single pass.
+    `engine` is "prophet" (cached forecast) or "montecarlo" (simulated paths);
+    defaults to settings.PREDICTION_ENGINE.
+    """
+    engine = engine or settings.PREDICTION_ENGINE
+    if engine == "montecarlo":
+        df = _load_history(symbol)
+        if isinstance(df, str):
+            return [df] * len(thresholds)
+        closes = df["y"].to_numpy()
+        n_paths = settings.MONTECARLO_PATHS
+        hours = TradingHours(settings.MARKET_TIMEZONE, settings.MARKET_OPEN, settings.MARKET_CLOSE)
+        sessions = trading_sessions(hours, time.time())
+        summaries = hit_probabilities(closes, thresholds, horizon_bars=len(sessions) * BARS_PER_TRADING_DAY,
+                                      n_paths=n_paths)
+        return [describe_hit_probability(symbol, float(closes[-1]), s, n_paths, sessions, hours)
+                for s in summaries]
+
+    if engine != "prophet":
+        raise ValueError(f"Unknown prediction engine: {engine}")
+    forecast = get_forecast(symbol)
+    if isinstance(forecast, str):
+        return [forecast] * len(thresholds)
+    return [describe_crossing(forecast, threshold) for threshold in thresholds]
+
+
+def predict_threshold_time(symbol: str, target_price: float, engine: str | None = None):
+    try:
+        print(f"🔮 Running prediction for {symbol} ...")
+        return predict_thresholds(symbol, [target_price], engine)[0]
+
     except Exception as e:
         return f"❌ Prediction error: {e}"
@@ -0,0 +1,183 @@
+# backend/services/prediction_jobs.py
+"""
+Prediction jobs run in a bounded process pool.
+
+Fitting a forecast is CPU-bound and would otherwise block the event loop.
+Requests become jobs with an id; concurrent jobs for the same symbol share
+one in-flight fit, and the fitted forecast lands in the parent's
+forecast cache so later thresholds are answered without a new fit.
+
+Simulation engines have nothing to cache, so they coalesce on thresholds
+instead: at most one simulation per symbol runs at a time, and thresholds
+asked meanwhile are merged into a single follow-up call.
+"""
+import asyncio
+import multiprocessing
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from backend.core.config import settings
+from backend.services.predict_service import (
+    Forecast, build_forecast, describe_crossing, forecast_cache, predict_thresholds,
+)
+
+
+class PredictionJobs:
+    def __init__(self, max_workers: int = 2, max_jobs: int = 10_000, forecast_fn=build_forecast,
+                 engine: str = "prophet"):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.engine = engine
+        self.forecast_fn = forecast_fn  # must be picklable (module-level)
+        self._executor = None
+        self._jobs = OrderedDict()  # job id -> job record
+        self._tasks = {}            # job id -> asyncio.Task
+        self._inflight = {}         # symbol -> future of the running fit / simulation
+        self._batches = {}          # symbol -> thresholds waiting for the next simulation
+        self._flushes = set()
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for task in [*self._tasks.values(), *self._flushes]:
+            task.cancel()
+
+    def _forecast(self, symbol: str) -> asyncio.Future:
+        """Future of the forecast for `symbol`, shared by all waiting jobs"""
+        future = self._inflight.get(symbol)
+        if future is None:
+            self.start()
+            future = asyncio.wrap_future(self._executor.submit(self.forecast_fn, symbol))
+            self._inflight[symbol] = future
+
+            def _done(f):
+                self._inflight.pop(symbol, None)
+                if not f.cancelled() and f.exception() is None and isinstance(f.result(), Forecast):
+                    forecast_cache.put(f.result())
+
+            future.add_done_callback(_done)
+        return future
+
+    async def _simulate(self, symbol: str, thresholds: list[float]) -> list[str]:
+        """Join the symbol's next simulation; every threshold is answered by one pool call"""
+        batch = self._batches.get(symbol)
+        if batch is None:
+            batch = {"thresholds": [], "future": asyncio.get_running_loop().create_future()}
+            self._batches[symbol] = batch
+            task = asyncio.create_task(self._flush(symbol, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        start = len(batch["thresholds"])
+        batch["thresholds"].extend(thresholds)
+        answers = await asyncio.shield(batch["future"])
+        return answers[start:start + len(thresholds)]
+
+    async def _flush(self, symbol: str, batch: dict):
+        future = None
+        try:
+            running = self._inflight.get(symbol)
+            if running is not None:
+                await asyncio.gather(running, return_exceptions=True)  # the batch keeps collecting meanwhile
+            else:
+                await asyncio.sleep(0)  # pick up requests made in the same loop iteration
+            del self._batches[symbol]  # later thresholds start the next batch, which waits for this one
+
+            unique = sorted(set(batch["thresholds"]))
+            self.start()
+            future = asyncio.wrap_future(self._executor.submit(predict_thresholds, symbol, unique, self.engine))
+            self._inflight[symbol] = future
+            answers = dict(zip(unique, await future))
+            batch["future"].set_result([answers[t] for t in batch["thresholds"]])
+        except asyncio.CancelledError:
+            batch["future"].cancel()
+            raise
+        except Exception as e:
+            batch["future"].set_exception(e)
+        finally:
+            if self._batches.get(symbol) is batch:
+                del self._batches[symbol]
+            if future is not None and self._inflight.get(symbol) is future:
+                del self._inflight[symbol]
+
+    async def _answer(self, symbol: str, thresholds: list[float]) -> list[str]:
+        if self.engine != "prophet":
+            return await self._simulate(symbol, thresholds)
+
+        forecast = forecast_cache.get(symbol)
+        if forecast is None:
+            forecast = await asyncio.shield(self._forecast(symbol))
+        if not isinstance(forecast, Forecast):
+            return [forecast] * len(thresholds)  # error message from the fit
+        return [describe_crossing(forecast, threshold) for threshold in thresholds]
+
+    async def _run(self, job: dict):
+        job["status"] = "running"
+        try:
+            job["result"] = (await self._answer(job["symbol"], [job["threshold"]]))[0]
+            job["status"] = "done"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except Exception as e:
+            job["status"] = "failed"
+            job["result"] = f"❌ Prediction error: {e}"
+        finally:
+            job["finished_at"] = datetime.utcnow()
+            self._tasks.pop(job["job_id"], None)
+
+    def submit(self, symbol: str, threshold: float) -> dict:
+        """Queue a prediction and return its job record immediately"""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "symbol": symbol.upper(),
+            "threshold": float(threshold),
+            "status": "pending",
+            "result": None,
+            "submitted_at": datetime.utcnow(),
+            "finished_at": None,
+        }
+        self._jobs[job["job_id"]] = job
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            # Oldest finished jobs go first; pending and running ones stay pollable
+            finished = (job_id for job_id, old in self._jobs.items() if old["status"] not in ("pending", "running"))
+            for job_id in list(islice(finished, excess)):
+                self._jobs.pop(job_id)
+
+        cached = forecast_cache.get(job["symbol"]) if self.engine == "prophet" else None
+        if cached is not None:
+            job["result"] = describe_crossing(cached, job["threshold"])
+            job["status"] = "done"
+            job["finished_at"] = datetime.utcnow()
+        else:
+            self._tasks[job["job_id"]] = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> dict | None:
+        return self._jobs.get(job_id)
+
+    async def predict(self, symbol: str, threshold: float) -> str:
+        """Submit a job and wait for its result"""
+        job = self.submit(symbol, threshold)
+        task = self._tasks.get(job["job_id"])
+        if task is not None:
+            await task
+        return job["result"]
+
+    async def predict_many(self, symbol: str, thresholds: list[float]) -> list[str]:
+        """Answer all thresholds on one symbol with a single fit or simulation"""
+        return await self._answer(symbol.upper(), [float(t) for t in thresholds])
+
+
+prediction_jobs = PredictionJobs(max_workers=settings.PREDICTION_WORKERS, engine=settings.PREDICTION_ENGINE)
@@ -0,0 +1,127 @@
+# backend/services/price_stream.py
+"""
+Streaming trade feed over a WebSocket (Finnhub protocol).
+
+Subscribes to the symbols returned by `symbols_provider`, re-syncs the
+subscription set when it changes, reconnects with exponential backoff and
+hands every tick to `on_tick(symbol, price, timestamp_ms)`.
+"""
+import asyncio
+import inspect
+import json
+import random
+import time
+
+import aiohttp
+
+from backend.core.logging import logger
+
+
+class PriceStream:
+    def __init__(self, url: str, symbols_provider, on_tick, resync_seconds: float = 5.0,
+                 initial_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.url = url
+        self.symbols_provider = symbols_provider
+        self.on_tick = on_tick
+        self.resync_seconds = resync_seconds
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.subscribed = set()
+        self.ticks_received = 0
+        self.reconnects = 0
+
+    async def run(self):
+        """Stream forever; cancel the task to stop"""
+        backoff = self.initial_backoff
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30) as ws:
+                        logger.info(f"[PriceStream] Connected to {self.url.split('?')[0]}")
+                        backoff = self.initial_backoff
+                        self.subscribed = set()
+                        await self._sync_subscriptions(ws)
+                        await self._consume(ws)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"[PriceStream] Connection lost: {e}")
+
+                self.reconnects += 1
+                delay = backoff * random.uniform(0.5, 1.0)
+                logger.info(f"[PriceStream] Reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _wanted_symbols(self) -> set:
+        symbols = self.symbols_provider()
+        if inspect.isawaitable(symbols):
+            symbols = await symbols
+        return {s.upper() for s in symbols}
+
+    async def _sync_subscriptions(self, ws):
+        wanted = await self._wanted_symbols()
+        for symbol in sorted(wanted - self.subscribed):
+            await ws.send_json({"type": "subscribe", "symbol": symbol})
+        for symbol in sorted(self.subscribed - wanted):
+            await ws.send_json({"type": "unsubscribe", "symbol": symbol})
+        if wanted != self.subscribed:
+            logger.info(f"[PriceStream] Subscribed to {len(wanted)} symbols")
+        self.subscribed = wanted
+
+    async def _consume(self, ws):
+        next_sync = time.monotonic() + self.resync_seconds
+        while True:
+            timeout = max(0.0, next_sync - time.monotonic())
+            try:
+                msg = await ws.receive(timeout=timeout)
+            except asyncio.TimeoutError:
+                msg = None
+
+            if msg is not None:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    await self._handle(msg.data)
+                elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                                  aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                    raise ConnectionError(f"websocket closed ({msg.type.name})")
+
+            if time.monotonic() >= next_sync:
+                await self._sync_subscriptions(ws)
+                next_sync = time.monotonic() + self.resync_seconds
+
+    async def _handle(self, raw: str):
+        payload = json.loads(raw)
+        kind = payload.get("type")
+        if kind == "error":
+            logger.error(f"[PriceStream] Upstream error: {payload.get('msg')}")
+            return
+        if kind != "trade":
+            return
+
+        # A message can carry many trades. Per symbol, pass on its low, high and
+        # latest trade (in time order, latest last): a threshold touched and
+        # recovered within one message is still seen, without a tick per trade.
+        trades = {}
+        for trade in payload.get("data") or []:
+            symbol = trade.get("s")
+            price = trade.get("p")
+            if symbol is None or price is None:
+                continue
+            trades.setdefault(symbol, []).append((trade.get("t", 0), float(price)))
+
+        for symbol, ticks in trades.items():
+            latest = max(reversed(ticks), key=lambda tick: tick[0])  # ties: the last one sent
+            low = min(ticks, key=lambda tick: tick[1])
+            high = max(ticks, key=lambda tick: tick[1])
+            extremes = sorted({low, high} - {latest})
+            for ts, price in extremes + [latest]:
+                await self._emit(symbol, price, ts)
+
+    async def _emit(self, symbol: str, price: float, ts):
+        self.ticks_received += 1
+        try:
+            result = self.on_tick(symbol, price, ts)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"[PriceStream] Tick handler failed for {symbol}: {e}")
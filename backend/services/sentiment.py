@@ -0,0 +1,154 @@
+# backend/services/sentiment.py
+"""
+Headline sentiment.
+
+`SentimentEngine` labels batches of articles and memoizes each result by
+article URL (or a hash of the headline when there is no URL), so a headline
+that appears in thousands of digests is scored once. Scoring itself is
+delegated to a `SentimentScorer`; the default `LexiconScorer` tokenizes
+once and sums weights from a word lexicon. A model-backed scorer (for
+example a local FinBERT) only has to implement `score_batch`.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# word -> weight; whole tokens only, so "up" no longer matches "update"
+LEXICON = {
+    # positive
+    "gain": 1.0, "gains": 1.0, "gained": 1.0,
+    "positive": 1.0, "growth": 1.0, "grows": 1.0, "grew": 1.0,
+    "up": 0.5, "profit": 1.0, "profits": 1.0, "profitable": 1.0,
+    "surge": 1.5, "surges": 1.5, "surged": 1.5, "soar": 1.5, "soars": 1.5, "soared": 1.5,
+    "rally": 1.0, "rallies": 1.0, "jump": 1.0, "jumps": 1.0, "jumped": 1.0,
+    "rise": 0.75, "rises": 0.75, "rose": 0.75, "beat": 1.0, "beats": 1.0,
+    "record": 0.5, "upgrade": 1.0, "upgraded": 1.0, "outperform": 1.0, "bullish": 1.5,
+    # negative
+    "loss": -1.0, "losses": -1.0, "lost": -1.0,
+    "down": -0.5, "negative": -1.0, "decline": -1.0, "declines": -1.0, "declined": -1.0,
+    "drop": -1.0, "drops": -1.0, "dropped": -1.0,
+    "fall": -0.75, "falls": -0.75, "fell": -0.75, "plunge": -1.5, "plunges": -1.5, "plunged": -1.5,
+    "slump": -1.5, "slumps": -1.5, "tumble": -1.5, "tumbles": -1.5,
+    "miss": -1.0, "misses": -1.0, "missed": -1.0, "downgrade": -1.0, "downgraded": -1.0,
+    "lawsuit": -1.0, "recall": -1.0, "layoffs": -1.0, "bearish": -1.5, "underperform": -1.0,
+}
+NEGATIONS = frozenset({"not", "no", "never", "without", "isn't", "didn't", "doesn't", "won't"})
+NEGATION_WINDOW = 3  # a negation reaches at most this many tokens ahead, and never past punctuation
+CLAUSE_BREAKS = frozenset(".,;:!?")
+
+
+def label_for(score: float, threshold: float = 0.0) -> str:
+    if score > threshold:
+        return "Positive"
+    if score < -threshold:
+        return "Negative"
+    return "Neutral"
+
+
+class SentimentScorer:
+    """Scores a batch of texts; positive > 0 > negative"""
+
+    name = "base"
+
+    def score_batch(self, texts: list[str]) -> list[float]:
+        raise NotImplementedError
+
+
+class LexiconScorer(SentimentScorer):
+    """
+    Sum of lexicon weights over whole words; a negation flips the next
+    scored word within `window` tokens in the same clause ("not a big gain"
+    is negative, "no surprise, shares surge" is not). A headline is
+    tokenized in a single regex pass.
+    """
+
+    name = "lexicon"
+    _tokens = re.compile(r"[\w']+|[.,;:!?]")
+
+    def __init__(self, lexicon: dict[str, float] = LEXICON, negations=NEGATIONS, window: int = NEGATION_WINDOW):
+        self.lexicon = dict(lexicon)
+        self.negations = frozenset(negations)
+        self.window = window
+
+    def score(self, text: str) -> float:
+        lexicon, negations = self.lexicon, self.negations
+        total, negated_until = 0.0, -1
+        for i, token in enumerate(self._tokens.findall(text.lower())):
+            if token in negations:
+                negated_until = i + self.window
+                continue
+            if token in CLAUSE_BREAKS:
+                negated_until = -1
+                continue
+            weight = lexicon.get(token)
+            if weight is not None:
+                total += -weight if i <= negated_until else weight
+                negated_until = -1
+        return total
+
+    def score_batch(self, texts):
+        return [self.score(text) for text in texts]
+
+
+def article_key(article: dict) -> str:
+    """Article URL, or a digest of the headline when there is none"""
+    url = article.get("url")
+    if url:
+        return url
+    return hashlib.blake2b((article.get("title") or "").encode(), digest_size=16).hexdigest()
+
+
+class SentimentEngine:
+    def __init__(self, scorer: SentimentScorer | None = None, cache_size: int = 50_000):
+        self.scorer = scorer or LexiconScorer()
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def set_scorer(self, scorer: SentimentScorer):
+        """Swap the scoring backend; cached labels from the old one are dropped"""
+        with self._lock:
+            self.scorer = scorer
+            self._cache.clear()
+
+    def analyze_articles(self, articles: list[dict]) -> list[str]:
+        """Label every article, scoring only the ones not seen before in one batch"""
+        keys = [article_key(article) for article in articles]
+        labels: list[str | None] = [None] * len(articles)
+        pending: dict[str, list[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                label = self._cache.get(key)
+                if label is not None:
+                    self._cache.move_to_end(key)
+                    labels[i] = label
+                    self.hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+            self.misses += len(pending)
+
+        if pending:
+            first = [positions[0] for positions in pending.values()]
+            scores = self.scorer.score_batch([articles[i].get("title") or "" for i in first])
+            with self._lock:
+                for (key, positions), score in zip(pending.items(), scores):
+                    label = label_for(score)
+                    for i in positions:
+                        labels[i] = label
+                    self._cache[key] = label
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return labels
+
+    def analyze_many(self, headlines: list[str]) -> list[str]:
+        return self.analyze_articles([{"title": headline} for headline in headlines])
+
+    def analyze(self, headline: str) -> str:
+        return self.analyze_many([headline])[0]
+
+
+sentiment_engine = SentimentEngine()
@@ -0,0 +1,102 @@
+# backend/tasks/background.py
+"""
+Background jobs that must run in exactly one process:
+
+    alerts  the alert registry and alert engine (price polling / stream)
+    news    the daily news digest scheduler
+
+Each job has its own lease (see backend/services/leader.py), so with
+`uvicorn --workers N` one worker runs the alert engine, possibly another
+the news scheduler, and the rest stand by. To keep API workers stateless,
+set RUN_BACKGROUND_JOBS=false for them and run the jobs in their own
+process:
+
+    python -m backend.worker
+
+Several worker processes are fine too; the extra ones are hot standbys.
+With ALERT_SHARDING every such process instead evaluates its own share of
+the alerts (see backend/services/alert_shards.py).
+"""
+import asyncio
+
+from backend.core.config import settings
+from backend.db.mongo_model import alert_shards_col, leases_col
+from backend.services.alert_service import alert_engine, alert_registry
+from backend.services.alert_shards import AlertShard, ShardMembership
+from backend.services.leader import LeaderElector, MongoLease, RedisLease, process_identity
+from backend.tasks.news_scheduler import user_specific_news_job
+
+OWNER = process_identity()
+
+
+# ----------------------------------------
+# ✅ Jobs
+# ----------------------------------------
+async def start_alerts():
+    await alert_registry.start()
+    alert_engine.start()
+
+
+async def stop_alerts():
+    await alert_engine.stop()
+    await alert_registry.stop()
+
+
+_news_task = None
+
+
+async def start_news():
+    global _news_task
+    _news_task = asyncio.create_task(user_specific_news_job())
+
+
+async def stop_news():
+    global _news_task
+    if _news_task is not None:
+        _news_task.cancel()
+        await asyncio.gather(_news_task, return_exceptions=True)
+        _news_task = None
+
+
+# ----------------------------------------
+# ✅ Elections
+# ----------------------------------------
+def build_lease(name: str):
+    if settings.LEADER_BACKEND == "redis":
+        from redis import asyncio as aioredis
+        return RedisLease(aioredis.from_url(settings.REDIS_URL), name, OWNER, settings.LEADER_LEASE_SECONDS)
+    return MongoLease(leases_col, name, OWNER, settings.LEADER_LEASE_SECONDS)
+
+
+alert_shard = AlertShard(
+    alert_registry,
+    alert_engine,
+    ShardMembership(alert_shards_col, OWNER, settings.LEADER_LEASE_SECONDS),
+    vnodes=settings.ALERT_SHARD_VNODES,
+)
+
+background_jobs = [LeaderElector(build_lease("news"), start_news, stop_news)]
+if not settings.ALERT_SHARDING:
+    background_jobs.insert(0, LeaderElector(build_lease("alerts"), start_alerts, stop_alerts))
+
+
+async def start_background_jobs():
+    print(f"🗳️ Campaigning for background jobs as {OWNER}")
+    for job in background_jobs:
+        job.start()
+    if settings.ALERT_SHARDING:
+        await alert_shard.start()
+
+
+async def stop_background_jobs():
+    jobs = [job.close() for job in background_jobs]
+    if settings.ALERT_SHARDING:
+        jobs.append(alert_shard.stop())
+    await asyncio.gather(*jobs)
+
+
+def background_status() -> list:
+    status = [job.status() for job in background_jobs]
+    if settings.ALERT_SHARDING:
+        status.append({"job": "alerts", "shard": alert_shard.status()})
+    return status
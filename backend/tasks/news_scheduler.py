@@ -1,42 +1,224 @@
 # backend/tasks/news_scheduler.py
 
 import asyncio
+import bisect
+import threading
 from datetime import datetime
-from backend.db.mongo_model import users_col
+from pymongo.errors import PyMongoError
+from backend.core.config import settings
+from backend.db.mongo_model import leases_col, users_col
 from backend.services.email_services import send_email_notification
-from backend.services.news_service import get_user_specific_news
+from backend.services.news_service import digest_tickers, get_user_specific_news, prefetch_news
+
+MINUTES_PER_DAY = 24 * 60
+RESYNC_SECONDS = 600      # full reload of the prefetch plan; dispatch itself always reads Mongo
+PREFETCH_LEAD_SECONDS = 60
+PROGRESS_ID = "news:progress"  # last dispatched minute, kept next to the "news" lease
+
+
+def parse_news_time(news_time: str | None) -> int | None:
+    """'HH:MM' -> minute of the day, None when missing or invalid"""
+    try:
+        hours, minutes = (int(part) for part in news_time.split(":"))
+    except (AttributeError, ValueError):
+        return None
+    if 0 <= hours < 24 and 0 <= minutes < 60:
+        return hours * 60 + minutes
+    return None
+
+
+def _absolute_minute(now: datetime) -> int:
+    return now.toordinal() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+
+
+# ----------------------------------------
+# ✅ Users bucketed by the minute their digest is due
+# ----------------------------------------
+class NewsSchedule:
+    def __init__(self):
+        self._buckets: dict[int, set[str]] = {}
+        self._slot_of: dict[str, int] = {}
+        self._minutes: list[int] = []  # sorted non-empty slots
+        self._lock = threading.Lock()
+        self.changed = asyncio.Event()
+
+    def load(self, users):
+        buckets, slot_of = {}, {}
+        for user in users:
+            slot = parse_news_time(user.get("news_time"))
+            if slot is not None and user.get("notify_news"):
+                buckets.setdefault(slot, set()).add(user["email"])
+                slot_of[user["email"]] = slot
+        with self._lock:
+            self._buckets, self._slot_of = buckets, slot_of
+            self._minutes = sorted(buckets)
+
+    def set(self, email: str, news_time: str | None, notify_news: bool = True):
+        """Move `email` to its new slot (or drop it when notifications are off)"""
+        slot = parse_news_time(news_time) if notify_news else None
+        with self._lock:
+            old = self._slot_of.pop(email, None)
+            if old is not None:
+                self._buckets[old].discard(email)
+                if not self._buckets[old]:
+                    del self._buckets[old]
+                    self._minutes.remove(old)
+            if slot is not None:
+                if slot not in self._buckets:
+                    self._buckets[slot] = set()
+                    bisect.insort(self._minutes, slot)
+                self._buckets[slot].add(email)
+                self._slot_of[email] = slot
+        self.changed.set()
+
+    def bucket(self, slot: int) -> list[str]:
+        with self._lock:
+            return list(self._buckets.get(slot, ()))
+
+    def next_due(self, after_minute: int) -> int | None:
+        """First absolute minute after `after_minute` with users due"""
+        with self._lock:
+            if not self._minutes:
+                return None
+            slot = after_minute % MINUTES_PER_DAY
+            i = bisect.bisect_right(self._minutes, slot)
+            if i < len(self._minutes):
+                return after_minute + self._minutes[i] - slot
+            return after_minute + MINUTES_PER_DAY - slot + self._minutes[0]
+
+    def __len__(self):
+        return len(self._slot_of)
+
+
+news_schedule = NewsSchedule()
+scheduler_stats = {"dispatched_slots": 0, "skipped_minutes": 0}
+
+
+async def _load_users(emails: list[str]) -> list:
+    return await users_col.find({"email": {"$in": emails}, "notify_news": True}).to_list(None)
+
+
+def _tickers_for(users: list) -> set:
+    return {ticker for user in users for ticker in digest_tickers(user)}
+
+
+async def _prefetch_slot(emails: list[str]):
+    users = await _load_users(emails)
+    await prefetch_news(_tickers_for(users))
+
+
+async def _due_users(slot: int) -> list:
+    """
+    Users due in `slot`, read when the slot is dispatched: changes made through
+    any process (another API worker's /set-news-time/, /profile/alerts) count
+    even if this process's schedule has not heard of them yet.
+    """
+    news_time = f"{slot // 60:02d}:{slot % 60:02d}"
+    return await users_col.find({"notify_news": True, "news_time": news_time}).to_list(None)
+
+
+async def dispatch_slot(slot: int, users: list):
+    """Build and send every digest in a slot concurrently"""
+    stats = await prefetch_news(_tickers_for(users))
+    print(f"🕒 Sending news updates to {len(users)} users at {slot // 60:02d}:{slot % 60:02d} | cache: {stats}")
+
+    semaphore = asyncio.Semaphore(settings.NEWS_DISPATCH_CONCURRENCY)
+
+    async def send(user):
+        async with semaphore:
+            try:
+                news_summary = await get_user_specific_news(user["email"], user)
+                await asyncio.to_thread(
+                    send_email_notification,
+                    to_email=user["email"],
+                    subject="📰 Your Daily Stock News Update",
+                    message=news_summary
+                )
+            except Exception as e:
+                print(f"❌ Error sending news to {user['email']}: {e}")
+
+    await asyncio.gather(*(send(user) for user in users))
+
+
+async def _load_progress() -> int | None:
+    progress = await leases_col.find_one({"_id": PROGRESS_ID})
+    return progress["last_minute"] if progress else None
+
+
+async def _save_progress(minute: int):
+    """Record `minute` as dispatched so a new leader resumes after it ($max: never moves back)"""
+    try:
+        await leases_col.update_one({"_id": PROGRESS_ID}, {"$max": {"last_minute": minute}}, upsert=True)
+    except PyMongoError as e:
+        print(f"⚠️ Could not save news scheduler progress: {e}")
 
 
 async def user_specific_news_job():
-    """Check every minute if a user's news notification time is reached."""
+    """Send each user's digest when their news_time slot comes up."""
     print("📰 Starting user-specific news scheduler...")
+    loop = asyncio.get_running_loop()
+    last_done = None
+    last_resync = None
+    prefetching = {}
 
     while True:
         try:
-            users = list(users_col.find({"notify_news": True}))
-            if not users:
-                print("ℹ️ No users with news notifications enabled.")
-                await asyncio.sleep(60)
-                continue
-
-            now = datetime.now().strftime("%H:%M")
-            for user in users:
-                email = user["email"]
-                news_time = user.get("news_time")
-
-                if not news_time:
-                    continue
-
-                if now == news_time:
-                    print(f"🕒 Sending news update to {email} at {news_time}")
-                    news_summary = get_user_specific_news(email)
-                    send_email_notification(
-                        to_email=email,
-                        subject="📰 Your Daily Stock News Update",
-                        message=news_summary
-                    )
-                    await asyncio.sleep(1)  # small delay between users
+            news_schedule.changed.clear()
+            if last_resync is None or loop.time() - last_resync >= RESYNC_SECONDS:
+                users = await users_col.find({"notify_news": True}).to_list(None)
+                news_schedule.load(users)
+                last_resync = loop.time()
+                print(f"📰 News schedule loaded: {len(news_schedule)} users")
+
+            # Every minute up to now is processed, including ones a slow dispatch ran past
+            # and, after a failover, the ones since the previous leader's last dispatch
+            now_minute = _absolute_minute(datetime.now())
+            if last_done is None:
+                saved = await _load_progress()
+                last_done = saved if saved is not None else now_minute - 1
+            saved_done = last_done
+            # Late slots are still sent; only minutes more than NEWS_MAX_CATCH_UP_MINUTES
+            # behind (by default a day: the same slot comes round again) are skipped
+            oldest = now_minute - settings.NEWS_MAX_CATCH_UP_MINUTES
+            if last_done < oldest:
+                skipped = oldest - last_done
+                scheduler_stats["skipped_minutes"] += skipped
+                print(f"⚠️ News scheduler is {now_minute - last_done} minutes behind; "
+                      f"skipping the oldest {skipped}")
+                last_done = oldest
+            while last_done < now_minute:
+                minute = last_done + 1
+                prefetch = prefetching.pop(minute, None)
+                if prefetch is not None:
+                    await asyncio.gather(prefetch, return_exceptions=True)
+                users = await _due_users(minute % MINUTES_PER_DAY)
+                if users:
+                    await dispatch_slot(minute % MINUTES_PER_DAY, users)
+                    scheduler_stats["dispatched_slots"] += 1
+                    await _save_progress(minute)
+                last_done = minute
+            if last_done > saved_done:
+                await _save_progress(last_done)
+            prefetching = {m: task for m, task in prefetching.items() if m > last_done}
+
+            # Sleep until the next minute (its users are read from Mongo then), waking
+            # early to warm the news of the next slot this process knows about
+            now = datetime.now()
+            timeout = 60 - now.second - now.microsecond / 1e6
+            next_minute = news_schedule.next_due(last_done)
+            if next_minute is not None:
+                seconds_to_due = (next_minute - _absolute_minute(now)) * 60 - now.second - now.microsecond / 1e6
+                if seconds_to_due <= PREFETCH_LEAD_SECONDS:
+                    if next_minute not in prefetching:
+                        emails = news_schedule.bucket(next_minute % MINUTES_PER_DAY)
+                        prefetching[next_minute] = asyncio.create_task(_prefetch_slot(emails))
+                else:
+                    timeout = min(timeout, seconds_to_due - PREFETCH_LEAD_SECONDS)
+
+            try:
+                await asyncio.wait_for(news_schedule.changed.wait(), max(timeout, 0.05))
+            except asyncio.TimeoutError:
+                pass
         except Exception as e:
             print(f"❌ Error in news scheduler: {e}")
-
-        await asyncio.sleep(60)
+            await asyncio.sleep(60)
@@ -0,0 +1,28 @@
+# backend/utils/http.py
+"""
+Process-wide aiohttp session.
+
+Reusing one pooled session keeps TCP/TLS connections alive between requests
+instead of paying a new handshake per call. Close it on shutdown.
+"""
+import aiohttp
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def get_http_session(limit: int = 100, timeout: float = 10.0) -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=limit, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+    return _session
+
+
+async def close_http_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
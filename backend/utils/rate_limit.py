@@ -0,0 +1,40 @@
+# backend/utils/rate_limit.py
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio callers: `rate_per_minute` tokens refill evenly
+    over a minute, up to `burst` tokens banked at once.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int | None = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = burst if burst is not None else max(1, int(rate_per_minute))
+        self.tokens = float(self.capacity)
+        self._fill_rate = rate_per_minute / 60.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._fill_rate)
+        self._updated = now
+
+    def try_acquire(self, n: int = 1) -> int:
+        """Take up to `n` tokens without waiting; returns how many were taken"""
+        self._refill()
+        taken = min(n, int(self.tokens))
+        self.tokens -= taken
+        return taken
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self._fill_rate)
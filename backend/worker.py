@@ -0,0 +1,52 @@
+# backend/worker.py
+"""
+Background job process: the alert engine and news scheduler without the API.
+
+    python -m backend.worker
+
+Run the API workers with RUN_BACKGROUND_JOBS=false so they stay stateless.
+Jobs are still taken by lease, so starting a second worker gives a hot
+standby rather than duplicate emails. With ALERT_SHARDING each worker
+started evaluates its own share of the alerts instead.
+"""
+import asyncio
+import signal
+
+from backend.db.connection import close_mongo, connect_mongo
+from backend.db.indexes import ensure_indexes
+from backend.services.alert_service import mailjet_batcher
+from backend.services.email_services import email_outbox
+from backend.services.prediction_jobs import prediction_jobs
+from backend.tasks.background import start_background_jobs, stop_background_jobs
+from backend.utils.http import close_http_session
+
+
+async def run():
+    print("🚀 Starting background worker...")
+    await connect_mongo()
+    await ensure_indexes()
+
+    # ✅ What the jobs send through: alert emails, news emails, alert predictions
+    await email_outbox.start()
+    mailjet_batcher.start()
+    prediction_jobs.start()
+
+    await start_background_jobs()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    await stopping.wait()
+
+    print("🛑 Shutting down background worker...")
+    await stop_background_jobs()
+    prediction_jobs.shutdown()
+    await email_outbox.stop()
+    await asyncio.to_thread(mailjet_batcher.stop)
+    await close_http_session()
+    close_mongo()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
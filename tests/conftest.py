@@ -0,0 +1,5 @@
+# tests/conftest.py
+# Placeholder settings so backend modules import without a .env
+from backend.benchmarks._env import use_dummy_settings
+
+use_dummy_settings()
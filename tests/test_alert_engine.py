@@ -0,0 +1,61 @@
+# tests/test_alert_engine.py
+import asyncio
+
+from pymongo.errors import AutoReconnect
+
+from backend.services.alert_engine import AlertEngine
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_registry import AlertRegistry
+
+
+class FlakyAlerts:
+    """Claims fail `failures` times, then succeed once per alert"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.claimed = set()
+
+    async def find_one_and_update(self, query, update):
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("primary stepped down")
+        if query["_id"] in self.claimed:
+            return None
+        self.claimed.add(query["_id"])
+        return {"_id": query["_id"], "email": "user@example.com"}
+
+
+def engine_with(collection):
+    registry = AlertRegistry(collection, AlertIndex(rising=("sell",), falling=("buy",)))
+    registry.upsert({"_id": 1, "symbol": "AAPL", "threshold": 100.0, "type": "buy", "active": True})
+    sent = []
+    engine = AlertEngine(registry, collection, source=None, notify=lambda alert, price: sent.append(price))
+    return engine, registry, sent
+
+
+def test_failed_claim_puts_the_alert_back_for_the_next_tick():
+    engine, registry, sent = engine_with(FlakyAlerts(failures=1))
+
+    async def run():
+        await engine.on_tick("AAPL", 99.0)
+        await asyncio.gather(*engine._pending)
+        assert 1 in registry and 1 in engine.index
+        await engine.on_tick("AAPL", 98.0)
+        await asyncio.gather(*engine._pending)
+
+    asyncio.run(run())
+    assert sent == [98.0]
+    assert 1 not in registry
+
+
+def test_failed_claim_stays_retired_once_deactivated():
+    engine, registry, sent = engine_with(FlakyAlerts(failures=1))
+
+    async def run():
+        await engine.on_tick("AAPL", 99.0)
+        # The deactivation (e.g. the user deleted the alert) lands before the claim fails
+        registry.upsert({"_id": 1, "symbol": "AAPL", "threshold": 100.0, "type": "buy", "active": False})
+        await asyncio.gather(*engine._pending)
+
+    asyncio.run(run())
+    assert 1 not in registry and sent == []
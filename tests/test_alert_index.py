@@ -0,0 +1,55 @@
+# tests/test_alert_index.py
+from backend.services.alert_index import AlertIndex
+
+
+def alert(alert_id, threshold, alert_type, symbol="AAPL"):
+    return {"_id": alert_id, "symbol": symbol, "threshold": threshold, "type": alert_type}
+
+
+def index_with(*alerts):
+    index = AlertIndex(rising=("sell",), falling=("buy",))
+    index.load(alerts)
+    return index
+
+
+def ids(alerts):
+    return sorted(a["_id"] for a in alerts)
+
+
+def test_thresholds_equal_to_the_price_fire_on_both_sides():
+    index = index_with(alert(1, 100.0, "sell"), alert(2, 100.0, "buy"), alert(3, 100.01, "sell"), alert(4, 99.99, "buy"))
+    assert ids(index.triggered("AAPL", 100.0)) == [1, 2]
+    assert ids(index.triggered("AAPL", 100.01)) == [1, 3]
+    assert ids(index.triggered("AAPL", 99.99)) == [2, 4]
+
+
+def test_pop_triggered_removes_only_what_fired():
+    index = index_with(alert(1, 105.0, "sell"), alert(2, 110.0, "sell"), alert(3, 95.0, "buy"), alert(4, 90.0, "buy"))
+    assert ids(index.pop_triggered("aapl", 107.0)) == [1]
+    assert ids(index.pop_triggered("AAPL", 107.0)) == []
+    assert ids(index.pop_triggered("AAPL", 90.0)) == [3, 4]
+    assert len(index) == 1 and index.bounds("AAPL") == (110.0, None)
+    assert ids(index.pop_triggered("AAPL", 1000.0)) == [2]
+    assert index.symbols() == set()
+
+
+def test_duplicate_thresholds_are_removed_by_id():
+    index = index_with(alert(1, 100.0, "sell"), alert(2, 100.0, "sell"), alert(3, 100.0, "sell"))
+    index.remove(2)
+    assert ids(index.pop_triggered("AAPL", 100.0)) == [1, 3]
+
+
+def test_add_keeps_the_arrays_sorted_and_ignores_unknown_types():
+    index = AlertIndex(rising=("sell",), falling=("buy",))
+    for i, threshold in enumerate([120.0, 101.0, 150.0, 101.0]):
+        assert index.add(alert(i, threshold, "sell"))
+    assert not index.add(alert(99, 1.0, "hold"))
+    assert not index.add(alert(0, 120.0, "sell"))  # already indexed
+    assert index.bounds("AAPL") == (101.0, None)
+    assert ids(index.triggered("AAPL", 120.0)) == [0, 1, 3]
+
+
+def test_symbols_are_kept_apart():
+    index = index_with(alert(1, 100.0, "sell", "AAPL"), alert(2, 100.0, "sell", "TSLA"))
+    assert ids(index.pop_triggered("TSLA", 200.0)) == [2]
+    assert index.symbols() == {"AAPL"}
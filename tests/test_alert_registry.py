@@ -0,0 +1,31 @@
+# tests/test_alert_registry.py
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_registry import AlertRegistry
+
+
+def alert(alert_id, active=True):
+    return {"_id": alert_id, "symbol": "AAPL", "threshold": 100.0, "type": "buy", "active": active}
+
+
+def registry():
+    return AlertRegistry(None, AlertIndex(rising=("sell",), falling=("buy",)))
+
+
+def test_retired_alert_ignores_stale_events_until_deactivated():
+    reg = registry()
+    reg.upsert(alert(1))
+    reg.retire(1)
+    reg._apply({"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": alert(1)})
+    assert 1 not in reg
+
+    reg._apply({"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": alert(1, active=False)})
+    assert reg._retired == set()
+
+
+def test_delete_event_forgets_retired_alert():
+    reg = registry()
+    reg.upsert(alert(2))
+    reg.retire(2)
+    reg._apply({"operationType": "delete", "documentKey": {"_id": 2}})
+    assert 2 not in reg
+    assert reg._retired == set()
@@ -0,0 +1,87 @@
+# tests/test_alert_shards.py
+import asyncio
+
+from backend.services.alert_index import AlertIndex
+from backend.services.alert_registry import AlertRegistry
+from backend.services.alert_shards import HashRing
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(400)]
+
+
+def test_ring_is_deterministic_and_case_insensitive():
+    ring = HashRing(["w2", "w1", "w0"])
+    assert [ring.owner(s) for s in SYMBOLS] == [HashRing(["w0", "w1", "w2"]).owner(s) for s in SYMBOLS]
+    assert ring.owner("aapl") == ring.owner("AAPL")
+    assert HashRing([]).owner("AAPL") is None
+
+
+def test_symbols_spread_over_members():
+    ring = HashRing([f"w{i}" for i in range(4)])
+    counts = {}
+    for symbol in SYMBOLS:
+        counts[ring.owner(symbol)] = counts.get(ring.owner(symbol), 0) + 1
+    assert len(counts) == 4 and max(counts.values()) < 2 * len(SYMBOLS) / 4
+
+
+def test_a_joining_member_only_takes_symbols_over():
+    before = HashRing(["w0", "w1", "w2", "w3"])
+    after = HashRing(["w0", "w1", "w2", "w3", "w4"])
+    moved = [s for s in SYMBOLS if before.owner(s) != after.owner(s)]
+    assert all(after.owner(s) == "w4" for s in moved)
+    assert 0 < len(moved) < len(SYMBOLS) / 3
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeAlerts:
+    def __init__(self, alerts):
+        self.alerts = alerts
+
+    async def distinct(self, field, query):
+        return sorted({a[field] for a in self.alerts if a["active"]})
+
+    def find(self, query):
+        symbols = query.get("symbol", {}).get("$in")
+        return Cursor([a for a in self.alerts if a["active"] and (symbols is None or a["symbol"] in symbols)])
+
+
+def owned_by(ring, member):
+    return lambda symbol: ring.owner(symbol) == member
+
+
+def test_reshard_drops_given_away_symbols_and_loads_taken_over_ones():
+    alerts = [{"_id": i, "symbol": s, "threshold": 100.0, "type": "sell", "active": True}
+              for i, s in enumerate(SYMBOLS)]
+    before, after = HashRing(["w0", "w1"]), HashRing(["w0", "w1", "w2"])
+    # w2 starts with nothing and takes over its share; w0 gives part of its share to w2
+    registries = {m: AlertRegistry(FakeAlerts(alerts), AlertIndex(rising=("sell",), falling=("buy",)),
+                                   symbol_filter=owned_by(before, m) if m != "w2" else (lambda s: False))
+                  for m in ("w0", "w2")}
+
+    async def run():
+        await registries["w0"].load()
+        w0 = await registries["w0"].reshard(owned_by(after, "w0"))
+        w2 = await registries["w2"].reshard(owned_by(after, "w2"))
+        return w0, w2
+
+    (dropped, loaded), (_, taken) = asyncio.run(run())
+    expected_w0 = {a["_id"] for a in alerts if after.owner(a["symbol"]) == "w0"}
+    expected_w2 = {a["_id"] for a in alerts if after.owner(a["symbol"]) == "w2"}
+    assert {a["_id"] for a in registries["w0"].active()} == expected_w0
+    assert {a["_id"] for a in registries["w2"].active()} == expected_w2
+    assert loaded == 0 and dropped == sum(before.owner(s) == "w0" and after.owner(s) == "w2" for s in SYMBOLS)
+    assert taken == len(expected_w2)
+    assert registries["w2"].index.symbols() == {s for s in SYMBOLS if after.owner(s) == "w2"}
@@ -0,0 +1,60 @@
+# tests/test_claims_cache.py
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.utils import token as token_module
+from backend.utils.token import ClaimsCache, create_access_token, verify_access_token
+
+
+def test_entries_are_served_only_until_exp(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(token_module.time, "time", lambda: now[0])
+    cache = ClaimsCache()
+    cache.put("t", {"sub": "u1", "exp": now[0] + 60})
+
+    assert cache.get("t")["sub"] == "u1"
+    now[0] += 60
+    assert cache.get("t") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_tokens_without_exp_are_not_cached():
+    cache = ClaimsCache()
+    cache.put("t", {"sub": "u1"})
+    assert cache.get("t") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ClaimsCache(max_size=2)
+    exp = 2 ** 40
+    cache.put("a", {"sub": "a", "exp": exp})
+    cache.put("b", {"sub": "b", "exp": exp})
+    cache.get("a")
+    cache.put("c", {"sub": "c", "exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_verify_serves_cached_claims_until_exp(monkeypatch):
+    cache = ClaimsCache()
+    monkeypatch.setattr(token_module, "claims_cache", cache)
+    token = create_access_token({"sub": "u1"}, timedelta(minutes=5))
+    assert asyncio.run(verify_access_token(token))["_id"] == "u1"
+    assert asyncio.run(verify_access_token(token))["_id"] == "u1"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Past exp the cached entry is dropped and the token goes back to jwt.decode
+    real_time = token_module.time.time
+    monkeypatch.setattr(token_module.time, "time", lambda: real_time() + 600)
+    assert cache.get(token) is None
+
+
+def test_bad_token_is_rejected_and_not_cached(monkeypatch):
+    cache = ClaimsCache()
+    monkeypatch.setattr(token_module, "claims_cache", cache)
+    with pytest.raises(HTTPException):
+        asyncio.run(verify_access_token("not-a-jwt"))
+    assert len(cache._entries) == 0
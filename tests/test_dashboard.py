@@ -0,0 +1,47 @@
+# tests/test_dashboard.py
+import asyncio
+import re
+from types import SimpleNamespace
+
+from pymongo.errors import DuplicateKeyError
+
+from backend.services import dashboard_service
+from backend.services.dashboard_service import DashboardService
+
+
+def test_trade_history_symbol_filter_is_uppercased():
+    query = DashboardService.trade_history_query("user-1", symbol="aapl")
+    assert query == {"user_id": "user-1", "symbol": "AAPL"}
+
+
+class FakeTradeLogs:
+    def __init__(self, symbols):
+        self.symbols = symbols
+
+    async def update_many(self, query, update):
+        changed = [s for s in self.symbols if re.search(query["symbol"]["$regex"], s)]
+        self.symbols = [s.upper() for s in self.symbols]
+        return SimpleNamespace(modified_count=len(changed))
+
+
+class FakeMigrations:
+    def __init__(self):
+        self.docs = {}
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate marker")
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update):
+        self.docs[query["_id"]].update(update["$set"])
+
+
+def test_legacy_lowercase_trades_are_uppercased_once(monkeypatch):
+    trade_logs = FakeTradeLogs(["aapl", "MSFT", "Tsla"])
+    monkeypatch.setattr(dashboard_service, "trade_logs_collection", trade_logs)
+    monkeypatch.setattr(dashboard_service, "migrations_col", FakeMigrations())
+
+    assert asyncio.run(dashboard_service.normalize_trade_symbols()) == 2
+    assert trade_logs.symbols == ["AAPL", "MSFT", "TSLA"]
+    assert asyncio.run(dashboard_service.normalize_trade_symbols()) is None
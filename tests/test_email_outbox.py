@@ -0,0 +1,93 @@
+# tests/test_email_outbox.py
+import asyncio
+import smtplib
+import threading
+
+from backend.services.email_services import EmailOutbox
+
+
+class FakeSMTP:
+    """Fails the next `failures` sends, each with `error`"""
+
+    def __init__(self, sent, failures, error):
+        self.sent = sent
+        self.failures = failures
+        self.error = error
+        self.closed = False
+
+    def sendmail(self, sender, recipients, raw):
+        if self.failures[0]:
+            self.failures[0] -= 1
+            raise self.error
+        self.sent.append(recipients[0])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def outbox_with(failures=0, error=None, workers=1):
+    outbox = EmailOutbox("smtp.invalid", 587, "user", "secret", "alerts@example.com",
+                         workers=workers, max_attempts=3, backoff=0.001)
+    sent, remaining, servers = [], [failures], []
+
+    def connect():
+        outbox.connections += 1
+        servers.append(FakeSMTP(sent, remaining, error or smtplib.SMTPServerDisconnected("dropped")))
+        return servers[-1]
+
+    outbox._connect = connect
+    return outbox, sent, servers
+
+
+def deliver(outbox, *recipients):
+    async def run():
+        await outbox.start()
+        for to_email in recipients:
+            outbox.enqueue(to_email, "Alert", "<p>AAPL crossed 100</p>")
+        await outbox.stop()
+    asyncio.run(run())
+
+
+def test_one_session_is_reused_across_messages():
+    outbox, sent, servers = outbox_with()
+    deliver(outbox, "a@example.com", "b@example.com", "c@example.com")
+    assert sent == ["a@example.com", "b@example.com", "c@example.com"]
+    assert outbox.connections == 1 and servers[0].closed  # closed on stop
+
+
+def test_transient_failure_reconnects_and_retries():
+    outbox, sent, servers = outbox_with(failures=2)
+    deliver(outbox, "a@example.com")
+    assert sent == ["a@example.com"]
+    assert (outbox.sent, outbox.retries, outbox.failed, outbox.connections) == (1, 2, 0, 3)
+
+
+def test_gives_up_after_max_attempts():
+    outbox, sent, _ = outbox_with(failures=10)
+    deliver(outbox, "a@example.com")
+    assert sent == [] and (outbox.failed, outbox.retries) == (1, 2)
+
+
+def test_permanent_rejection_is_not_retried():
+    outbox, sent, _ = outbox_with(failures=1, error=smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"no")}))
+    deliver(outbox, "a@example.com", "b@example.com")
+    assert sent == ["b@example.com"]
+    assert (outbox.failed, outbox.retries) == (1, 0)
+
+
+def test_enqueue_from_another_thread():
+    outbox, sent, _ = outbox_with(workers=2)
+
+    async def run():
+        await outbox.start()
+        thread = threading.Thread(target=outbox.enqueue, args=("a@example.com", "Alert", "hi"))
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        await asyncio.sleep(0.05)
+        await outbox.stop()
+
+    asyncio.run(run())
+    assert sent == ["a@example.com"]
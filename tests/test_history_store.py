@@ -0,0 +1,50 @@
+# tests/test_history_store.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from backend.services.history_store import HistoryProvider, HistoryStore
+
+
+def bars(*closes, end=None):
+    index = pd.date_range(end=end or pd.Timestamp.now(tz="UTC").floor("min"), periods=len(closes), freq="1min",
+                          name="timestamp")
+    return pd.DataFrame({"open": closes, "high": closes, "low": closes, "close": closes, "volume": 1.0}, index=index)
+
+
+class GatedProvider(HistoryProvider):
+    """Serves fixed frames; fetches for `gated` symbols wait until `release` is set"""
+
+    def __init__(self, frames, gated=()):
+        self.frames = frames
+        self.gated = set(gated)
+        self.release = threading.Event()
+
+    def fetch(self, symbols, interval, start, period):
+        if self.gated & set(symbols):
+            assert self.release.wait(5)
+        return {s: self.frames[s] for s in symbols if s in self.frames}
+
+
+def test_a_slow_download_does_not_block_other_symbols(tmp_path):
+    provider = GatedProvider({"SLOW": bars(1.0), "FAST": bars(2.0)}, gated=["SLOW"])
+    store = HistoryStore(tmp_path, provider)
+
+    with ThreadPoolExecutor(2) as pool:
+        slow = pool.submit(store.refresh, ["SLOW"], "1m")
+        fast = pool.submit(store.refresh, ["FAST"], "1m")
+        assert float(fast.result(timeout=2)["FAST"]["close"].iloc[-1]) == 2.0
+        assert not slow.done()
+        provider.release.set()
+        assert float(slow.result(timeout=2)["SLOW"]["close"].iloc[-1]) == 1.0
+
+
+def test_refresh_merges_new_bars_into_the_stored_file(tmp_path):
+    now = pd.Timestamp.now(tz="UTC").floor("min")
+    store = HistoryStore(tmp_path, GatedProvider({"AAPL": bars(3.0, end=now)}))
+    store._write("AAPL", "1m", bars(1.0, 2.0, end=now - pd.Timedelta(minutes=5)))
+
+    merged = store.refresh(["AAPL"], "1m")["AAPL"]
+    assert list(merged["close"]) == [1.0, 2.0, 3.0]
+    assert list(store.read("AAPL", "1m")["close"]) == [1.0, 2.0, 3.0]
@@ -0,0 +1,42 @@
+# tests/test_indexes.py
+"""
+Every hot query must be served by an index scan. Needs a MongoDB reachable
+with the configured MONGO_* settings; skipped otherwise. Works in a
+throwaway database that is dropped afterwards.
+"""
+import asyncio
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from backend.core.config import settings
+from backend.db.indexes import HOT_QUERIES, check_query_plans, ensure_indexes
+
+TEST_DB = "stock_alerts_index_test"
+
+
+async def _plans():
+    client = AsyncIOMotorClient(
+        f"mongodb://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_HOST}:{settings.MONGO_PORT}/?authSource=admin",
+        serverSelectionTimeoutMS=2000,
+    )
+    try:
+        try:
+            await client.admin.command("ping")
+        except PyMongoError as e:
+            pytest.skip(f"MongoDB unreachable: {e}")
+        db = client[TEST_DB]
+        try:
+            await ensure_indexes(db)
+            return await check_query_plans(db)
+        finally:
+            await client.drop_database(TEST_DB)
+    finally:
+        client.close()
+
+
+def test_hot_queries_use_an_index_scan():
+    problems = asyncio.run(_plans())
+    assert not [p for p in problems if "COLLSCAN" in p], problems
+    assert problems == [], f"{len(problems)} of {len(HOT_QUERIES)} hot queries: {problems}"
@@ -0,0 +1,136 @@
+# tests/test_leader.py
+import asyncio
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from backend.services.leader import LeaderElector, MongoLease
+
+
+class FakeLeases:
+    """The one conditional upsert MongoLease issues, on a dict of lease documents"""
+
+    def __init__(self):
+        self.docs = {}
+        self.down = False
+
+    def _matches(self, doc, query):
+        if doc is None or doc["_id"] != query["_id"]:
+            return False
+        if "owner" in query:
+            return doc["owner"] == query["owner"]
+        clauses = query.get("$or", [])
+        return any(doc["owner"] == c["owner"] if "owner" in c else doc["expires_at"] <= c["expires_at"]["$lte"]
+                   for c in clauses) if clauses else True
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        if self.down:
+            raise PyMongoError("no primary")
+        doc = self.docs.get(query["_id"])
+        if not self._matches(doc, query):
+            if doc is not None:
+                raise DuplicateKeyError("E11000 duplicate key")
+            doc = self.docs[query["_id"]] = {"_id": query["_id"]}
+        doc.update(update["$set"])
+        return dict(doc)
+
+    async def delete_one(self, query):
+        if self._matches(self.docs.get(query["_id"]), query):
+            del self.docs[query["_id"]]
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return doc if doc and doc["expires_at"] > query["expires_at"]["$gt"] else None
+
+
+def test_mongo_lease_is_exclusive_until_released_or_expired():
+    async def run():
+        leases = FakeLeases()
+        a = MongoLease(leases, "alerts", "a", ttl=15)
+        b = MongoLease(leases, "alerts", "b", ttl=15)
+        assert await a.acquire() and await a.acquire()  # renewal
+        assert not await b.acquire()
+        assert await b.holder() == "a"
+
+        leases.docs["alerts"]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)  # a died
+        assert await b.acquire()
+        assert not await a.acquire()
+
+        await a.release()  # not the owner: no effect
+        assert await b.holder() == "b"
+        await b.release()
+        assert await a.acquire()
+
+    asyncio.run(run())
+
+
+def job_log():
+    events = []
+
+    async def start():
+        events.append("start")
+
+    async def stop():
+        events.append("stop")
+    return events, start, stop
+
+
+def test_one_elector_leads_and_a_standby_takes_over_on_close():
+    async def run():
+        leases = FakeLeases()
+        events_a, start_a, stop_a = job_log()
+        events_b, start_b, stop_b = job_log()
+        a = LeaderElector(MongoLease(leases, "news", "a", ttl=0.3), start_a, stop_a, renew_interval=0.02)
+        b = LeaderElector(MongoLease(leases, "news", "b", ttl=0.3), start_b, stop_b, renew_interval=0.02)
+        a.start()
+        await asyncio.sleep(0.05)
+        b.start()
+        await asyncio.sleep(0.1)
+        assert (a.is_leader, b.is_leader) == (True, False)
+
+        await a.close()  # stops its job and releases the lease
+        await asyncio.sleep(0.1)
+        assert b.is_leader and b.elected == 1
+        await b.close()
+        return events_a, events_b
+
+    events_a, events_b = asyncio.run(run())
+    assert events_a == ["start", "stop"] and events_b == ["start", "stop"]
+
+
+def test_leader_steps_down_before_its_lease_can_expire_when_the_store_is_unreachable():
+    async def run():
+        leases = FakeLeases()
+        events, start, stop = job_log()
+        elector = LeaderElector(MongoLease(leases, "alerts", "a", ttl=0.5), start, stop, renew_interval=0.1)
+        elector.start()
+        await asyncio.sleep(0.05)
+        assert elector.is_leader
+        leases.down = True
+        await asyncio.sleep(0.15)
+        assert elector.is_leader  # a missed renewal: the lease is still valid
+        await asyncio.sleep(0.4)
+        assert not elector.is_leader
+        await elector.close()
+        return events
+
+    assert asyncio.run(run()) == ["start", "stop"]
+
+
+def test_failed_start_gives_the_lease_up():
+    async def run():
+        leases = FakeLeases()
+        events, _, stop = job_log()
+
+        async def broken_start():
+            raise RuntimeError("no config")
+
+        elector = LeaderElector(MongoLease(leases, "alerts", "a", ttl=1), broken_start, stop, renew_interval=0.02)
+        elector.start()
+        await asyncio.sleep(0.1)
+        await elector.close()
+        return events, leases.docs
+
+    events, docs = asyncio.run(run())
+    assert events[0] == "stop"  # stepped down after the failed start...
+    assert "alerts" not in docs  # ...and released the lease for a standby
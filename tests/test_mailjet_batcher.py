@@ -0,0 +1,102 @@
+# tests/test_mailjet_batcher.py
+import json
+
+from backend.services.mailjet_batcher import MailjetBatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeSend:
+    """Answers each call with the next scripted reply: a function of the messages sent"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def create(self, data):
+        self.calls.append([m["To"] for m in data["Messages"]])
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply(data["Messages"])
+
+
+class FakeClient:
+    def __init__(self, *replies):
+        self.send = FakeSend(replies)
+
+
+def message(to):
+    return {"To": to, "Subject": "Alert", "TextPart": "AAPL crossed 100"}
+
+
+def per_message(*statuses):
+    """A 400 response with one result per message: 'ok', or an error code"""
+    def reply(messages):
+        results = [{"Status": "success", "To": [{"Email": m["To"]}]} if s == "ok"
+                   else {"Status": "error", "Errors": [{"StatusCode": s}]} for m, s in zip(messages, statuses)]
+        return FakeResponse(200 if all(s == "ok" for s in statuses) else 400, {"Messages": results})
+    return reply
+
+
+def run(batcher, *recipients):
+    outcomes = {}
+    batcher.start()
+    for to in recipients:
+        batcher.submit(message(to), lambda ok, result, to=to: outcomes.setdefault(to, []).append(ok))
+    batcher.stop()
+    return outcomes
+
+
+def test_one_call_per_batch_with_results_mapped_in_order():
+    client = FakeClient(per_message("ok", 400, "ok"))
+    batcher = MailjetBatcher(client, window=0.05)
+
+    outcomes = run(batcher, "a@x.com", "b@x.com", "c@x.com")
+    assert client.send.calls == [["a@x.com", "b@x.com", "c@x.com"]]
+    assert outcomes == {"a@x.com": [True], "b@x.com": [False], "c@x.com": [True]}
+    assert (batcher.sent, batcher.failed, batcher.retries) == (2, 1, 0)  # a 400 is not retried
+
+
+def test_only_transient_failures_are_retried():
+    client = FakeClient(per_message("ok", 429, 503), per_message("ok", "ok"))
+    batcher = MailjetBatcher(client, window=0.05, backoff=0.01)
+
+    outcomes = run(batcher, "a@x.com", "b@x.com", "c@x.com")
+    assert client.send.calls == [["a@x.com", "b@x.com", "c@x.com"], ["b@x.com", "c@x.com"]]
+    assert all(results == [True] for results in outcomes.values())
+    assert (batcher.sent, batcher.retries, batcher.requests) == (3, 2, 2)
+
+
+def test_dropped_connection_retries_the_whole_batch_until_max_attempts():
+    client = FakeClient(*[ConnectionError("reset")] * 3)
+    batcher = MailjetBatcher(client, window=0.01, max_attempts=3, backoff=0.01)
+
+    outcomes = run(batcher, "a@x.com", "b@x.com")
+    assert len(client.send.calls) == 3
+    assert outcomes == {"a@x.com": [False], "b@x.com": [False]}
+    assert (batcher.failed, batcher.retries) == (2, 4)
+
+
+def test_batches_are_capped_at_the_batch_size():
+    client = FakeClient(per_message("ok", "ok"), per_message("ok", "ok"), per_message("ok"))
+    batcher = MailjetBatcher(client, batch_size=2, window=0.05)
+
+    run(batcher, *(f"{i}@x.com" for i in range(5)))
+    assert [len(call) for call in client.send.calls] == [2, 2, 1]
+
+
+def test_submit_sends_inline_when_not_running():
+    client = FakeClient(per_message(500), per_message("ok"))
+    batcher = MailjetBatcher(client, backoff=0.01)
+    outcomes = []
+    batcher.submit(message("a@x.com"), lambda ok, result: outcomes.append(ok))
+    assert outcomes == [True] and len(client.send.calls) == 2
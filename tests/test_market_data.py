@@ -0,0 +1,112 @@
+# tests/test_market_data.py
+import asyncio
+
+from backend.services.market_data import MarketDataClient, QuoteProvider
+from backend.utils.rate_limit import AsyncTokenBucket
+
+
+def quote(symbol, price, provider):
+    return {"symbol": symbol, "price": price, "provider": provider}
+
+
+class FakeProvider(QuoteProvider):
+    def __init__(self, name, prices, delay=0.0, fail=False):
+        self.name = name
+        self.prices = prices
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    async def fetch_many(self, symbols):
+        self.calls.append(list(symbols))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return {s: quote(s, self.prices[s], self.name) for s in symbols if s in self.prices}
+
+
+def test_concurrent_lookups_share_one_upstream_call():
+    provider = FakeProvider("primary", {"AAPL": 100.0}, delay=0.05)
+    client = MarketDataClient([provider])
+
+    async def run():
+        return await asyncio.gather(*(client.get_price("aapl") for _ in range(20)))
+
+    assert asyncio.run(run()) == [100.0] * 20
+    assert provider.calls == [["AAPL"]]
+    assert client.misses == 1 and client.coalesced == 19
+
+
+def test_quotes_are_cached_for_the_ttl():
+    provider = FakeProvider("primary", {"AAPL": 100.0})
+    client = MarketDataClient([provider], ttl=60)
+
+    async def run():
+        await client.get_quotes(["AAPL"])
+        return await client.get_quotes(["AAPL"])
+
+    assert asyncio.run(run())["AAPL"]["price"] == 100.0
+    assert len(provider.calls) == 1 and client.hits == 1
+
+
+def test_unpriced_symbols_fail_over_to_the_next_provider():
+    primary = FakeProvider("primary", {"AAPL": 100.0})
+    backup = FakeProvider("backup", {"TSLA": 200.0})
+    client = MarketDataClient([primary, backup])
+
+    quotes = asyncio.run(client.get_quotes(["AAPL", "TSLA", "NOPE"]))
+    assert {s: q["provider"] for s, q in quotes.items()} == {"AAPL": "primary", "TSLA": "backup"}
+    assert backup.calls == [["TSLA", "NOPE"]]
+    assert client.failovers == 2
+
+
+def test_failing_provider_is_skipped_for_the_failover_window():
+    primary = FakeProvider("primary", {"AAPL": 100.0}, fail=True)
+    backup = FakeProvider("backup", {"AAPL": 99.0})
+    client = MarketDataClient([primary, backup], ttl=0, failover_seconds=60)
+
+    async def run():
+        first = await client.get_price("AAPL")
+        second = await client.get_price("AAPL")
+        return first, second
+
+    assert asyncio.run(run()) == (99.0, 99.0)
+    assert len(primary.calls) == 1  # not asked again while marked down
+    assert client.metrics()["providers_down"] == ["primary"]
+
+
+def test_provider_out_of_tokens_sends_the_rest_elsewhere():
+    primary = FakeProvider("primary", {"AAPL": 1.0, "TSLA": 2.0, "GOOG": 3.0})
+    backup = FakeProvider("backup", {"AAPL": 1.5, "TSLA": 2.5, "GOOG": 3.5})
+    client = MarketDataClient([primary, backup], buckets={"primary": AsyncTokenBucket(60, burst=1)})
+
+    quotes = asyncio.run(client.get_quotes(["AAPL", "TSLA", "GOOG"]))
+    assert primary.calls == [["AAPL"]]
+    assert backup.calls == [["TSLA", "GOOG"]]
+    assert quotes["AAPL"]["provider"] == "primary"
+
+
+def test_token_bucket_takes_what_it_has_and_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.utils.rate_limit.time.monotonic", lambda: now[0])
+    bucket = AsyncTokenBucket(60, burst=5)  # one token a second
+
+    assert bucket.try_acquire(8) == 5
+    assert bucket.try_acquire() == 0
+    now[0] += 2.5
+    assert bucket.try_acquire(8) == 2
+    now[0] += 600
+    assert bucket.try_acquire(8) == 5  # never banks more than the burst
+
+
+def test_token_bucket_acquire_waits_for_a_token():
+    bucket = AsyncTokenBucket(600, burst=1)  # a token every 0.1 s
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await bucket.acquire()
+        return loop.time() - start
+
+    assert 0.15 <= asyncio.run(run()) < 1.0
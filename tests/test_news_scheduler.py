@@ -0,0 +1,102 @@
+# tests/test_news_scheduler.py
+import asyncio
+from datetime import datetime
+
+from backend.tasks import news_scheduler
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+
+class FakeUsers:
+    def __init__(self, users):
+        self.users = users
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        return FakeCursor([u for u in self.users if all(u.get(k) == v for k, v in query.items())])
+
+
+def test_due_users_are_read_from_mongo_at_dispatch_time(monkeypatch):
+    # Set through another process: this process's in-memory schedule never saw it
+    users = FakeUsers([{"email": "a@example.com", "notify_news": True, "news_time": "07:05"},
+                       {"email": "b@example.com", "notify_news": False, "news_time": "07:05"}])
+    monkeypatch.setattr(news_scheduler, "users_col", users)
+    assert len(news_scheduler.news_schedule) == 0
+
+    due = asyncio.run(news_scheduler._due_users(7 * 60 + 5))
+    assert [u["email"] for u in due] == ["a@example.com"]
+    assert users.queries == [{"notify_news": True, "news_time": "07:05"}]
+
+
+class FakeLeases:
+    def __init__(self, last_minute=None):
+        self.progress = None if last_minute is None else {"_id": news_scheduler.PROGRESS_ID, "last_minute": last_minute}
+
+    async def find_one(self, query):
+        return self.progress
+
+    async def update_one(self, query, update, upsert=False):
+        minute = update["$max"]["last_minute"]
+        if self.progress is None or minute > self.progress["last_minute"]:
+            self.progress = {"_id": query["_id"], "last_minute": minute}
+
+
+def run_scheduler_briefly(monkeypatch, users, leases):
+    dispatched = []
+
+    async def fake_dispatch(slot, due):
+        dispatched.append((slot, [u["email"] for u in due]))
+
+    async def no_prefetch(emails):
+        pass
+
+    monkeypatch.setattr(news_scheduler, "users_col", users)
+    monkeypatch.setattr(news_scheduler, "leases_col", leases)
+    monkeypatch.setattr(news_scheduler, "dispatch_slot", fake_dispatch)
+    monkeypatch.setattr(news_scheduler, "_prefetch_slot", no_prefetch)
+
+    async def run():
+        task = asyncio.create_task(news_scheduler.user_specific_news_job())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    return dispatched
+
+
+def hhmm(minute):
+    slot = minute % news_scheduler.MINUTES_PER_DAY
+    return slot, f"{slot // 60:02d}:{slot % 60:02d}"
+
+
+def test_new_leader_resumes_after_the_saved_minute(monkeypatch):
+    now = news_scheduler._absolute_minute(datetime.now())
+    (sent_slot, sent_time), (missed_slot, missed_time) = hhmm(now - 3), hhmm(now - 2)
+    users = FakeUsers([{"email": "sent@example.com", "notify_news": True, "news_time": sent_time},
+                       {"email": "missed@example.com", "notify_news": True, "news_time": missed_time}])
+    # The old leader dispatched up to now - 3, then died
+    leases = FakeLeases(last_minute=now - 3)
+
+    dispatched = run_scheduler_briefly(monkeypatch, users, leases)
+    assert dispatched == [(missed_slot, ["missed@example.com"])]
+    assert leases.progress["last_minute"] >= now
+
+
+def test_late_slots_are_sent_and_only_those_over_the_cap_skipped(monkeypatch):
+    now = news_scheduler._absolute_minute(datetime.now())
+    late_slot, late_time = hhmm(now - 3 * 60)  # three hours late: still sent
+    users = FakeUsers([{"email": "late@example.com", "notify_news": True, "news_time": late_time}])
+    leases = FakeLeases(last_minute=now - 2 * news_scheduler.MINUTES_PER_DAY)
+    monkeypatch.setitem(news_scheduler.scheduler_stats, "skipped_minutes", 0)
+
+    dispatched = run_scheduler_briefly(monkeypatch, users, leases)
+    assert dispatched == [(late_slot, ["late@example.com"])]
+    assert news_scheduler.scheduler_stats["skipped_minutes"] == news_scheduler.MINUTES_PER_DAY
@@ -0,0 +1,74 @@
+# tests/test_poll_scheduler.py
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from backend.services.alert_index import AlertIndex
+from backend.services.poll_scheduler import PollScheduler, TradingHours
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def scheduler_with(*alerts, **options):
+    index = AlertIndex(rising=("sell",), falling=("buy",))
+    index.load([{"_id": i, "symbol": s, "threshold": t, "type": kind} for i, (s, t, kind) in enumerate(alerts)])
+    return PollScheduler(index, **options)
+
+
+def test_new_symbols_are_due_at_once_and_removed_ones_dropped():
+    scheduler = scheduler_with(("AAPL", 110.0, "sell"), ("TSLA", 190.0, "buy"))
+    scheduler.sync(["aapl", "tsla"], now=0)
+    assert sorted(scheduler.pop_due(0)) == ["AAPL", "TSLA"]
+    scheduler.sync(["AAPL"], now=1)
+    assert len(scheduler) == 1
+    assert scheduler.observe("TSLA", 200.0, now=1) == 0.0  # no longer watched
+
+
+def test_closer_thresholds_are_polled_sooner():
+    scheduler = scheduler_with(("NEAR", 100.5, "sell"), ("FAR", 140.0, "sell"), min_interval=1, max_interval=900)
+    scheduler.sync(["NEAR", "FAR"], now=0)
+    scheduler.pop_due(0)
+    near = scheduler.observe("NEAR", 100.0, now=0)
+    far = scheduler.observe("FAR", 100.0, now=0)
+    assert 1 <= near < far == 900
+    assert scheduler.next_due() == near
+
+
+def test_intervals_stay_within_bounds():
+    scheduler = scheduler_with(("AAPL", 100.0, "sell"), min_interval=2, max_interval=60)
+    scheduler.sync(["AAPL"], now=0)
+    assert scheduler.observe("AAPL", 100.0, now=0) == 2  # at the threshold
+    assert scheduler_with(min_interval=2, max_interval=60).interval("NONE", 100.0) == 60
+
+
+def test_volatility_shortens_the_interval():
+    intervals = {}
+    for name, prices in (("calm", [100.0, 100.01, 100.0]), ("wild", [100.0, 102.0, 99.0])):
+        scheduler = scheduler_with(("AAPL", 105.0, "sell"))
+        scheduler.sync(["AAPL"], now=0)
+        for t, price in enumerate(prices):
+            intervals[name] = scheduler.observe("AAPL", price, now=t * 10.0)
+    assert intervals["wild"] < intervals["calm"]
+
+
+def test_deferred_symbols_keep_their_place_in_line():
+    scheduler = scheduler_with()
+    scheduler.sync(["A"], now=0)
+    scheduler.sync(["A", "B"], now=5)
+    due = scheduler.pop_due(10)
+    assert due == ["A", "B"]
+    scheduler.defer(due)
+    assert scheduler.pop_due(10, limit=1) == ["A"]
+    scheduler.defer(["B"], due=20)
+    assert scheduler.pop_due(10) == [] and scheduler.next_due() == 20
+
+
+def test_trading_hours():
+    hours = TradingHours("America/New_York", "09:30", "16:00")
+    friday_noon = datetime(2026, 1, 2, 12, 0, tzinfo=NEW_YORK).timestamp()
+    friday_evening = datetime(2026, 1, 2, 17, 0, tzinfo=NEW_YORK).timestamp()
+    monday_open = datetime(2026, 1, 5, 9, 30, tzinfo=NEW_YORK).timestamp()
+
+    assert hours.is_open(friday_noon) and not hours.is_open(friday_evening)
+    assert hours.next_open(friday_noon) == friday_noon
+    assert hours.next_open(friday_evening) == monday_open
+    assert hours.session_close(friday_noon) == datetime(2026, 1, 2, 16, 0, tzinfo=NEW_YORK).timestamp()
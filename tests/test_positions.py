@@ -0,0 +1,131 @@
+# tests/test_positions.py
+import asyncio
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from backend.services import positions_service
+from backend.services.positions_service import PositionsService, apply_trade
+
+
+class FakePositions:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        docs = self.docs
+
+        class Cursor:
+            async def to_list(self, length=None):
+                return [dict(d) for d in docs]
+        return Cursor()
+
+
+class FakeMarketData:
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    async def get_quotes(self, symbols):
+        return {s: self.quotes[s] for s in symbols if s in self.quotes}
+
+
+def test_average_cost_and_realized_pnl():
+    position = apply_trade({}, "BUY", 10, 100.0)
+    position = apply_trade(position, "BUY", 10, 110.0)
+    position = apply_trade(position, "SELL", 5, 120.0)
+    assert position["quantity"] == 15
+    assert position["avg_cost"] == 105.0
+    assert position["realized_pnl"] == 75.0
+
+
+def test_portfolio_prefers_live_quotes_and_falls_back_to_cached_bars(monkeypatch):
+    monkeypatch.setattr(positions_service, "positions_col", FakePositions([
+        {"symbol": "AAPL", "quantity": 10, "avg_cost": 100.0, "realized_pnl": 0.0},
+        {"symbol": "TSLA", "quantity": 2, "avg_cost": 200.0, "realized_pnl": 5.0},
+    ]))
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr(positions_service, "market_data", FakeMarketData({"AAPL": {"timestamp": now, "price": 110.0}}))
+    asked = []
+
+    def cached_bars(symbols):
+        asked.extend(symbols)
+        return {"TSLA": (pd.Timestamp("2026-01-02 15:59"), 190.0)}
+    monkeypatch.setattr(positions_service.history_store, "cached_bars", cached_bars)
+
+    portfolio = asyncio.run(PositionsService.get_portfolio("user"))
+    prices = {p["symbol"]: p["price"] for p in portfolio["positions"]}
+    assert prices == {"AAPL": 110.0, "TSLA": 190.0}
+    assert asked == ["TSLA"]
+    assert portfolio["totals"]["unrealized_pnl"] == 100.0 - 20.0
+
+
+class FakeTradeLogs:
+    def __init__(self, trades):
+        self.trades = trades
+
+    async def distinct(self, field, query=None):
+        return sorted({t[field] for t in self.trades})
+
+    def find(self, query, projection=None):
+        trades = [t for t in self.trades if t["user_id"] == query["user_id"]]
+
+        class Cursor:
+            def sort(self, keys):
+                return self
+
+            def __aiter__(self):
+                return self._iter()
+
+            async def _iter(self):
+                for trade in trades:
+                    yield trade
+        return Cursor()
+
+
+class FakeStore:
+    """positions and migrations: just enough of the collection API"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise positions_service.DuplicateKeyError("duplicate key")
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+    async def delete_many(self, query):
+        pass
+
+    async def bulk_write(self, requests):
+        for request in requests:
+            doc = request._doc
+            self.docs[(doc["user_id"], doc["symbol"])] = doc
+
+
+def test_backfill_rebuilds_every_user_once(monkeypatch):
+    trades = [
+        {"_id": 1, "user_id": "u1", "symbol": "AAPL", "action": "BUY", "quantity": 10, "price": 100.0},
+        {"_id": 2, "user_id": "u1", "symbol": "AAPL", "action": "SELL", "quantity": 4, "price": 110.0},
+        {"_id": 3, "user_id": "u2", "symbol": "TSLA", "action": "BUY", "quantity": 1, "price": 200.0},
+    ]
+    positions, migrations = FakeStore(), FakeStore()
+    monkeypatch.setattr(positions_service, "trade_logs_col", FakeTradeLogs(trades))
+    monkeypatch.setattr(positions_service, "positions_col", positions)
+    monkeypatch.setattr(positions_service, "migrations_col", migrations)
+
+    assert asyncio.run(positions_service.backfill()) == 2
+    assert asyncio.run(positions_service.backfill()) is None  # the marker is there
+    aapl = positions.docs[("u1", "AAPL")]
+    assert (aapl["quantity"], aapl["realized_pnl"], aapl["recent_trades"]) == (6, 40.0, [1, 2])
+    assert positions.docs[("u2", "TSLA")]["quantity"] == 1
+    assert migrations.docs["positions_backfill"]["users"] == 2
+
+
+def test_trade_pipeline_leaves_a_position_that_lists_the_trade():
+    pipeline = positions_service._trade_pipeline("trade-1", "BUY", 1, 100.0, datetime.utcnow())
+    guarded = pipeline[2]["$set"]
+    assert pipeline[1]["$set"]["_seen"] == {"$in": ["trade-1", "$_seen_ids"]}
+    assert all(value["$cond"][:2] == ["$_seen", f"${field}"] for field, value in guarded.items())
@@ -0,0 +1,62 @@
+# tests/test_prediction_jobs.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services import prediction_jobs as prediction_jobs_module
+from backend.services.prediction_jobs import PredictionJobs
+
+
+def simulation_jobs(monkeypatch, delay=0.1):
+    calls = []
+
+    def fake_predict_thresholds(symbol, thresholds, engine):
+        calls.append(list(thresholds))
+        time.sleep(delay)
+        return [f"{symbol}@{t}" for t in thresholds]
+
+    monkeypatch.setattr(prediction_jobs_module, "predict_thresholds", fake_predict_thresholds)
+    jobs = PredictionJobs(engine="montecarlo")
+    jobs._executor = ThreadPoolExecutor(2)  # the real pool pickles the function by name
+    return jobs, calls
+
+
+def test_concurrent_simulations_on_one_symbol_share_a_call(monkeypatch):
+    jobs, calls = simulation_jobs(monkeypatch)
+
+    async def run():
+        return await asyncio.gather(*(jobs.predict_many("AAPL", [100 + i % 5]) for i in range(50)))
+
+    answers = asyncio.run(run())
+    assert calls == [[100.0, 101.0, 102.0, 103.0, 104.0]]
+    assert answers == [[f"AAPL@{float(100 + i % 5)}"] for i in range(50)]
+
+
+def test_thresholds_asked_during_a_simulation_merge_into_one_follow_up(monkeypatch):
+    jobs, calls = simulation_jobs(monkeypatch)
+
+    async def run():
+        first = asyncio.create_task(jobs.predict_many("AAPL", [1]))
+        await asyncio.sleep(0.03)
+        later = await asyncio.gather(*(jobs.predict_many("AAPL", [2, 3]) for _ in range(20)))
+        return await first, later
+
+    first, later = asyncio.run(run())
+    assert calls == [[1.0], [2.0, 3.0]]
+    assert first == ["AAPL@1.0"] and all(answer == ["AAPL@2.0", "AAPL@3.0"] for answer in later)
+    assert not jobs._inflight and not jobs._batches
+
+
+def test_eviction_skips_pending_jobs_and_drops_the_oldest_finished(monkeypatch):
+    jobs, _ = simulation_jobs(monkeypatch, delay=0)
+    jobs.max_jobs = 3
+    for job_id, status in (("a", "pending"), ("b", "done"), ("c", "failed")):
+        jobs._jobs[job_id] = {"job_id": job_id, "status": status}
+
+    async def run():
+        job = jobs.submit("AAPL", 100)
+        await asyncio.gather(*jobs._tasks.values())
+        return job
+
+    job = asyncio.run(run())
+    assert list(jobs._jobs) == ["a", "c", job["job_id"]]
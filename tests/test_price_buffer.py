@@ -0,0 +1,111 @@
+# tests/test_price_buffer.py
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from backend.db.price_buffer import PriceWriteBuffer
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql):
+        pass
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.pool.failures:
+            self.pool.failures -= 1
+            raise ConnectionError("connection reset")
+        self.pool.batches.append(list(records))
+
+
+class FakePool:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+def record(symbol, minute, price):
+    return {"symbol": symbol, "timestamp": datetime(2026, 1, 2, 15, minute), "price": price, "volume": 10}
+
+
+def test_full_batch_flushes_in_the_background():
+    pool = FakePool()
+    buffer = PriceWriteBuffer(pool, max_rows=2, flush_interval=60)
+
+    async def run():
+        buffer.add(record("AAPL", 0, 100.0))
+        assert pool.batches == []
+        buffer.add(record("TSLA", 0, 200.0))
+        await buffer._pending_flush
+
+    asyncio.run(run())
+    assert [len(batch) for batch in pool.batches] == [2]
+    assert buffer.metrics()["backlog"] == 0 and buffer.rows_written == 2
+
+
+def test_same_bar_twice_is_written_once_with_the_latest_value():
+    pool = FakePool()
+    buffer = PriceWriteBuffer(pool, max_rows=100)
+
+    async def run():
+        buffer.add(record("AAPL", 0, 100.0))
+        buffer.add(record("AAPL", 0, 101.0))
+        return await buffer.flush()
+
+    assert asyncio.run(run()) == 1
+    assert pool.batches[0][0][5] == 101.0
+
+
+def test_failed_flush_keeps_rows_without_clobbering_newer_ones():
+    pool = FakePool(failures=1)
+    buffer = PriceWriteBuffer(pool, max_rows=100)
+
+    async def run():
+        buffer.add(record("AAPL", 0, 100.0))
+        buffer.add(record("AAPL", 1, 100.5))
+        await buffer._safe_flush()
+        buffer.add(record("AAPL", 1, 102.0))  # newer value for a row in the failed batch
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert buffer.failed_flushes == 1
+    assert sorted(row[5] for row in pool.batches[0]) == [100.0, 102.0]
+
+
+def test_stop_flushes_what_is_left_and_ends_the_timer():
+    pool = FakePool()
+    buffer = PriceWriteBuffer(pool, max_rows=100, flush_interval=60)
+
+    async def run():
+        buffer.start()
+        buffer.add(record("AAPL", 0, 100.0))
+        await buffer.stop()
+        return buffer._timer
+
+    assert asyncio.run(run()) is None
+    assert [len(batch) for batch in pool.batches] == [1]
+
+
+def test_timer_flushes_a_partial_batch():
+    pool = FakePool()
+    buffer = PriceWriteBuffer(pool, max_rows=100, flush_interval=0.02)
+
+    async def run():
+        buffer.start()
+        buffer.add(record("AAPL", 0, 100.0))
+        await asyncio.sleep(0.1)
+        assert pool.batches
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert buffer.flushes == 1
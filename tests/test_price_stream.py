@@ -0,0 +1,78 @@
+# tests/test_price_stream.py
+import asyncio
+import json
+
+from backend.services.price_stream import PriceStream
+
+
+def handle(*messages):
+    ticks = []
+    stream = PriceStream("ws://unused", lambda: [], lambda symbol, price, ts: ticks.append((symbol, price, ts)))
+
+    async def run():
+        for message in messages:
+            await stream._handle(json.dumps(message))
+    asyncio.run(run())
+    return ticks
+
+
+def trades(*rows):
+    return {"type": "trade", "data": [{"s": s, "p": p, "t": t} for s, p, t in rows]}
+
+
+def test_batch_passes_low_and_high_before_latest():
+    # Dips to 95 and recovers inside one message: a buy at 96 must still see 95
+    ticks = handle(trades(("AAPL", 100.0, 1), ("AAPL", 95.0, 2), ("AAPL", 104.0, 3), ("AAPL", 101.0, 4)))
+    assert ticks == [("AAPL", 95.0, 2), ("AAPL", 104.0, 3), ("AAPL", 101.0, 4)]
+
+
+def test_latest_is_not_repeated_when_it_is_an_extreme():
+    ticks = handle(trades(("AAPL", 100.0, 1), ("AAPL", 102.0, 2)))
+    assert ticks == [("AAPL", 100.0, 1), ("AAPL", 102.0, 2)]
+
+
+def test_symbols_are_handled_separately():
+    ticks = handle(trades(("AAPL", 100.0, 1), ("TSLA", 200.0, 1), ("AAPL", 99.0, 2)))
+    assert [t for t in ticks if t[0] == "TSLA"] == [("TSLA", 200.0, 1)]
+    assert [t for t in ticks if t[0] == "AAPL"] == [("AAPL", 100.0, 1), ("AAPL", 99.0, 2)]
+
+
+def test_non_trade_messages_are_ignored():
+    assert handle({"type": "ping"}, {"type": "error", "msg": "bad symbol"}) == []
+
+
+def test_replays_stub_feed_and_resubscribes_after_disconnect():
+    from backend.benchmarks.stub_ws_server import start_stub_server
+
+    feed = [("AAPL", 100.0, 1), ("TSLA", 200.0, 2), ("AAPL", 101.5, 3), ("AAPL", 99.0, 4)]
+    wanted = [("AAPL", 100.0, 1), ("AAPL", 101.5, 3), ("AAPL", 99.0, 4)]
+
+    async def run():
+        # The stub closes each connection after three trades
+        runner = await start_stub_server(feed, port=0, interval=0.001, drop_after=3)
+        host, port = runner.addresses[0][:2]
+        ticks, done = [], asyncio.Event()
+
+        def on_tick(symbol, price, ts):
+            ticks.append((symbol, price, ts))
+            if len(ticks) >= 2 * len(wanted):
+                done.set()
+
+        stream = PriceStream(f"ws://{host}:{port}/", lambda: ["aapl"], on_tick,
+                             initial_backoff=0.01, max_backoff=0.05)
+        task = asyncio.create_task(stream.run())
+        try:
+            await asyncio.wait_for(done.wait(), timeout=10)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            stats = runner.app["stats"]
+            await runner.cleanup()
+        return ticks, stats, stream
+
+    ticks, stats, stream = asyncio.run(run())
+    assert ticks[:2 * len(wanted)] == wanted * 2
+    assert stream.reconnects >= 1
+    assert stats["connections"] >= 2
+    assert stats["subscribes"] >= 2  # subscribed again on the new connection
+    assert stats["unsubscribes"] == 0
@@ -0,0 +1,19 @@
+# tests/test_sentiment.py
+from backend.services.sentiment import LexiconScorer, SentimentEngine, article_key
+
+
+def test_negation_flips_a_nearby_word_only():
+    scorer = LexiconScorer()
+    assert scorer.score("Shares surge") == 1.5
+    assert scorer.score("Apple did not post a gain") < 0
+    assert scorer.score("No doubt about it, shares surge") == 1.5  # the comma ends the negation
+    assert scorer.score("No one expected the quarterly results would show a gain") == 1.0  # too far away
+
+
+def test_negation_applies_once():
+    assert LexiconScorer().score("not a loss, profits up") == 1.0 + 1.0 + 0.5
+
+
+def test_null_title_is_keyed_like_an_empty_one():
+    assert article_key({"title": None}) == article_key({})
+    assert SentimentEngine().analyze_articles([{"title": None, "url": None}]) == ["Neutral"]